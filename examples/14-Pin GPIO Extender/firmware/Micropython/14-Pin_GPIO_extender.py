@@ -1,6 +1,26 @@
 from machine import Pin, SPI
 import time
 
+# Optional structured results (utils/shrike-diag/shrike_diag.py on the board)
+try:
+    from shrike_diag import Runner
+    diag = Runner("14-pin-extender", echo=False)
+except ImportError:
+    diag = None
+
+# Optional hot-path profile (utils/shrike-prof/shrike_prof.py on the board)
+try:
+    from shrike_prof import Profiler
+    prof = Profiler()
+    time = prof.proxy(time, "sleep_us", nargs=1)
+except ImportError:
+    prof = None
+
+def record(name, got, expected):
+    """Logs a structured result when shrike_diag is available"""
+    if diag:
+        diag.check(name, got, expected)
+
 class ShrikeFPGA14GPIO:
     """
     Driver for 14-bit FPGA GPIO control via SPI
@@ -65,6 +85,10 @@ class ShrikeFPGA14GPIO:
         
         self.cs = Pin(cs_pin, Pin.OUT)
         self.cs.value(1)
+        if diag:
+            self.spi, self.cs = diag.instrument(self.spi, self.cs)
+        if prof:
+            self.spi = prof.proxy(self.spi, "write", "read", prefix="spi.", nargs=(1, 2))
         
         self.dir_reg = 0x3FFF  # All inputs (14 bits)
         self.out_reg = 0x0000
@@ -170,6 +194,10 @@ class ShrikeFPGA14GPIO:
         print("="*70)
 
 
+if prof:
+    prof.wrap_methods(ShrikeFPGA14GPIO, "_send_cmd", "_read_gpio", nargs=(3, 1))
+
+
 # ===== TEST FUNCTIONS =====
 
 def test_0_spi_diagnostic():
@@ -201,6 +229,7 @@ def test_0_spi_diagnostic():
     val = fpga.read_all()
     print(f"  Read value: 0x{val:04X} (0b{val:014b})")
     print(f"  Expected: 0x0000 (all LOW)")
+    record("write_all 0x0000", val, 0x0000)
     if val == 0x0000:
         print("  ✓ PASS")
     
@@ -211,6 +240,7 @@ def test_0_spi_diagnostic():
     val = fpga.read_all()
     print(f"  Read value: 0x{val:04X} (0b{val:014b})")
     print(f"  Expected: 0x3FFF (all HIGH)")
+    record("write_all 0x3FFF", val, 0x3FFF)
     if val == 0x3FFF:
         print("  ✓ PASS")
     
@@ -306,6 +336,7 @@ def test_1_loopback_pairs():
             expected |= (out_bit << (i*2 + 1))  # Odd bit
         
         passed = (readback == expected)
+        record(f"loopback 0x{pattern:04X}", readback, expected)
         print(f"Write: 0x{pattern:04X}, Read: 0x{readback:04X}, Expect: 0x{expected:04X}", end="")
         print(" ✓ PASS" if passed else " ✗ FAIL")
         if passed:
@@ -372,6 +403,7 @@ def test_3_bidirectional():
         time.sleep_ms(10)
         read_val = fpga.read_pin(13)
         passed = (val == read_val)
+        record(f"bit0 -> bit13 = {val}", read_val, val)
         print(f"  Bit 0 = {val}, Bit 13 = {read_val}", " ✓" if passed else " ✗")
         if passed:
             pass_a += 1
@@ -389,6 +421,7 @@ def test_3_bidirectional():
         time.sleep_ms(10)
         read_val = fpga.read_pin(0)
         passed = (val == read_val)
+        record(f"bit13 -> bit0 = {val}", read_val, val)
         print(f"  Bit 13 = {val}, Bit 0 = {read_val}", " ✓" if passed else " ✗")
         if passed:
             pass_b += 1
@@ -533,6 +566,10 @@ def run_all_tests():
     print("\n" + "="*70)
     print("ALL TESTS COMPLETE")
     print("="*70)
+    if diag:
+        diag.summary()
+    if prof:
+        prof.dump("14-pin-extender")
 
 
 # ===== INTERACTIVE MODE =====
@@ -0,0 +1,251 @@
+"""
+Edge-accurate capture of the 4-bit counter bus.
+
+Instead of polling the pins every 100 ms, every change of the counter value
+is recorded as a (ticks_us, value) pair in a preallocated ring buffer, and
+a consumer drains the buffer in batches:
+
+    PIOSource - a PIO state machine compares the bus against the previous
+                sample every 4 cycles and pushes only changes into its
+                (joined, 8 deep) RX FIFO; a hard IRQ timestamps and moves
+                them into the ring. No transition is lost to IRQ latency,
+                but the timestamp is per IRQ: changes that queued up in
+                the FIFO before the IRQ ran all get the same time.
+    IRQSource - hard pin-change IRQs on every bus pin, for pins a PIO
+                program cannot reach (bus pins must be consecutive GPIOs
+                for PIOSource)
+
+Nothing is allocated on the capture path. TransitionStats checks the
+drained values against an up/down counter (each step must be +1 or -1
+mod 16) and reports how many counts were skipped.
+
+Needs pinbus.py (utils/shrike-pinbus) on the board.
+"""
+
+from machine import Pin, mem32
+import array
+import time
+
+from pinbus import PinBus, GPIO_IN
+
+try:
+    import rp2
+except ImportError:
+    rp2 = None
+
+CNTR_PINS = [2, 1, 3, 0]  # Counter bit 0 (LSB) .. bit 3 (MSB)
+
+
+class CaptureRing:
+    """Fixed-size (timestamp, raw GPIO value) ring, single producer (IRQ)
+    and single consumer. size must be a power of two"""
+
+    def __init__(self, size=1024):
+        if size < 2 or size & (size - 1):
+            raise ValueError("ring size must be a power of two")
+        self.size = size
+        self.times = array.array("I", [0] * size)
+        self.values = array.array("I", [0] * size)
+        # Indices run over 2 * size so a full ring differs from an empty one
+        self._wrap = 2 * size - 1
+        self._mask = size - 1
+        self.head = 0
+        self.tail = 0
+        self.captured = 0
+        self.overflows = 0
+
+    def __len__(self):
+        return (self.head - self.tail) & self._wrap
+
+    def put(self, t, value):
+        """IRQ side: stores one sample, counts it as an overflow when full"""
+        h = self.head
+        if ((h - self.tail) & self._wrap) == self.size:
+            self.overflows += 1
+            return
+        i = h & self._mask
+        self.times[i] = t
+        self.values[i] = value
+        self.head = (h + 1) & self._wrap
+        self.captured += 1
+
+    def drain(self, out_times, out_values, convert=None):
+        """Consumer side: moves up to len(out_values) samples into the given
+        arrays (raw values mapped through convert when given), returns the
+        count"""
+        t = self.tail
+        n = min((self.head - t) & self._wrap, len(out_values))
+        mask = self._mask
+        for k in range(n):
+            i = (t + k) & mask
+            out_times[k] = self.times[i]
+            v = self.values[i]
+            out_values[k] = convert(v) if convert else v
+        self.tail = (t + n) & self._wrap
+        return n
+
+
+class IRQSource:
+    """Hard pin-change IRQs on every bus pin; each records the whole bus
+    from one GPIO_IN read, so a transition that toggles several pins is
+    stored once"""
+
+    def __init__(self, bus, ring):
+        self.bus = bus
+        self.ring = ring
+        self._mask = bus.mask
+        self._last = mem32[GPIO_IN] & self._mask
+        self._handler = self._irq  # Bind once, the IRQ must not allocate
+        self._pins = [Pin(p) for p in bus.pins]
+
+    def _irq(self, _pin):
+        raw = mem32[GPIO_IN] & self._mask
+        if raw != self._last:
+            self._last = raw
+            self.ring.put(time.ticks_us(), raw)
+
+    def start(self):
+        for pin in self._pins:
+            pin.irq(self._handler, Pin.IRQ_RISING | Pin.IRQ_FALLING, hard=True)
+
+    def stop(self):
+        for pin in self._pins:
+            pin.irq(None)
+
+
+def _change_sampler(width):
+    @rp2.asm_pio(in_shiftdir=rp2.PIO.SHIFT_LEFT, fifo_join=rp2.PIO.JOIN_RX)
+    def sampler():
+        mov(x, invert(null))  # Never matches, so the first sample is pushed
+        label("sample")
+        wrap_target()
+        mov(isr, null)
+        in_(pins, width)
+        mov(y, isr)
+        jmp(x_not_y, "changed")
+        wrap()
+        label("changed")
+        push(noblock)         # Full FIFO: dropped, shows up as a skipped count
+        mov(x, y)
+        irq(rel(0))
+        jmp("sample")
+    return sampler
+
+
+class PIOSource:
+    """PIO change detector on a bus of consecutive GPIOs (any bit order)"""
+
+    def __init__(self, bus, ring, sm_id=0, freq=None):
+        base = min(bus.pins)
+        width = max(bus.pins) - base + 1
+        if width != len(bus.pins):
+            raise ValueError("PIOSource needs the bus on consecutive GPIOs")
+        self.ring = ring
+        self._base = base
+        self._handler = self._irq
+        kwargs = {"in_base": Pin(base)}
+        if freq:
+            kwargs["freq"] = freq
+        self.sm = rp2.StateMachine(sm_id, _change_sampler(width), **kwargs)
+
+    def _irq(self, sm):
+        # One stamp for the whole batch: the FIFO holds no sample times
+        t = time.ticks_us()
+        while sm.rx_fifo():
+            self.ring.put(t, sm.get() << self._base)
+
+    def start(self):
+        self.sm.irq(self._handler, hard=True)
+        self.sm.active(1)
+
+    def stop(self):
+        self.sm.active(0)
+        self.sm.irq(None)
+
+
+def default_source(bus, ring):
+    """PIOSource where possible, IRQSource otherwise"""
+    if rp2 is not None:
+        try:
+            return PIOSource(bus, ring)
+        except ValueError:
+            pass
+    return IRQSource(bus, ring)
+
+
+class TransitionStats:
+    """Checks drained values against an up/down counter of the given
+    modulus. A jump of k counts means k - 1 transitions were missed (a
+    reset back to 0 also shows up as a jump).
+
+    Transitions stamped with the same time as the previous one (drained
+    by PIOSource in the same IRQ) are counted as batched and left out of
+    min_interval_us, which then only measures gaps between IRQ batches"""
+
+    def __init__(self, modulus=16):
+        self.modulus = modulus
+        self.last = None
+        self.transitions = 0
+        self.missed = 0
+        self.repeats = 0
+        self.batched = 0
+        self.min_interval_us = None
+        self._last_t = None
+
+    def update(self, times, values, n):
+        m = self.modulus
+        last, last_t = self.last, self._last_t
+        for k in range(n):
+            v, t = values[k], times[k]
+            if last is not None:
+                step = (v - last) % m
+                if step == 0:
+                    self.repeats += 1
+                else:
+                    self.transitions += 1
+                    self.missed += min(step, m - step) - 1
+                    dt = time.ticks_diff(t, last_t)
+                    if dt == 0:
+                        self.batched += 1
+                    elif self.min_interval_us is None or dt < self.min_interval_us:
+                        self.min_interval_us = dt
+            last, last_t = v, t
+        self.last, self._last_t = last, last_t
+
+    def report(self, ring=None):
+        line = "transitions={} missed={} repeats={} batched={} min_interval={}us".format(
+            self.transitions, self.missed, self.repeats, self.batched, self.min_interval_us)
+        if ring is not None:
+            line += " captured={} overflows={}".format(ring.captured, ring.overflows)
+        return line
+
+
+if __name__ == "__main__":
+    import shrike
+    shrike.flash("4bit_counter.bin")
+
+    bus = PinBus(CNTR_PINS, Pin.IN)
+    ring = CaptureRing(1024)
+    source = default_source(bus, ring)
+    stats = TransitionStats()
+
+    BATCH = 256
+    times = array.array("I", [0] * BATCH)
+    values = array.array("B", [0] * BATCH)
+
+    source.start()
+    print("Capturing with", type(source).__name__)
+    next_report = time.ticks_add(time.ticks_ms(), 1000)
+    try:
+        while True:
+            n = ring.drain(times, values, bus.from_gpio)
+            stats.update(times, values, n)
+            if n and n <= 4:  # Slow counts: print each value as before
+                for k in range(n):
+                    print("Binary: {:04b} | Hex: 0x{:X}".format(values[k], values[k]))
+            if time.ticks_diff(time.ticks_ms(), next_report) >= 0:
+                print(stats.report(ring))
+                next_report = time.ticks_add(next_report, 1000)
+            time.sleep_ms(10)
+    finally:
+        source.stop()
@@ -2,20 +2,38 @@ import shrike
 from machine import Pin
 from time import sleep
 
+try:
+    from pinbus import PinBus
+except ImportError:  # pinbus.py not on the board, read the pins one by one
+    PinBus = None
+
 shrike.flash("4bit_counter.bin")
 
 cntr_pins = [2,1,3,0]
 
-counter = [Pin(pin, Pin.IN) for pin in cntr_pins]
+if PinBus:
+    # All four bits are sampled in one GPIO_IN read, so the value never
+    # mixes bits from before and after a count edge
+    counter = PinBus(cntr_pins, Pin.IN)
+else:
+    counter = [Pin(pin, Pin.IN) for pin in cntr_pins]
 
-previous = 0
 
-while True:
+def read_counter():
+    if PinBus:
+        return counter.read()
     value = 0
     # Read each button and shift its value into the correct bit position
     for i in range(4):
         if counter[i].value():
             value += (1 << i)
+    return value
+
+
+previous = 0
+
+while True:
+    value = read_counter()
     if(value != previous):
         # Format strings
         binary_str = "{:04b}".format(value) # 4-digit binary
@@ -1,6 +1,14 @@
 from machine import Pin, SPI
 import time
 
+# Optional SPI trace: set SPI_TRACE = True and copy
+# utils/shrike-spitrace/spi_trace.py to the board
+SPI_TRACE = False
+trace = None
+if SPI_TRACE:
+    from spi_trace import Trace, instrument
+    trace = Trace(512, max_bytes=1)
+
 class ShrikeFPGAGPIO:
     """
     Driver for FPGA GPIO control via SPI
@@ -65,6 +73,8 @@ class ShrikeFPGAGPIO:
         
         self.cs = Pin(cs_pin, Pin.OUT)
         self.cs.value(1)  # CS idle high
+        if trace:
+            self.spi, self.cs = instrument(self.spi, self.cs, trace)
         
         # Internal state tracking
         self.dir_reg = 0xFF  # All inputs initially
@@ -446,6 +456,8 @@ def run_all_tests():
     print("\n" + "="*60)
     print("ALL TESTS COMPLETE")
     print("="*60)
+    if trace:
+        trace.dump("8-pin-extender")
 
 
 # ===== INTERACTIVE MODE =====
@@ -48,6 +48,23 @@ cs = Pin(CS, Pin.OUT, value=1)
 spi = SPI(0, baudrate=50_000, polarity=0, phase=0, bits=8, firstbit=SPI.MSB,
           sck=Pin(SCK), mosi=Pin(MOSI), miso=Pin(MISO))
 
+# Optional structured results (utils/shrike-diag/shrike_diag.py on the board)
+try:
+    from shrike_diag import Runner
+    diag = Runner("vector-4")
+    spi, cs = diag.instrument(spi, cs)
+except ImportError:
+    diag = None
+
+# Optional SPI trace: set SPI_TRACE = True and copy
+# utils/shrike-spitrace/spi_trace.py to the board
+SPI_TRACE = False
+trace = None
+if SPI_TRACE:
+    from spi_trace import Trace, instrument
+    trace = Trace(512, max_bytes=1)
+    spi, cs = instrument(spi, cs, trace)
+
 # --- HELPERS ---
 
 def send_packet(data, instr, reset, step):
@@ -86,7 +103,13 @@ def check(test_name, expected_reg, expected_pc=None):
     pc, reg = read_state()
     pc_match = True if expected_pc is None else (pc == expected_pc)
     reg_match = (reg == expected_reg)
-    
+
+    if diag:
+        diag.check(test_name, {"pc": pc, "reg": reg},
+                   {"pc": expected_pc, "reg": expected_reg},
+                   passed=pc_match and reg_match)
+        return
+
     if pc_match and reg_match:
         print(f"  [PASS] {test_name}")
     else:
@@ -243,3 +266,7 @@ test_shifts()
 test_memory()
 test_jump()
 print("\n=== All Tests Completed ===")
+if diag:
+    diag.summary()
+if trace:
+    trace.dump("vector-4")
@@ -0,0 +1,190 @@
+"""
+Random differential testing of the Vector-8 core.
+
+Generates random instruction streams, runs them on the simulator and on a
+target, and shrinks every mismatch to a minimal failing sequence.
+
+A target is any callable taking a list of (opcode, operand) pairs and
+returning the accumulator after each instruction - the same contract as
+stream_instrs() in vector_8.py. On the board (copy vector8_sim.py and this
+file next to vector_8.py):
+
+    from vector8_fuzz import fuzz
+    fuzz(stream_instrs, count=500)
+
+On the host, the default target is the FakeSPI stand-in:
+
+    python vector8_fuzz.py --count 100000
+    python vector8_fuzz.py --fault ROL      # demo: a broken ROL gets caught
+"""
+
+import random
+import time
+
+from vector8_sim import (OP_NOP, OP_LDA, OP_JNZ, OP_NAMES,
+                         Vector8, FakeSPI, disasm)
+
+try:
+    _ticks_ms, _ticks_diff = time.ticks_ms, time.ticks_diff
+except AttributeError:  # CPython
+    def _ticks_ms():
+        return int(time.perf_counter() * 1000)
+
+    def _ticks_diff(a, b):
+        return a - b
+
+
+def spi_target(spi, cs=None):
+    """Pipelined stream executor over an SPI handle (see stream_instrs)"""
+    if cs is None:
+        cs = spi.cs
+    tx = bytearray(2)
+    rx = bytearray(2)
+
+    def xfer(opcode, data):
+        tx[0] = opcode & 0x1F
+        tx[1] = data & 0xFF
+        cs.value(0)
+        spi.write_readinto(tx, rx)
+        cs.value(1)
+        return rx[1]
+
+    def run(program):
+        out = bytearray(len(program))
+        if not program:
+            return out
+        xfer(*program[0])
+        for i in range(1, len(program)):
+            out[i - 1] = xfer(*program[i])
+        out[-1] = xfer(OP_NOP, 0)
+        return out
+
+    return run
+
+
+def random_program(length, rand=random.getrandbits):
+    """LDA seed followed by length-1 random instructions.
+
+    The leading LDA pins down ACC and the zero flag, so sequences can run
+    back to back on hardware without a reset in between.
+    """
+    program = [(OP_LDA, rand(8))]
+    for _ in range(length - 1):
+        program.append((rand(4), rand(8)))
+    return program
+
+
+def first_mismatch(program, target):
+    """Index of the first differing result, or -1 when target agrees"""
+    expected = Vector8().run(program)
+    got = target(program)
+    for i in range(len(program)):
+        if got[i] != expected[i]:
+            return i
+    return -1
+
+
+def shrink(program, target):
+    """Reduces a failing program to a minimal one that still fails.
+
+    Truncates after the first mismatch, then greedily drops chunks of
+    instructions (halving the chunk size down to one) and finally simplifies
+    operands and opcodes towards zero / NOP. The leading LDA is kept.
+    """
+    def fails(p):
+        return first_mismatch(p, target) >= 0
+
+    program = list(program[:first_mismatch(program, target) + 1])
+
+    chunk = len(program) // 2
+    while chunk >= 1:
+        i = 1
+        while i < len(program):
+            candidate = program[:i] + program[i + chunk:]
+            if len(candidate) > 1 and fails(candidate):
+                program = candidate
+            else:
+                i += chunk
+        chunk //= 2
+
+    for i in range(len(program)):
+        opcode, data = program[i]
+        if i > 0 and opcode != OP_NOP:
+            candidate = program[:i] + [(OP_NOP, data)] + program[i + 1:]
+            if fails(candidate):
+                program = candidate
+                opcode = OP_NOP
+        for simpler in (0, data >> 1, data - 1):
+            if 0 <= simpler < data:
+                candidate = program[:i] + [(opcode, simpler)] + program[i + 1:]
+                if fails(candidate):
+                    program = candidate
+                    data = simpler
+    return program
+
+
+def fuzz(target, count=1000, length=16, seed=None, max_failures=1, verbose=True):
+    """Runs count random programs against target.
+
+    Returns a list of shrunk failing programs (at most max_failures).
+    """
+    if seed is not None:
+        random.seed(seed)
+    failures = []
+    start = _ticks_ms()
+    for n in range(count):
+        program = random_program(length)
+        if first_mismatch(program, target) < 0:
+            continue
+        small = shrink(program, target)
+        failures.append(small)
+        if verbose:
+            sim = Vector8().run(small)
+            got = target(small)
+            print(f"MISMATCH after {n + 1} programs, shrunk {len(program)} -> {len(small)}:")
+            for (opcode, data), e, g in zip(small, sim, got):
+                name = OP_NAMES[opcode] if opcode <= OP_JNZ else "NOP"
+                mark = "" if e == g else "   <-- "
+                print(f"  {name:4} 0x{data:02X} | Exp: 0x{e:02X} | Got: 0x{g:02X}{mark}")
+        if len(failures) >= max_failures:
+            break
+    if verbose:
+        elapsed = _ticks_diff(_ticks_ms(), start) / 1000
+        rate = (n + 1) / elapsed if elapsed else 0
+        print(f"{n + 1} programs x {length} instr in {elapsed:.2f} s ({rate:.0f} programs/s), "
+              f"{len(failures)} failure(s)")
+    return failures
+
+
+def _fault(name):
+    """Builds a FakeSPI fault hook that corrupts one opcode's result"""
+    opcode = OP_NAMES.index(name.upper())
+    return lambda op, data, acc: acc ^ 0x01 if op == opcode else acc
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Vector-8 differential fuzzer")
+    parser.add_argument("--count", type=int, default=10000, help="programs to run")
+    parser.add_argument("--length", type=int, default=16, help="instructions per program")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--fault", choices=OP_NAMES[1:], default=None,
+                        help="inject a fault into the fake core for this opcode")
+    parser.add_argument("--sim-only", action="store_true",
+                        help="benchmark the simulator against itself")
+    args = parser.parse_args()
+
+    if args.sim_only:
+        target = Vector8().run
+    else:
+        spi = FakeSPI(fault=_fault(args.fault) if args.fault else None)
+        target = spi_target(spi)
+    failures = fuzz(target, args.count, args.length, args.seed)
+    if failures:
+        print("\nMinimal failing sequence:")
+        print(disasm(failures[0]))
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Instruction set simulator for the Vector-8 core.
+
+Mirrors cpu_core.v / alu_8bit.v: opcodes 0x01-0x0C write the ALU result to the
+accumulator and latch the zero flag, JMP/JZ/JNZ only move the PC, everything
+else is a NOP. Only the accumulator is visible over SPI.
+
+Also provides FakeSPI / FakePin, a stand-in for the FPGA behind the RP2040 SPI
+bus, so host drivers can be exercised without hardware. Runs under CPython and
+MicroPython.
+"""
+
+# --- ISA DEFINITIONS (same as vector_8.py) ---
+OP_NOP, OP_LDA, OP_ADD, OP_SUB = 0x00, 0x01, 0x02, 0x03
+OP_AND, OP_OR,  OP_XOR, OP_LSL = 0x04, 0x05, 0x06, 0x07
+OP_LSR, OP_ROL, OP_ROR, OP_INC = 0x08, 0x09, 0x0A, 0x0B
+OP_DEC, OP_JMP, OP_JZ,  OP_JNZ = 0x0C, 0x0D, 0x0E, 0x0F
+
+OP_NAMES = ("NOP", "LDA", "ADD", "SUB", "AND", "OR", "XOR", "LSL",
+            "LSR", "ROL", "ROR", "INC", "DEC", "JMP", "JZ", "JNZ")
+
+# Single-operand ALU ops only depend on ACC, so precompute them.
+_UNARY = {
+    OP_LSL: bytes((a << 1) & 0xFF for a in range(256)),
+    OP_LSR: bytes(a >> 1 for a in range(256)),
+    OP_ROL: bytes(((a << 1) | (a >> 7)) & 0xFF for a in range(256)),
+    OP_ROR: bytes(((a >> 1) | (a << 7)) & 0xFF for a in range(256)),
+    OP_INC: bytes((a + 1) & 0xFF for a in range(256)),
+    OP_DEC: bytes((a - 1) & 0xFF for a in range(256)),
+}
+
+
+def alu(opcode, acc, data):
+    """Combinational ALU output for one opcode (alu_8bit.v)"""
+    if opcode == OP_LDA:
+        return data
+    if opcode == OP_ADD:
+        return (acc + data) & 0xFF
+    if opcode == OP_SUB:
+        return (acc - data) & 0xFF
+    if opcode == OP_AND:
+        return acc & data
+    if opcode == OP_OR:
+        return acc | data
+    if opcode == OP_XOR:
+        return acc ^ data
+    table = _UNARY.get(opcode)
+    return acc if table is None else table[acc]
+
+
+def disasm(program):
+    """Formats a list of (opcode, operand) pairs, one instruction per line"""
+    lines = []
+    for opcode, data in program:
+        op = opcode & 0x1F
+        name = OP_NAMES[op] if op < 16 else "NOP"
+        lines.append(f"{name:4} 0x{data & 0xFF:02X}")
+    return "\n".join(lines)
+
+
+class Vector8:
+    """Architectural model of the core: PC, ACC and the zero flag"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.pc = 0
+        self.acc = 0
+        self.z = 0
+
+    def step(self, opcode, data):
+        """Executes one instruction, returns the new accumulator"""
+        opcode &= 0x1F
+        data &= 0xFF
+        self.pc = (self.pc + 1) & 0xFF
+        if OP_LDA <= opcode <= OP_DEC:
+            self.acc = alu(opcode, self.acc, data)
+            self.z = 1 if self.acc == 0 else 0
+        elif opcode == OP_JMP:
+            self.pc = data
+        elif opcode == OP_JZ:
+            if self.z:
+                self.pc = data
+        elif opcode == OP_JNZ:
+            if not self.z:
+                self.pc = data
+        return self.acc
+
+    def run(self, program, out=None):
+        """Executes (opcode, operand) pairs, returns ACC after each one.
+
+        Same result layout as stream_instrs() in vector_8.py. This is the hot
+        loop of the fuzzer, so the ALU is inlined.
+        """
+        if out is None:
+            out = bytearray(len(program))
+        acc, z, pc = self.acc, self.z, self.pc
+        unary = _UNARY
+        i = 0
+        for opcode, data in program:
+            opcode &= 0x1F
+            data &= 0xFF
+            pc = (pc + 1) & 0xFF
+            if opcode == OP_NOP or opcode > OP_JNZ:
+                pass
+            elif opcode <= OP_DEC:
+                if opcode == OP_LDA:
+                    acc = data
+                elif opcode == OP_ADD:
+                    acc = (acc + data) & 0xFF
+                elif opcode == OP_SUB:
+                    acc = (acc - data) & 0xFF
+                elif opcode == OP_AND:
+                    acc &= data
+                elif opcode == OP_OR:
+                    acc |= data
+                elif opcode == OP_XOR:
+                    acc ^= data
+                else:
+                    acc = unary[opcode][acc]
+                z = 1 if acc == 0 else 0
+            elif opcode == OP_JMP:
+                pc = data
+            elif opcode == OP_JZ:
+                if z:
+                    pc = data
+            elif not z:  # JNZ
+                pc = data
+            out[i] = acc
+            i += 1
+        self.acc, self.z, self.pc = acc, z, pc
+        return out
+
+
+class FakePin:
+    """Minimal machine.Pin stand-in that reports level changes to a listener"""
+
+    def __init__(self, value=1, listener=None):
+        self._value = value
+        self.listener = listener
+
+    def value(self, v=None):
+        if v is None:
+            return self._value
+        v = 1 if v else 0
+        if v != self._value:
+            self._value = v
+            if self.listener is not None:
+                self.listener(v)
+
+    def __call__(self, v=None):
+        return self.value(v)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+
+class FakeSPI:
+    """The Vector-8 FPGA design as seen from the RP2040 SPI bus.
+
+    Follows top.v: opcode/operand bytes are paired up while CS is low, the
+    CPU steps after every second byte, and each MISO byte carries the
+    accumulator as it was when that byte started.
+
+    fault: optional callable (opcode, data, acc) -> acc applied after each
+           step, to model a broken core.
+    """
+
+    def __init__(self, core=None, fault=None):
+        self.core = core if core is not None else Vector8()
+        self.fault = fault
+        self.cs = FakePin(1, self._cs_edge)
+        self._byte_cnt = 0
+        self._opcode = 0
+        self.transactions = 0
+        self.bytes = 0
+
+    def _cs_edge(self, level):
+        self._byte_cnt = 0
+        if level == 0:
+            self.transactions += 1
+
+    def _clock_byte(self, b):
+        miso = self.core.acc
+        if self.cs.value() == 0:
+            if self._byte_cnt == 0:
+                self._opcode = b & 0x1F
+                self._byte_cnt = 1
+            else:
+                self._byte_cnt = 0
+                acc = self.core.step(self._opcode, b)
+                if self.fault is not None:
+                    self.core.acc = self.fault(self._opcode, b, acc) & 0xFF
+        self.bytes += 1
+        return miso
+
+    def write(self, buf):
+        for b in buf:
+            self._clock_byte(b)
+
+    def read(self, nbytes, write=0x00):
+        return bytes(self._clock_byte(write) for _ in range(nbytes))
+
+    def readinto(self, buf, write=0x00):
+        for i in range(len(buf)):
+            buf[i] = self._clock_byte(write)
+
+    def write_readinto(self, write_buf, read_buf):
+        for i in range(len(write_buf)):
+            read_buf[i] = self._clock_byte(write_buf[i])
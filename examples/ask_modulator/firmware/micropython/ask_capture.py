@@ -0,0 +1,50 @@
+"""
+Captures the ASK data line (or a comparator on the filtered output) into a
+packed 1-bit sample file for host/ask_rx.py.
+
+A PIO state machine samples the pin at a fixed rate and DMA drains its RX
+FIFO into a preallocated buffer, so sampling is free of interpreter jitter.
+Samples are packed LSB first, 32 per word, and written as-is:
+
+    from ask_capture import capture
+    capture(Pin(16), sample_rate=2000, seconds=30, path="ask.bits")
+
+then on the host:
+
+    python ask_rx.py ask.bits --sample-rate 2000 --expect HelloShrike123
+"""
+
+import array
+import rp2
+import time
+
+PIO_BASE = (0x50200000, 0x50300000, 0x50400000)  # PIO0/1/2, RXF0 at +0x20
+
+
+@rp2.asm_pio(in_shiftdir=rp2.PIO.SHIFT_RIGHT, autopush=True, push_thresh=32)
+def _sample():
+    in_(pins, 1)
+
+
+def capture(pin, sample_rate, seconds, path=None, sm_id=1):
+    """Samples pin for the given time, returns the packed word buffer and
+    writes it to path when given. sample_rate must be >= ~1.9 kHz (the
+    slowest PIO clock)"""
+    nwords = (int(sample_rate * seconds) + 31) // 32
+    buf = array.array("I", bytearray(4 * nwords))
+    sm = rp2.StateMachine(sm_id, _sample, freq=int(sample_rate), in_base=pin)
+    dma = rp2.DMA()
+    # PIO0 RX DREQs are 4-7, PIO1 12-15
+    treq = (sm_id // 4) * 8 + 4 + sm_id % 4
+    rxf = PIO_BASE[sm_id // 4] + 0x20 + 4 * (sm_id % 4)
+    ctrl = dma.pack_ctrl(size=2, inc_read=False, treq_sel=treq)
+    dma.config(read=rxf, write=buf, count=nwords, ctrl=ctrl, trigger=True)
+    sm.active(1)
+    while dma.active():
+        time.sleep_ms(10)
+    sm.active(0)
+    dma.close()
+    if path:
+        with open(path, "wb") as f:
+            f.write(buf)
+    return buf
@@ -0,0 +1,105 @@
+"""
+Multi-channel scheduling for the DDS ASK modulator.
+
+Each channel is a carrier tuning word with its own message queue. The
+scheduler walks a hop sequence, and on every slot retunes the carrier and
+sends the next few characters queued for that channel, so one board can
+serve several receivers tuned to different carriers.
+
+The 6-bit tuning word is written through PinBus (utils/shrike-pinbus, copy
+pinbus.py to the board) in a single GPIO_OUT_XOR store, so all bus pins change
+on the same clock and the DDS never sees a glitched intermediate frequency.
+
+    bus = TuningBus()
+    sched = ChannelScheduler(tx, bus, {"a": 1, "b": 4, "c": 9})
+    sched.queue("a", "HelloShrike123")
+    sched.queue("b", "Shrike")
+    sched.run()
+"""
+
+import time
+
+from pinbus import PinBus
+
+TUNING_PINS = (5, 6, 7, 8, 9, 10)  # Freq bit 0 (LSB) .. bit 5 (MSB)
+
+
+class TuningBus(PinBus):
+    """The 6-bit carrier bus, written atomically"""
+
+    def __init__(self, pins=TUNING_PINS):
+        super().__init__(pins)
+        self.value = 0
+        self.write(0)
+
+    def write(self, value):
+        """Applies a tuning word (clamped to 0-63) in one register store"""
+        if value > 63:
+            value = 63
+        self.value = value
+        PinBus.write(self, value)
+
+
+def sweep(bus, words, dwell_ms):
+    """Steps the carrier through words, holding each for dwell_ms"""
+    for w in words:
+        bus.write(w)
+        time.sleep_ms(dwell_ms)
+
+
+class ChannelScheduler:
+    """Time-division transmission across several tuning words.
+
+    channels:   {name: tuning word}
+    hop:        order in which slots visit channels (names may repeat to give
+                a channel more slots); defaults to the channels' order
+    slot_chars: characters sent per slot before hopping on
+    """
+
+    def __init__(self, tx, bus, channels, hop=None, slot_chars=4):
+        self.tx = tx
+        self.bus = bus
+        self.channels = dict(channels)
+        self.hop = list(hop) if hop else list(self.channels)
+        for name in self.hop:
+            if name not in self.channels:
+                raise ValueError(f"hop sequence names unknown channel '{name}'")
+        self.slot_chars = slot_chars
+        self.queues = {name: [] for name in self.channels}
+        self.sent = {name: 0 for name in self.channels}
+        self._slot = 0
+
+    def queue(self, channel, message):
+        """Queues message on channel; the channel must have a slot in hop"""
+        if channel not in self.hop:
+            raise ValueError(f"channel '{channel}' has no slot in the hop sequence")
+        self.queues[channel].append(message)
+
+    def pending(self):
+        return sum(len(m) for q in self.queues.values() for m in q)
+
+    def step(self):
+        """Runs one slot; returns the channel served, or None if it was idle"""
+        name = self.hop[self._slot]
+        self._slot = (self._slot + 1) % len(self.hop)
+        q = self.queues[name]
+        if not q:
+            return None
+        message = q[0]
+        chunk, rest = message[:self.slot_chars], message[self.slot_chars:]
+        if rest:
+            q[0] = rest
+        else:
+            q.pop(0)
+        self.bus.write(self.channels[name])  # Data line is idle between slots
+        self.tx.send(chunk)
+        self.tx.wait()
+        self.sent[name] += len(chunk)
+        return name
+
+    def run(self):
+        """Serves slots until every queue is empty, or until a full hop
+        cycle serves nothing (messages left on channels without a slot)"""
+        idle = 0
+        while self.pending() and idle < len(self.hop):
+            idle = 0 if self.step() else idle + 1
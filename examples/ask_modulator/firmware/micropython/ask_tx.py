@@ -0,0 +1,323 @@
+"""
+Hardware-timed ASK transmitter for the DDS modulator.
+
+A message is encoded once into a packed bit buffer (one frame per character:
+[START 1] + 6 data bits MSB first + [STOP 0], followed by idle gap bits) and
+then clocked out on the data pin by a backend:
+
+    PIOBackend   - rp2 PIO state machine fed by DMA, cycle-exact bit timing
+    TimerBackend - machine.Timer callback, for boards or pins without PIO
+    SimBackend   - host-side, records edge timestamps for timing checks
+
+    tx = ASKTransmitter(PIOBackend(Pin(16), bit_rate=1000))
+    frame = tx.encode("HelloShrike123")
+    tx.send(frame)
+    tx.wait()
+"""
+
+try:
+    from machine import Pin, Timer, freq as sys_freq
+except ImportError:  # Host side, only SimBackend is usable
+    Pin = Timer = sys_freq = None
+
+try:
+    import rp2
+except ImportError:
+    rp2 = None
+
+import array
+import time
+
+CODEBOOK = {
+    "H": 1,
+    "e": 2,
+    "l": 3,
+    "o": 4,
+    "S": 5,
+    "h": 6,
+    "r": 7,
+    "i": 8,
+    "k": 9,
+    "1": 51,
+    "2": 52,
+    "3": 53,
+    "*": 60,
+    "#": 61,
+    " ": 0,
+}
+
+ERROR_CODE = 63   # Sent for characters missing from the codebook
+DATA_BITS = 6
+FRAME_BITS = DATA_BITS + 2
+GAP_BITS = 2      # Idle (carrier off) bits after each frame
+
+
+class Frame:
+    """A pre-encoded message: bits packed MSB first into 32-bit words"""
+
+    def __init__(self, words, nbits, text=""):
+        self.words = words
+        self.nbits = nbits
+        self.text = text
+
+    def bit(self, i):
+        return (self.words[i >> 5] >> (31 - (i & 31))) & 1
+
+    def bits(self):
+        return [self.bit(i) for i in range(self.nbits)]
+
+
+def encode(message, codebook=CODEBOOK, gap_bits=GAP_BITS):
+    """Encodes a whole message into a Frame in one pass"""
+    per_char = FRAME_BITS + gap_bits
+    nbits = len(message) * per_char
+    words = array.array("I", [0] * ((nbits + 31) // 32))
+    pos = 0
+    for char in message:
+        code = codebook.get(char, ERROR_CODE)
+        # START + data + STOP as one 8-bit field, gap bits stay zero
+        field = (1 << (DATA_BITS + 1)) | ((code & 0x3F) << 1)
+        for i in range(FRAME_BITS - 1, -1, -1):
+            if (field >> i) & 1:
+                words[pos >> 5] |= 1 << (31 - (pos & 31))
+            pos += 1
+        pos += gap_bits
+    return Frame(words, nbits, message)
+
+
+# --- BACKENDS ---
+
+PIO_FREQ = 1_000_000   # Target state machine clock, sets the bit timing resolution
+SYS_CLK = 125_000_000  # RP2040 default, used when machine.freq() is unavailable
+PIO_OVERHEAD = 3       # Cycles per bit spent outside the delay loop
+PIO_BASE = (0x50200000, 0x50300000, 0x50400000)  # PIO0/1/2, TXF0 at +0x10
+
+# Run through sm.exec() after the delay word is put: loads it into Y, then
+# empties the OSR so the first out() autopulls frame data, not the delay word
+PIO_PRELOAD = ("pull()", "mov(y, osr)", "out(null, 32)")
+
+if rp2 is not None:
+    @rp2.asm_pio(out_init=rp2.PIO.OUT_LOW, out_shiftdir=rp2.PIO.SHIFT_LEFT,
+                 autopull=True, pull_thresh=32)
+    def _ask_bits():
+        # Y holds the per-bit delay, loaded by PIO_PRELOAD before start
+        wrap_target()
+        out(pins, 1)
+        mov(x, y)
+        label("delay")
+        jmp(x_dec, "delay")
+        wrap()
+
+
+def pio_timing(bit_rate, sys_clk=SYS_CLK, target_freq=PIO_FREQ):
+    """Returns (sm_freq, cycles_per_bit, achieved_bit_rate).
+
+    The SM clock is picked as an exact multiple of the bit rate, so the only
+    remaining error is the 16.8 fixed-point clock divider.
+    """
+    cycles = max(PIO_OVERHEAD + 1, round(target_freq / bit_rate))
+    sm_freq = bit_rate * cycles
+    if not sys_clk / 65536 <= sm_freq <= sys_clk:
+        raise ValueError("bit rate out of range for the PIO clock divider")
+    div256 = round(sys_clk * 256 / sm_freq)
+    return sm_freq, cycles, sys_clk * 256 / div256 / cycles
+
+
+class PIOBackend:
+    """Shifts the frame out of a PIO state machine, one bit every
+    pio_timing() cycles, with DMA feeding the TX FIFO when available"""
+
+    def __init__(self, pin, bit_rate, sm_id=0):
+        self.bit_rate = bit_rate
+        self.sm_freq, self.cycles, _ = pio_timing(bit_rate, sys_freq())
+        self.sm = rp2.StateMachine(sm_id, _ask_bits, freq=self.sm_freq, out_base=pin)
+        self._preload()
+        # PIO0 TX DREQs are 0-3, PIO1 8-11 (PIO2 16-19 on RP2350)
+        self._treq = (sm_id // 4) * 8 + sm_id % 4
+        self._txf = PIO_BASE[sm_id // 4] + 0x10 + 4 * (sm_id % 4)
+        self._dma = rp2.DMA() if hasattr(rp2, "DMA") else None
+        self._done = time.ticks_ms()
+
+    def _preload(self):
+        self.sm.put(self.cycles - PIO_OVERHEAD)
+        for instr in PIO_PRELOAD:
+            self.sm.exec(instr)
+
+    def start(self, frame):
+        self.sm.active(1)
+        if self._dma is not None:
+            ctrl = self._dma.pack_ctrl(size=2, inc_write=False, treq_sel=self._treq)
+            self._dma.config(read=frame.words, write=self._txf, count=len(frame.words),
+                             ctrl=ctrl, trigger=True)
+        else:
+            self.sm.put(frame.words)
+        nbits = 32 * len(frame.words)
+        self._done = time.ticks_add(time.ticks_ms(),
+                                    (nbits * self.cycles * 1000) // self.sm_freq + 1)
+
+    def busy(self):
+        return time.ticks_diff(self._done, time.ticks_ms()) > 0
+
+    def stop(self):
+        if self._dma is not None:
+            self._dma.active(0)
+        self.sm.active(0)
+        self.sm.restart()
+        self.sm.exec("mov(pins, null)")
+        self._preload()
+
+
+class TimerBackend:
+    """Clocks bits from a machine.Timer callback. Timing follows the timer
+    tick, so expect some jitter under heavy interpreter load"""
+
+    def __init__(self, pin, bit_rate, timer_id=-1):
+        self.pin = pin
+        self.bit_rate = bit_rate
+        self._timer = Timer(timer_id)
+        self._frame = None
+        self._pos = 0
+
+    def _tick(self, _t):
+        frame, pos = self._frame, self._pos
+        if pos >= frame.nbits:
+            self.pin.value(0)
+            self._timer.deinit()
+            self._frame = None
+            return
+        self.pin.value((frame.words[pos >> 5] >> (31 - (pos & 31))) & 1)
+        self._pos = pos + 1
+
+    def start(self, frame):
+        self._frame = frame
+        self._pos = 0
+        self._timer.init(freq=self.bit_rate, mode=Timer.PERIODIC, callback=self._tick)
+
+    def busy(self):
+        return self._frame is not None
+
+    def stop(self):
+        self._timer.deinit()
+        self._frame = None
+        self.pin.value(0)
+
+
+class SimBackend:
+    """Records (time_us, level) edges instead of driving a pin.
+
+    Models the PIO backend: the delay word goes through PIO_PRELOAD, then
+    _ask_bits shifts the TX FIFO out of the OSR with autopull, one bit
+    every Y + PIO_OVERHEAD cycles of the quantized SM clock. A preload that
+    leaves data in the OSR therefore shows up as wrong bits, and CI can
+    check the achieved bit rate and edge placement without hardware.
+    """
+
+    def __init__(self, bit_rate, sys_clk=SYS_CLK):
+        self.bit_rate = bit_rate
+        self.sm_freq, self.cycles, achieved = pio_timing(bit_rate, sys_clk)
+        self._fifo = [self.cycles - PIO_OVERHEAD]
+        self._osr = 0
+        self._shifted = 32   # OSR bits already shifted out, 32 = empty
+        self._y = 0
+        for instr in PIO_PRELOAD:
+            self._exec(instr)
+        self.period_us = 1e6 * (self._y + PIO_OVERHEAD) / (achieved * self.cycles)
+        self.edges = []
+        self.t_us = 0.0
+        self._level = 0
+
+    def _exec(self, instr):
+        if instr == "pull()":
+            self._osr, self._shifted = self._fifo.pop(0), 0
+        elif instr == "mov(y, osr)":
+            self._y = self._osr
+        elif instr == "out(null, 32)":
+            self._shifted = 32
+        else:
+            raise ValueError("not modelled: " + instr)
+
+    def _out_bit(self):
+        """out(pins, 1) with autopull; None once the FIFO is drained"""
+        if self._shifted == 32:
+            if not self._fifo:
+                return None
+            self._osr, self._shifted = self._fifo.pop(0), 0
+        self._shifted += 1
+        self._osr = (self._osr << 1) & 0x1FFFFFFFF
+        return self._osr >> 32
+
+    def start(self, frame):
+        self._fifo.extend(frame.words)
+        while True:
+            level = self._out_bit()
+            if level is None:
+                break
+            if level != self._level:
+                self.edges.append((self.t_us, level))
+                self._level = level
+            self.t_us += self.period_us
+        if self._level:
+            self.edges.append((self.t_us, 0))
+            self._level = 0
+
+    def busy(self):
+        return False
+
+    def stop(self):
+        pass
+
+
+def default_backend(pin, bit_rate):
+    """PIOBackend where rp2 PIO is available, TimerBackend otherwise"""
+    if rp2 is not None:
+        return PIOBackend(pin, bit_rate)
+    return TimerBackend(pin, bit_rate)
+
+
+def edge_errors(edges, bit_rate, t0_us=0.0):
+    """Offset of each edge from the ideal bit grid, in microseconds"""
+    period = 1e6 / bit_rate
+    errors = []
+    for t, _level in edges:
+        k = round((t - t0_us) / period)
+        errors.append(t - t0_us - k * period)
+    return errors
+
+
+class ASKTransmitter:
+    """Pre-encodes messages and hands them to a backend"""
+
+    def __init__(self, backend, codebook=CODEBOOK, gap_bits=GAP_BITS, cache_size=8):
+        self.backend = backend
+        self.codebook = codebook
+        self.gap_bits = gap_bits
+        self.cache_size = cache_size
+        self._cache = {}
+
+    def encode(self, message):
+        """Returns the Frame for message. Up to cache_size frames are kept,
+        so repeated messages are encoded only once; 0 disables the cache"""
+        frame = self._cache.get(message)
+        if frame is None:
+            frame = encode(message, self.codebook, self.gap_bits)
+            if self.cache_size > 0:
+                if len(self._cache) >= self.cache_size:
+                    self._cache.pop(next(iter(self._cache)))
+                self._cache[message] = frame
+        return frame
+
+    def send(self, message):
+        """Starts sending a message or Frame; returns without waiting"""
+        frame = message if isinstance(message, Frame) else self.encode(message)
+        self.backend.start(frame)
+        return frame
+
+    def busy(self):
+        return self.backend.busy()
+
+    def wait(self):
+        while self.backend.busy():
+            time.sleep_ms(1)
+
+    def stop(self):
+        self.backend.stop()
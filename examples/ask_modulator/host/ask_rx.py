@@ -0,0 +1,249 @@
+"""
+Streaming ASK demodulator / decoder for captured receive traces.
+
+Consumes sampled levels of the data line (or the RC-filtered carrier) from a
+pin capture, a scope export, a numpy array or chunks fed to ASKDecoder one at
+a time, recovers the bit
+timing, frames characters ([START 1] + 6 data bits + [STOP 0]) and maps the
+codes back through the transmitter's CODEBOOK.
+
+    python ask_rx.py capture.bits --sample-rate 10000
+    python ask_rx.py scope.csv --sample-rate 1e6 --envelope 64 --expect HelloShrike123
+
+Capture formats (by extension):
+    .npy        numpy array of samples
+    .csv, .txt  one sample per line; with several columns the last is used
+    .bits       packed 1-bit samples, LSB first (written by ask_capture.py)
+    other       raw bytes, one sample per byte
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "firmware", "micropython"))
+
+from ask_tx import CODEBOOK, DATA_BITS, FRAME_BITS  # noqa: E402
+
+ERROR_CHAR = "?"
+
+
+def load_capture(path):
+    """Loads a capture file into a 1-D numpy array"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        return np.load(path).ravel()
+    if ext in (".csv", ".txt"):
+        data = np.loadtxt(path, delimiter="," if ext == ".csv" else None, ndmin=2)
+        return data[:, -1]
+    raw = np.fromfile(path, dtype=np.uint8)
+    if ext == ".bits":
+        return np.unpackbits(raw, bitorder="little")
+    return raw
+
+
+def to_levels(samples, threshold=None, envelope=0):
+    """Slices samples into 0/1 levels.
+
+    envelope > 0 first rectifies the signal around its mean and smooths it
+    over that many samples, turning bursts of carrier into solid highs.
+    """
+    x = np.asarray(samples, dtype=np.float32)
+    if envelope > 0:
+        x = np.abs(x - x.mean())
+        x = np.convolve(x, np.ones(envelope, dtype=np.float32) / envelope, mode="same")
+    if threshold is None:
+        lo, hi = np.percentile(x, (5, 95))
+        threshold = (lo + hi) / 2
+    return (x > threshold).astype(np.uint8)
+
+
+def deglitch(levels, window):
+    """Majority vote over an odd window, removes spikes shorter than half
+    of it without moving the edges of real bits"""
+    window |= 1
+    if window < 3:
+        return np.asarray(levels, dtype=np.uint8)
+    votes = np.convolve(levels, np.ones(window, dtype=np.int32), mode="same")
+    return (votes > window // 2).astype(np.uint8)
+
+
+def estimate_samples_per_bit(levels):
+    """Bit period from run lengths: the shortest common run is one bit, then
+    every run is rounded to a whole number of bits and the period refit.
+    Runs under 3 samples are treated as leftover glitches."""
+    edges = np.flatnonzero(np.diff(levels)) + 1
+    runs = np.diff(edges)
+    runs = runs[runs >= 3]
+    if len(runs) < 4:
+        raise ValueError("not enough transitions to recover bit timing")
+    p0 = np.percentile(runs, 10)
+    nbits = np.round(runs / p0)
+    keep = (nbits >= 1) & (nbits <= FRAME_BITS)  # ignore idle gaps
+    return float(runs[keep].sum() / nbits[keep].sum())
+
+
+def invert_codebook(codebook=CODEBOOK):
+    return {code: char for char, code in codebook.items()}
+
+
+class ASKDecoder:
+    """Incremental decoder: feed() chunks of levels, get characters back.
+
+    Every frame is re-synchronized on the rising edge of its START bit and
+    sampled at bit centres, like a UART receiver.
+
+    With samples_per_bit=None the bit timing is estimated from the data:
+    chunks are buffered, and nothing is decoded, until they hold enough
+    transitions for estimate_samples_per_bit().
+    """
+
+    def __init__(self, samples_per_bit=None, codebook=CODEBOOK):
+        self.samples_per_bit = samples_per_bit
+        self.decode_map = invert_codebook(codebook)
+        self._tail = np.zeros(0, dtype=np.uint8)
+        self._head_start = True   # _tail starts inside a START bit with no edge before it
+        self.codes = []
+        self.framing_errors = 0
+        self.samples = 0
+
+    def feed(self, levels):
+        """Decodes as many whole frames as possible, returns them as text"""
+        levels = np.asarray(levels, dtype=np.uint8)
+        self.samples += len(levels)
+        buf = np.concatenate((self._tail, levels)) if len(self._tail) else levels
+        if self.samples_per_bit is None:
+            try:
+                self.samples_per_bit = estimate_samples_per_bit(buf)
+            except ValueError:
+                # Too few transitions yet: wait for more. An idle (low)
+                # line only needs its last sample kept
+                if not buf.any():
+                    buf = buf[-1:]
+                self._tail = buf.copy()
+                return ""
+        spb = self.samples_per_bit
+        frame_len = FRAME_BITS * spb
+
+        rising = np.flatnonzero((buf[1:] == 1) & (buf[:-1] == 0)) + 1
+        if self._head_start and len(buf) and buf[0]:
+            rising = np.concatenate(([0], rising))  # capture began inside a START bit
+
+        # Greedy frame search: the next START edge after the previous STOP bit.
+        # A candidate whose START is not high or whose STOP is not low at the
+        # bit centre is a glitch or a data bit; resync on the next edge.
+        starts = []
+        i = 0
+        limit = len(buf) - frame_len
+        stop_offset = frame_len - spb / 2
+        while i < len(rising) and rising[i] <= limit:
+            start = rising[i]
+            if not buf[int(start + spb / 2)] or buf[int(start + stop_offset)]:
+                self.framing_errors += 1
+                i += 1
+                continue
+            starts.append(start)
+            i = np.searchsorted(rising, start + stop_offset, side="left")
+
+        text = ""
+        if starts:
+            starts = np.asarray(starts, dtype=np.float64)
+            centres = (np.arange(FRAME_BITS) + 0.5) * spb
+            bits = buf[(starts[:, None] + centres).astype(np.int64)]  # frames x bits
+            weights = 1 << np.arange(DATA_BITS - 1, -1, -1)
+            codes = (bits[:, 1:1 + DATA_BITS] * weights).sum(axis=1)
+            self.codes.extend(codes.tolist())
+            text = "".join(self.decode_map.get(c, ERROR_CHAR) for c in codes.tolist())
+
+        # Keep the sample before a pending START edge (or just the last
+        # sample) so edges across chunk boundaries are still found. The
+        # edge put at 0 for a capture that began inside a START bit has no
+        # sample before it, so it is carried over to the next call instead
+        if i < len(rising):
+            keep_from = max(rising[i] - 1, 0)
+            self._head_start = rising[i] == 0
+        else:
+            keep_from = len(buf) - 1
+            self._head_start = False
+        self._tail = buf[keep_from:].copy()
+        return text
+
+
+def decode(levels, samples_per_bit=None, codebook=CODEBOOK, chunk=1 << 20):
+    """Decodes a whole capture, returns (text, decoder)"""
+    levels = np.asarray(levels, dtype=np.uint8)
+    if samples_per_bit is None:
+        # Each estimate sets a wider glitch filter for the next one
+        head = levels[:chunk * 4]
+        window = 3
+        for _ in range(6):
+            samples_per_bit = estimate_samples_per_bit(deglitch(head, window))
+            if int(samples_per_bit / 3) <= window:
+                break
+            window = int(samples_per_bit / 3)
+    levels = deglitch(levels, int(samples_per_bit / 3))
+    decoder = ASKDecoder(samples_per_bit, codebook)
+    parts = [decoder.feed(levels[i:i + chunk]) for i in range(0, len(levels), chunk)]
+    return "".join(parts), decoder
+
+
+_POPCOUNT = np.array([bin(v).count("1") for v in range(64)], dtype=np.int64)
+
+
+def bit_error_rate(codes, message, codebook=CODEBOOK):
+    """BER of the received data bits against a (repeated) known message.
+
+    Received frames are compared in blocks of len(message); each block is
+    aligned to its best rotation of message on its own, so a dropped or
+    spurious frame only costs the block it occurs in.
+    Returns (errors, total_bits).
+    """
+    if not codes or not message:
+        return 0, 0
+    m = len(message)
+    expected = np.array([codebook.get(c, 63) for c in message], dtype=np.int64)
+    rotations = np.stack([np.roll(expected, -k) for k in range(m)])   # m x m
+    got = np.asarray(codes, dtype=np.int64)
+    n = len(got)
+    blocks = np.resize(got, ((n + m - 1) // m, m))                    # pad by wrapping
+    valid = (np.arange(blocks.size) < n).reshape(blocks.shape)
+    errs = _POPCOUNT[(blocks[:, None, :] ^ rotations[None, :, :]) & 0x3F]
+    errs = (errs * valid[:, None, :]).sum(axis=2)                      # blocks x m
+    return int(errs.min(axis=1).sum()), n * DATA_BITS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode a captured ASK trace")
+    parser.add_argument("capture")
+    parser.add_argument("--sample-rate", type=float, help="samples per second")
+    parser.add_argument("--bit-rate", type=float, help="skip timing recovery (needs --sample-rate)")
+    parser.add_argument("--threshold", type=float, help="slicer level (default: auto)")
+    parser.add_argument("--envelope", type=int, default=0,
+                        help="envelope window in samples for raw carrier captures")
+    parser.add_argument("--expect", help="known transmitted message, reports BER")
+    args = parser.parse_args()
+
+    import time
+    t0 = time.perf_counter()
+    samples = load_capture(args.capture)
+    levels = to_levels(samples, args.threshold, args.envelope)
+    spb = args.sample_rate / args.bit_rate if args.bit_rate and args.sample_rate else None
+    text, decoder = decode(levels, spb)
+    elapsed = time.perf_counter() - t0
+
+    print(text)
+    print(f"\n{len(levels)} samples, {decoder.samples_per_bit:.2f} samples/bit", end="")
+    if args.sample_rate:
+        print(f" ({args.sample_rate / decoder.samples_per_bit:.2f} bit/s)", end="")
+    print(f", {len(decoder.codes)} frames, {decoder.framing_errors} framing errors, "
+          f"decoded in {elapsed * 1000:.1f} ms")
+    if args.expect:
+        errors, total = bit_error_rate(decoder.codes, args.expect)
+        ber = errors / total if total else 0.0
+        print(f"BER: {errors}/{total} = {ber:.2e}")
+
+
+if __name__ == "__main__":
+    main()
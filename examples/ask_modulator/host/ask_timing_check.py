@@ -0,0 +1,63 @@
+"""
+Host-side timing check for ask_tx.py, suitable for CI.
+
+Encodes a message, clocks it through SimBackend at several bit rates and
+verifies that the recorded edges reproduce the frame and stay within a
+fraction of a bit period of the ideal grid for the whole message.
+SimBackend models the PIO state machine's preload and OSR autopull, so a
+delay word left in the OSR fails the check as well.
+
+    python ask_timing_check.py
+    python ask_timing_check.py --rates 20 1000 50000 --tolerance 0.1
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "firmware", "micropython"))
+
+from ask_tx import ASKTransmitter, SimBackend, edge_errors  # noqa: E402
+
+
+def edges_to_bits(edges, period_us, nbits):
+    """Samples the recorded edge stream at the middle of every bit"""
+    bits = []
+    level, k = 0, 0
+    for i in range(nbits):
+        t = (i + 0.5) * period_us
+        while k < len(edges) and edges[k][0] <= t:
+            level = edges[k][1]
+            k += 1
+        bits.append(level)
+    return bits
+
+
+def check(message, bit_rate, tolerance):
+    backend = SimBackend(bit_rate)
+    frame = ASKTransmitter(backend).send(message)
+    period = 1e6 / bit_rate
+    errors = edge_errors(backend.edges, bit_rate)
+    worst = max((abs(e) for e in errors), default=0.0)
+    bits_ok = edges_to_bits(backend.edges, backend.period_us, frame.nbits) == frame.bits()
+    rate_err = (period - backend.period_us) / period
+    ok = bits_ok and worst <= tolerance * period
+    print(f"{bit_rate:>8} bit/s  period {backend.period_us:12.5f} us  rate error {rate_err:+.4%}  "
+          f"worst edge {worst:9.3f} us ({worst / period:.3f} bit)  "
+          f"{'OK' if ok else 'FAIL'}{'' if bits_ok else ' (bits differ)'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ASK transmitter timing check")
+    parser.add_argument("--message", default="HelloShrike123")
+    parser.add_argument("--rates", type=int, nargs="+", default=[20, 100, 1000, 9600, 50000])
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="max edge offset as a fraction of a bit period")
+    args = parser.parse_args()
+    results = [check(args.message, rate, args.tolerance) for rate in args.rates]
+    raise SystemExit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,9 @@
 //                      ready signals are made in one period of the internal frequency;
 //                      control of the SDA line only via an enable signal, the SDA output signal is constant (1'b0);
 //                      the enable signal was transferred only to the initial state of FSM.
+//   10.19.2026 r006 - o_int_adr added: pulses when the slave address is acknowledged,
+//                     so register-style designs can tell the first data byte of a
+//                     transfer (the register address) apart.
 // ---------------------------------------------------------------------------
 // Description :
 //   In this module implemented an I2C slave controller which configures by the parameter I2C_SLAVE_ADR.
@@ -50,7 +53,8 @@ module i2c_slave #(
     input   wire [7:0]  i_data_tx,  //  data inputs bus
     output  reg  [7:0]  o_data_rx,  //  data outputs bus
     output  reg         o_int_tx,   //  output signal which indicates that i_data_tx was sent
-    output  reg         o_int_rx    //  output signal which indicates that o_data_rx was updated
+    output  reg         o_int_rx,   //  output signal which indicates that o_data_rx was updated
+    output  reg         o_int_adr   //  output signal which indicates that the slave address was acknowledged (start or repeated start)
 );
 
 // Localparam declaration
@@ -279,6 +283,17 @@ always @(posedge i_clk) begin
     end
 end
 
+// Address acknowledged
+always @(posedge i_clk) begin
+    if(i_rst) begin
+        o_int_adr <= 1'b0;
+    end else if((r_state == ACK_CMD) && (r_buffer_rx[7:1] == I2C_SLAVE_ADR) && r_scl_in_fall) begin
+        o_int_adr <= 1'b1;
+    end else begin
+        o_int_adr <= 1'b0;
+    end
+end
+
 // ACK flag
 always @(posedge i_clk) begin
     if(i_rst) begin
@@ -0,0 +1,95 @@
+/* Register-file variant of the i2c_led design: the I2C slave exposes 16 byte-wide registers
+   with a register address pointer that auto-increments, so bursts of any length move in one
+   I2C transaction (the usual "memory" protocol, readfrom_mem / writeto_mem in MicroPython).
+
+   write : START addr+W  REG  D0 D1 ... STOP           -> regs[REG] = D0, regs[REG+1] = D1, ...
+   read  : START addr+W  REG  RESTART addr+R  D0 D1 ... -> D0 = regs[REG], D1 = regs[REG+1], ...
+   A read without a preceding register write continues from the current pointer.
+   The pointer wraps from 0x0F to 0x00.
+
+   Register map:
+   0x00        CTRL   bit 0 drives the LED
+   0x01 - 0x0E DATA   general purpose read/write
+   0x0F        ID     read-only, CHIP_ID
+   All other registers read 0x00 after i_rst.
+*/
+
+`timescale 1ns / 1ps
+
+(* top *) module  i2c_regs #( parameter I2C_SLAVE_ADR = 7'h32,
+                              parameter CHIP_ID = 8'h5A
+		  ) (
+		(* iopad_external_pin, clkbuf_inhibit *) input i_clk,
+		(* iopad_external_pin *) input i_rst,
+		(* iopad_external_pin *) input i_scl,
+		(* iopad_external_pin *) input i_sda,
+		(* iopad_external_pin *) output o_sda,
+		(* iopad_external_pin *) output o_led,
+
+		  // ouput enable signal
+		(* iopad_external_pin *) output o_sda_oe,
+		(* iopad_external_pin *) output o_clk_en,
+		(* iopad_external_pin *) output o_led_en );
+
+	localparam REG_CTRL = 4'h0;
+	localparam REG_ID   = 4'hF;
+
+	assign o_clk_en = 1'b1;
+	assign o_led_en = 1'b1;
+
+	wire w_int_tx , w_int_rx , w_int_adr , w_busy;
+	wire [7:0]w_data_rx;
+
+	reg  [7:0] r_regs [0:14];
+	reg  [3:0] r_ptr;        // register address pointer
+	reg        r_ptr_next;   // the next byte written is a register address
+
+	// The slave latches i_data_tx when the address or the previous byte is acknowledged,
+	// so the byte at the pointer is always presented here
+	wire [7:0] w_data_tx = (r_ptr == REG_ID) ? CHIP_ID : r_regs[r_ptr];
+
+ 	i2c_slave #( .I2C_SLAVE_ADR(I2C_SLAVE_ADR)
+		) i2c_slave
+		(
+    		.i_clk(i_clk),
+    		.i_rst(i_rst),
+    		.i_en(1),
+    		.o_busy(w_busy),
+    		.i_scl(i_scl),
+    		.i_sda(i_sda),
+    		.o_sda(o_sda),
+    		.o_sda_oe(o_sda_oe),
+    		.i_data_tx(w_data_tx),
+    		.o_data_rx(w_data_rx),
+    		.o_int_tx(w_int_tx),    // a byte was sent to the master
+    		.o_int_rx(w_int_rx),    // a byte was received from the master
+    		.o_int_adr(w_int_adr)   // (repeated) start with our address
+		);
+
+	integer i;
+
+	always @ (posedge i_clk) begin
+		if(i_rst) begin
+			r_ptr      <= 4'h0;
+			r_ptr_next <= 1'b0;
+			for(i = 0; i < 15; i = i + 1)
+				r_regs[i] <= 8'h00;
+		end else if(w_int_adr) begin
+			r_ptr_next <= 1'b1;
+		end else if(w_int_rx) begin
+			if(r_ptr_next) begin
+				r_ptr      <= w_data_rx[3:0];
+				r_ptr_next <= 1'b0;
+			end else begin
+				if(r_ptr != REG_ID)
+					r_regs[r_ptr] <= w_data_rx;
+				r_ptr <= r_ptr + 4'h1;
+			end
+		end else if(w_int_tx) begin
+			r_ptr <= r_ptr + 4'h1;
+		end
+	end
+
+	assign o_led = r_regs[REG_CTRL][0];
+
+endmodule
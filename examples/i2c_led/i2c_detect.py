@@ -1,11 +1,14 @@
 # I2C Scanner MicroPython
-from machine import Pin, SoftI2C
+import sys
+from i2c_scan import Scanner
 
-# You can choose any other combination of I2C pins
-i2c = SoftI2C(scl=Pin(1), sda=Pin(0))
+# You can choose any other combination of I2C pins; hardware I2C0 on GP1/GP0
+FREQ = 400_000
+scanner = Scanner(0, scl=1, sda=0, freq=FREQ)
 
 print('I2C SCANNER')
-devices = i2c.scan()
+# "full" forces a complete sweep, otherwise the cached topology is re-checked
+devices = scanner.scan(use_cache="full" not in sys.argv)
 
 if len(devices) == 0:
   print("No i2c device !")
@@ -15,3 +18,5 @@ else:
   for device in devices:
     print("I2C hexadecimal address: ", hex(device))
 
+print("{} in {} us, {} probes at {} kHz".format(
+  "cached" if scanner.from_cache else "full scan", scanner.last_scan_us, scanner.probes, FREQ // 1000))
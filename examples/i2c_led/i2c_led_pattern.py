@@ -0,0 +1,26 @@
+from machine import Pin, I2C
+from cmdstream import I2CChannel, Scheduler, send, blink, I2C_LED_ON, I2C_LED_OFF
+from i2c_scan import find
+
+# Non-interactive version of i2c_led.py: needs cmdstream.py (utils/shrike-cmdstream) on the board
+
+# Configure I2C (SDA = GP0, SCL = GP1)
+i2c = I2C(0, scl=Pin(1), sda=Pin(0), freq=400_000)
+
+# Slave device I2C address (7-bit)
+SLAVE_ADDR = 0x32
+
+# One targeted probe instead of a bus scan; lists the bus if the FPGA is missing
+if find(SLAVE_ADDR, bus_id=0, scl=1, sda=0, freq=400_000) is None:
+    raise SystemExit("Flash the i2c_led bitstream first")
+
+channel = I2CChannel(i2c, SLAVE_ADDR)
+
+# 1000 on/off commands, 64 per I2C transaction via writevto
+send(channel, [I2C_LED_ON, I2C_LED_OFF] * 500)
+print("Burst:", channel.bytes, "bytes in", channel.writes, "transactions")
+
+# Timed pattern: 10 Hz blink for 2 s
+sched = Scheduler(channel)
+sched.play(blink(I2C_LED_ON, I2C_LED_OFF, period_ms=100, count=20))
+print("Pattern done, worst slot lateness:", sched.late_us, "us")
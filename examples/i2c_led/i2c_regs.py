@@ -0,0 +1,101 @@
+# Driver for the register-file I2C design (ffpga/src/i2c_regs.v)
+"""
+The FPGA exposes 16 byte registers behind the usual I2C memory protocol
+with an auto-incrementing register pointer, so any run of registers moves
+in one transaction:
+
+    regs = FPGARegs(I2C(0, scl=Pin(1), sda=Pin(0), freq=400_000))
+    regs.write(0x01, b"\\x11\\x22\\x33")    # burst write from register 1
+    data = regs.read(0x01, 3)            # burst read, memoryview into a reused buffer
+    regs.led(True)
+
+All transfers go through preallocated buffers (readfrom_mem_into /
+writeto_mem), so steady-state reads and writes do not allocate.
+"""
+
+from machine import Pin, I2C
+import time
+
+SLAVE_ADDR = 0x32
+CHIP_ID = 0x5A
+NUM_REGS = 16
+
+REG_CTRL = 0x00
+REG_DATA = 0x01   # 0x01 - 0x0E
+REG_ID = 0x0F
+DATA_LEN = REG_ID - REG_DATA
+
+
+class FPGARegs:
+    def __init__(self, i2c, addr=SLAVE_ADDR):
+        self.i2c = i2c
+        self.addr = addr
+        self._buf = bytearray(NUM_REGS)
+        mv = memoryview(self._buf)
+        self._views = [mv[:n] for n in range(NUM_REGS + 1)]   # One view per length
+        self._ctrl = 0
+
+    def read(self, reg, n=1):
+        """Reads n registers starting at reg. Returns a memoryview into the
+        driver's buffer, valid until the next call"""
+        view = self._views[n]
+        self.i2c.readfrom_mem_into(self.addr, reg, view)
+        return view
+
+    def read_into(self, reg, buf):
+        """Reads len(buf) registers starting at reg into the caller's buffer"""
+        self.i2c.readfrom_mem_into(self.addr, reg, buf)
+
+    def read_reg(self, reg):
+        return self.read(reg, 1)[0]
+
+    def write(self, reg, data):
+        """Writes data to consecutive registers starting at reg"""
+        self.i2c.writeto_mem(self.addr, reg, data)
+
+    def write_reg(self, reg, value):
+        self._buf[0] = value
+        self.i2c.writeto_mem(self.addr, reg, self._views[1])
+
+    def led(self, on):
+        self._ctrl = (self._ctrl & ~1) | (1 if on else 0)
+        self.write_reg(REG_CTRL, self._ctrl)
+
+    def check_id(self):
+        return self.read_reg(REG_ID) == CHIP_ID
+
+
+def self_test(regs, rounds=200):
+    """Burst write / read-back of the whole data area; returns
+    (errors, bytes moved, elapsed ms)"""
+    pattern = bytearray(DATA_LEN)
+    back = bytearray(DATA_LEN)
+    errors = 0
+    start = time.ticks_ms()
+    for r in range(rounds):
+        for i in range(DATA_LEN):
+            pattern[i] = (r * 31 + i * 7) & 0xFF
+        regs.write(REG_DATA, pattern)
+        regs.read_into(REG_DATA, back)
+        if back != pattern:
+            errors += 1
+    elapsed = time.ticks_diff(time.ticks_ms(), start)
+    return errors, 2 * rounds * DATA_LEN, elapsed
+
+
+if __name__ == "__main__":
+    i2c = I2C(0, scl=Pin(1), sda=Pin(0), freq=400_000)
+    regs = FPGARegs(i2c)
+
+    if not regs.check_id():
+        raise SystemExit("No i2c_regs design at 0x{:02X} (ID mismatch)".format(SLAVE_ADDR))
+
+    errors, nbytes, ms = self_test(regs)
+    print("Burst test: {} errors, {} bytes in {} ms ({:.1f} kB/s)".format(
+        errors, nbytes, ms, nbytes / ms if ms else 0))
+
+    for _ in range(5):
+        regs.led(True)
+        time.sleep(0.2)
+        regs.led(False)
+        time.sleep(0.2)
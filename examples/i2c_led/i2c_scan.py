@@ -0,0 +1,120 @@
+# Fast I2C scanner with a cached bus topology
+"""
+Probes I2C addresses on a hardware I2C bus with ACK-only (zero-length)
+writes and remembers what it found.
+
+    scanner = Scanner(0, scl=1, sda=0, freq=400_000)
+    scanner.scan()                  # full sweep, or the cache if still fresh
+    scanner.scan(range(0x30, 0x38)) # subset
+    scanner.present(0x32)           # one targeted probe
+
+The topology is cached in a small JSON file per bus (id, pins, speed). While
+the cache is younger than `ttl` seconds, scan() only re-probes the cached
+addresses, and falls back to a full sweep if any of them stopped answering.
+The cache age uses the RTC, which Thonny / mpremote set from the host; a
+time that went backwards (RTC reset at boot) counts as expired.
+"""
+
+from machine import Pin, I2C
+import json
+import time
+
+CACHE_FILE = "i2c_topology.json"
+FIRST_ADDR = 0x08   # 0x00-0x07 and 0x78-0x7F are reserved
+LAST_ADDR = 0x77
+TTL_S = 60
+
+
+class Scanner:
+    def __init__(self, bus_id=0, scl=1, sda=0, freq=400_000, ttl=TTL_S, cache_file=CACHE_FILE):
+        self.i2c = I2C(bus_id, scl=Pin(scl), sda=Pin(sda), freq=freq)
+        self.key = "{}:{}:{}:{}".format(bus_id, scl, sda, freq)
+        self.ttl = ttl
+        self.cache_file = cache_file
+        self.probes = 0
+        self.last_scan_us = 0
+        self.from_cache = False
+
+    def probe(self, addr):
+        """True if addr ACKs a zero-length write"""
+        self.probes += 1
+        try:
+            self.i2c.writeto(addr, b"")
+            return True
+        except OSError:
+            return False
+
+    def sweep(self, addresses=None):
+        """ACK-only sweep without touching the cache"""
+        if addresses is None:
+            # Same probe, looped in C over FIRST_ADDR..LAST_ADDR (112 addresses)
+            self.probes += LAST_ADDR - FIRST_ADDR + 1
+            return self.i2c.scan()
+        return [a for a in addresses if self.probe(a)]
+
+    # --- CACHE ---
+
+    def _load(self):
+        try:
+            with open(self.cache_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _cached(self):
+        entry = self._load().get(self.key)
+        if not entry:
+            return None
+        age = time.time() - entry["time"]
+        if age < 0 or age > self.ttl:
+            return None
+        return entry["devices"]
+
+    def _store(self, devices):
+        data = self._load()
+        data[self.key] = {"time": time.time(), "devices": devices}
+        try:
+            with open(self.cache_file, "w") as f:
+                json.dump(data, f)
+        except OSError:
+            pass   # Read-only filesystem: scanning still works, just uncached
+
+    def forget(self):
+        data = self._load()
+        if data.pop(self.key, None) is not None:
+            with open(self.cache_file, "w") as f:
+                json.dump(data, f)
+
+    # --- SCANNING ---
+
+    def scan(self, addresses=None, use_cache=True):
+        """Devices present on the bus (restricted to addresses when given)"""
+        start = time.ticks_us()
+        self.from_cache = False
+        devices = None
+        cached = self._cached() if use_cache else None
+        if cached is not None:
+            wanted = cached if addresses is None else [a for a in cached if a in addresses]
+            if all(self.probe(a) for a in wanted):
+                devices = wanted
+                self.from_cache = True
+        if devices is None:
+            devices = self.sweep(addresses)
+            if addresses is None:
+                self._store(devices)
+        self.last_scan_us = time.ticks_diff(time.ticks_us(), start)
+        return devices
+
+    def present(self, addr):
+        """Targeted check for one device, e.g. the FPGA slave at startup"""
+        return self.probe(addr)
+
+
+def find(addr, **bus):
+    """Returns a Scanner whose bus has addr on it, or None. One probe when the
+    device is there, a full (cached) scan only to report what is there instead"""
+    scanner = Scanner(**bus)
+    if scanner.present(addr):
+        return scanner
+    print("No device at", hex(addr), "- bus has:", [hex(a) for a in scanner.scan()])
+    return None
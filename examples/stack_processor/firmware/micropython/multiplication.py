@@ -44,21 +44,107 @@ def spi_exchange(byte_to_send):
     return rx[0]
 
 
+# --- ASSEMBLER ---
+# Mnemonics for the instruction set in the README:
+#   STALL           0x00
+#   PUSH n          0x1N  (n = 0..15)
+#   POP             0x20  (popped value is returned in the next response byte)
+#   PUSH A|B|C      0x30 / 0x31 / 0x32
+#   POP  A|B|C      0x33 / 0x34 / 0x35
+#   ADD SUB MUL DIV 0xC0 - 0xC3  (C = A op B)
+#   SHL SHR ASR     0xC4 - 0xC6
+REG_PUSH = {"A": 0x30, "B": 0x31, "C": 0x32}
+REG_POP  = {"A": 0x33, "B": 0x34, "C": 0x35}
+ALU_OPS  = {"ADD": 0xC0, "SUB": 0xC1, "MUL": 0xC2, "DIV": 0xC3,
+            "SHL": 0xC4, "SHR": 0xC5, "ASR": 0xC6}
 
-mul = [0x12, # Push 2
-       0x15, # Push 5
-       0x33, # Pop A (A = 5)
-       0x34, # Pop B (A = 2)
-       0xC2, # C = A * B (C = 5 * 2)
-       0x32, # Push C
-       0x20, # Pop
-       0x00, # Stall
-       ]
-
-while True:    
-    for val in mul:
-        resp = spi_exchange(val)
-        print(f"Sent 0x{val:02X}, Received 0x{resp:02X}")
-        time.sleep(0.01)
-        
-    break
\ No newline at end of file
+def assemble(source):
+    """Assembles mnemonics into a bytearray of opcodes.
+
+    source is a multi-line string or a list of lines, one instruction per
+    line; anything after '#' or ';' is a comment.
+    """
+    if isinstance(source, str):
+        source = source.split("\n")
+    prog = bytearray()
+    for lineno, line in enumerate(source, 1):
+        line = line.split("#")[0].split(";")[0].strip().upper()
+        if not line:
+            continue
+        parts = line.split()
+        op = parts[0]
+        arg = parts[1] if len(parts) > 1 else None
+        if op in ("STALL", "NOP") and arg is None:
+            prog.append(0x00)
+        elif op == "PUSH" and arg in REG_PUSH:
+            prog.append(REG_PUSH[arg])
+        elif op == "PUSH" and arg is not None:
+            n = int(arg, 0)
+            if not 0 <= n <= 15:
+                raise ValueError(f"line {lineno}: PUSH value must be 0-15")
+            prog.append(0x10 | n)
+        elif op == "POP" and arg is None:
+            prog.append(0x20)
+        elif op == "POP" and arg in REG_POP:
+            prog.append(REG_POP[arg])
+        elif op in ALU_OPS and arg is None:
+            prog.append(ALU_OPS[op])
+        else:
+            raise ValueError(f"line {lineno}: cannot assemble '{line}'")
+    return prog
+
+
+# --- BATCHED EXECUTION ---
+# All opcodes are clocked out back to back under a single CS assertion. The
+# FPGA decodes every byte as it arrives, and each MISO byte is loaded half an
+# SCK period after the previous byte ends, so response[i] still reflects the
+# state after opcode i-1 - exactly as with one transaction per opcode. A POP
+# needs ~10 FPGA clocks (~200 ns at 50 MHz) to update the response register,
+# which keeps SCK below ~2.5 MHz.
+class StackExecutor:
+    def __init__(self, spi, cs, size=64):
+        self.spi = spi
+        self.cs = cs
+        self._alloc(size)
+
+    def _alloc(self, size):
+        self._tx = bytearray(size)
+        self._rx = bytearray(size)
+        self._tx_mv = memoryview(self._tx)
+        self._rx_mv = memoryview(self._rx)
+
+    def run(self, program):
+        """Runs a whole opcode list in one bus transaction.
+
+        Returns a memoryview of every response byte (valid until the next
+        run; copy it with bytes() to keep it).
+        """
+        n = len(program)
+        if n > len(self._tx):
+            self._alloc(n)
+        tx = self._tx
+        for i in range(n):
+            tx[i] = program[i]
+        tx, rx = self._tx_mv[:n], self._rx_mv[:n]
+        self.cs.value(0)
+        self.spi.write_readinto(tx, rx)
+        self.cs.value(1)
+        return rx
+
+
+mul = assemble("""
+    PUSH 2      # Push 2
+    PUSH 5      # Push 5
+    POP A       # Pop A (A = 5)
+    POP B       # Pop B (B = 2)
+    MUL         # C = A * B (C = 5 * 2)
+    PUSH C      # Push C
+    POP         # Pop
+    STALL       # Stall (For Reading via SPI)
+""")
+
+executor = StackExecutor(spi, cs)
+resp = executor.run(mul)
+for val, r in zip(mul, resp):
+    print(f"Sent 0x{val:02X}, Received 0x{r:02X}")
+print(f"Result: {resp[-1] & 0x0F} (stack {'empty' if resp[-1] & 0x80 else 'not empty'})")
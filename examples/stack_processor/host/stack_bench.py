@@ -0,0 +1,123 @@
+"""
+Model-only throughput estimate for offloading work to the stack processor.
+
+Runs a random opcode workload through FakeSPI in batches (one transaction per
+batch, as StackExecutor does in multiplication.py) and reports operations per
+second for each batch size and SPI clock. Both the FakeSPI target and the
+expected responses come from the same StackProcessor model, so the
+"mismatched batches" column only shows that batching keeps the model's state;
+it says nothing about the hardware. ops/s is computed from the modeled bus
+time (per-transaction overhead plus 8 bits per byte), not measured.
+
+As an independent check, the multiplication program of multiplication.py is
+streamed through the same path and compared with the board capture shown in
+the README before any numbers are reported.
+
+    python stack_bench.py
+    python stack_bench.py --batch 1 16 256 --baud 500000 2000000 --overhead-us 40
+    python stack_bench.py --json bench.json
+"""
+
+import argparse
+import json
+import random
+import time
+
+from stack_sim import MULTIPLICATION, FakeSPI, StackProcessor, assemble
+
+# A POP updates the response register ~10 FPGA clocks (50 MHz) after its last
+# bit; the next byte's first MISO bit is loaded half an SCK period later.
+POP_LATENCY_NS = 200
+MAX_BATCHED_BAUD = int(1e9 / (2 * POP_LATENCY_NS))
+
+# Opcode mix: pushes, pops, register moves and ALU operations.
+WORKLOAD = ([0x10 | n for n in range(16)] + [0x20] * 4 +
+            [0x30, 0x31, 0x32, 0x33, 0x34, 0x35] + list(range(0xC0, 0xC7)))
+
+# Response bytes of the multiplication program captured on the board (README)
+MULTIPLICATION_CAPTURE = bytes(7) + b"\x8a"
+
+
+def check_reference():
+    """Streams multiplication.py's program as one batch; True if the
+    responses match the board capture"""
+    program = assemble(MULTIPLICATION)
+    rx = bytearray(len(program))
+    FakeSPI().write_readinto(program, rx)
+    return bytes(rx) == MULTIPLICATION_CAPTURE
+
+
+def workload(n, seed=0):
+    rng = random.Random(seed)
+    return bytearray(rng.choice(WORKLOAD) for _ in range(n))
+
+
+def run(program, batch, baudrate, overhead_us):
+    """Streams program through FakeSPI in batches, returns a result row"""
+    spi = FakeSPI(baudrate=baudrate, overhead_us=overhead_us)
+    expected = StackProcessor().run(program)
+    tx = bytearray(batch)
+    rx = bytearray(batch)
+    mismatches = 0
+
+    t0 = time.perf_counter()
+    for start in range(0, len(program), batch):
+        chunk = program[start:start + batch]
+        n = len(chunk)
+        tx[:n] = chunk
+        spi.write_readinto(memoryview(tx)[:n], memoryview(rx)[:n])
+        if rx[:n] != expected[start:start + n]:
+            mismatches += 1
+    host_s = time.perf_counter() - t0
+
+    ops = len(program)
+    return {
+        "batch": batch,
+        "baudrate": baudrate,
+        "ops": ops,
+        "transactions": spi.transactions,
+        "bus_time_ms": round(spi.bus_time_us / 1000, 3),
+        "ops_per_s": round(ops / (spi.bus_time_us / 1e6)),
+        "model_ops_per_s": round(ops / host_s) if host_s else 0,
+        "mismatched_batches": mismatches,
+        "within_pop_timing": batch == 1 or baudrate <= MAX_BATCHED_BAUD,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stack processor throughput benchmark")
+    parser.add_argument("--ops", type=int, default=20000, help="opcodes per run")
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 4, 16, 64, 256])
+    parser.add_argument("--baud", type=int, nargs="+",
+                        default=[100_000, 500_000, 1_000_000, 2_000_000, 4_000_000])
+    parser.add_argument("--overhead-us", type=float, default=30.0,
+                        help="per-transaction cost on the RP2040 (CS toggles, call overhead)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="FILE", help="write the results as JSON")
+    args = parser.parse_args()
+
+    if not check_reference():
+        raise SystemExit("model does not reproduce the multiplication capture from the board")
+    program = workload(args.ops, args.seed)
+    rows = [run(program, batch, baud, args.overhead_us)
+            for baud in args.baud for batch in args.batch]
+
+    print(f"{args.ops} ops, {args.overhead_us:g} us per transaction (model-only estimate)")
+    print(f"{'baud':>10} {'batch':>6} {'txn':>7} {'bus ms':>10} {'ops/s':>10}  note")
+    for r in rows:
+        note = []
+        if not r["within_pop_timing"]:
+            note.append(f"SCK > {MAX_BATCHED_BAUD // 1000} kHz: POP results may be late")
+        if r["mismatched_batches"]:
+            note.append(f"{r['mismatched_batches']} mismatched batches")
+        print(f"{r['baudrate']:>10} {r['batch']:>6} {r['transactions']:>7} "
+              f"{r['bus_time_ms']:>10.1f} {r['ops_per_s']:>10}  {'; '.join(note)}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"overhead_us": args.overhead_us, "results": rows}, f, indent=2)
+    raise SystemExit(1 if any(r["mismatched_batches"] for r in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
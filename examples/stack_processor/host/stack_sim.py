@@ -0,0 +1,203 @@
+"""
+Behavioral model of the SPI stack processor (ffpga/src/top.v, lifo_bram.v).
+
+Predicts the MISO response byte for every opcode of a stream, so a capture
+from the board can be checked automatically:
+
+    python stack_sim.py program.asm
+    python stack_sim.py --hex 12 15 33 34 C2 32 20 00
+
+Also provides FakeSPI, the design as seen from the RP2040 SPI bus, for
+exercising host drivers without hardware.
+"""
+
+import ast
+import os
+import sys
+
+DEPTH = 256  # lifo_bram DEPTH
+
+# --- ASSEMBLER ---
+# assemble() and the multiplication program live in the board script, which
+# talks to the hardware when imported; only the assembler definitions and the
+# program source are taken from it.
+FIRMWARE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "..", "firmware", "micropython", "multiplication.py")
+ASSEMBLER_NAMES = ("REG_PUSH", "REG_POP", "ALU_OPS", "assemble")
+
+
+def _load_firmware(path=FIRMWARE):
+    """(namespace with the assembler, source of the `mul` program)"""
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    keep = []
+    program = None
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name in ASSEMBLER_NAMES:
+            keep.append(node)
+        elif isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+            if name in ASSEMBLER_NAMES:
+                keep.append(node)
+            elif name == "mul" and isinstance(node.value, ast.Call):
+                program = ast.literal_eval(node.value.args[0])
+    namespace = {}
+    exec(compile(ast.Module(body=keep, type_ignores=[]), path, "exec"), namespace)
+    return namespace, program
+
+
+_firmware, MULTIPLICATION = _load_firmware()
+assemble = _firmware["assemble"]
+REG_PUSH, REG_POP, ALU_OPS = _firmware["REG_PUSH"], _firmware["REG_POP"], _firmware["ALU_OPS"]
+
+
+class StackProcessor:
+    """Architectural state of top.v: LIFO, registers A/B/C and the response.
+
+    Notes on behaviour taken from the RTL:
+    - A, B, C are 8 bits but only their low nibble can be pushed.
+    - Only POP (0x20) updates the response register:
+      {empty, full, 2'b00, popped nibble}, with the flags after the pop.
+    - Popping an empty stack leaves the pointer alone and returns the last
+      value the BRAM read port produced.
+    - SHL / SHR shift A by B; ASR shifts A right by one.
+    - DIV by zero is undefined in Verilog; the model returns 0xFF.
+    """
+
+    def __init__(self, depth=DEPTH):
+        self.depth = depth
+        self.reset()
+
+    def reset(self):
+        self.stack = []
+        self.a = self.b = self.c = 0
+        self.dout = 0
+        self.tx = 0
+
+    @property
+    def empty(self):
+        return not self.stack
+
+    @property
+    def full(self):
+        return len(self.stack) >= self.depth
+
+    def _pop(self):
+        if self.stack:
+            self.dout = self.stack.pop()
+        return self.dout
+
+    def step(self, opcode):
+        """Executes one opcode, returns the response byte sent while it was
+        being shifted in (i.e. the state after the previous opcode)"""
+        resp = self.tx
+        opcode &= 0xFF
+        hi = opcode >> 4
+        if hi == 0x1:
+            if not self.full:
+                self.stack.append(opcode & 0x0F)
+        elif opcode == 0x20:
+            value = self._pop()
+            self.tx = (0x80 if self.empty else 0) | (0x40 if self.full else 0) | value
+        elif 0x30 <= opcode <= 0x32:
+            if not self.full:
+                reg = (self.a, self.b, self.c)[opcode - 0x30]
+                self.stack.append(reg & 0x0F)
+        elif opcode == 0x33:
+            self.a = self._pop()
+        elif opcode == 0x34:
+            self.b = self._pop()
+        elif opcode == 0x35:
+            self.c = self._pop()
+        elif 0xC0 <= opcode <= 0xC6:
+            a, b = self.a, self.b
+            if opcode == 0xC0:
+                c = a + b
+            elif opcode == 0xC1:
+                c = a - b
+            elif opcode == 0xC2:
+                c = a * b
+            elif opcode == 0xC3:
+                c = a // b if b else 0xFF
+            elif opcode == 0xC4:
+                c = a << b
+            elif opcode == 0xC5:
+                c = a >> b
+            else:
+                c = (a & 0x80) | (a >> 1)
+            self.c = c & 0xFF
+        return resp
+
+    def run(self, program):
+        """Predicted response byte for every opcode of program"""
+        step = self.step
+        return bytearray(step(op) for op in program)
+
+
+class FakePin:
+    """Minimal machine.Pin stand-in"""
+
+    def __init__(self, value=1):
+        self._value = value
+
+    def value(self, v=None):
+        if v is None:
+            return self._value
+        self._value = 1 if v else 0
+
+
+class FakeSPI:
+    """The stack processor design on the far side of an SPI bus.
+
+    Keeps a modeled bus time so throughput can be estimated without
+    hardware: every transaction costs overhead_us (CS toggling and
+    interpreter overhead on the RP2040) plus 8 bits per byte at baudrate.
+    """
+
+    def __init__(self, baudrate=1_000_000, overhead_us=30.0, core=None):
+        self.baudrate = baudrate
+        self.overhead_us = overhead_us
+        self.core = core if core is not None else StackProcessor()
+        self.transactions = 0
+        self.bytes = 0
+        self.bus_time_us = 0.0
+
+    def _account(self, nbytes):
+        self.transactions += 1
+        self.bytes += nbytes
+        self.bus_time_us += self.overhead_us + nbytes * 8 * 1e6 / self.baudrate
+
+    def write(self, buf):
+        self._account(len(buf))
+        for b in buf:
+            self.core.step(b)
+
+    def write_readinto(self, write_buf, read_buf):
+        self._account(len(write_buf))
+        step = self.core.step
+        for i in range(len(write_buf)):
+            read_buf[i] = step(write_buf[i])
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Predict stack processor responses")
+    parser.add_argument("program", nargs="+",
+                        help="assembly file ('-' for stdin), or opcodes with --hex")
+    parser.add_argument("--hex", action="store_true", help="arguments are hex opcodes")
+    args = parser.parse_args()
+
+    if args.hex:
+        program = bytearray(int(x, 16) for x in args.program)
+    elif args.program == ["-"]:
+        program = assemble(sys.stdin.read())
+    else:
+        with open(args.program[0]) as f:
+            program = assemble(f.read())
+
+    for op, resp in zip(program, StackProcessor().run(program)):
+        print(f"Sent 0x{op:02X}, Received 0x{resp:02X}")
+
+
+if __name__ == "__main__":
+    main()
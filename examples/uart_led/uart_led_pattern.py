@@ -0,0 +1,18 @@
+from machine import UART, Pin
+from cmdstream import UARTChannel, Scheduler, send, blink, UART_LED_ON, UART_LED_OFF
+
+# Non-interactive version of uart_led.py: needs cmdstream.py (utils/shrike-cmdstream) on the board
+
+# Initialize UART0 (TX=GPIO0, RX=GPIO1)
+uart = UART(0, baudrate=115200, tx=Pin(0), rx=Pin(1))
+channel = UARTChannel(uart)
+
+# 1000 on/off commands at line rate, sent in bulk writes
+send(channel, [UART_LED_ON, UART_LED_OFF] * 500)
+print("Burst:", channel.bytes, "bytes in", channel.writes, "writes")
+
+# Timed pattern: 10 Hz blink for 2 s, then 2 Hz for 2 s
+sched = Scheduler(channel)
+sched.play(blink(UART_LED_ON, UART_LED_OFF, period_ms=100, count=20))
+sched.play(blink(UART_LED_ON, UART_LED_OFF, period_ms=500, count=4, duty=0.2))
+print("Pattern done, worst slot lateness:", sched.late_us, "us")
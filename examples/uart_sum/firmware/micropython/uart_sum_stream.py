@@ -0,0 +1,240 @@
+"""
+Pipelined request/response client for the uart_sum design.
+
+uart_sum.py sends one operand pair, sleeps and reads one reply, so a single
+sum is in flight at a time. SumClient keeps up to `window` operand pairs on
+the wire and matches the 1-byte replies in FIFO order as they arrive, so a
+large operand set is verified at close to the line rate (each sum costs two
+bytes out and one back, the TX direction is the bottleneck).
+
+The design has no framing: replies are bare bytes and the FPGA pairs
+operands purely by count. The client therefore checks every reply against
+its expected sum and classifies problems:
+
+    dropped    - no reply for a pair (timeout, or the reply matches the
+                 pair after the expected one)
+    extra      - reply bytes with no pair outstanding
+    mismatches - wrong sums; several in a row mean the FPGA has lost the
+                 operand phase, and the client pulses reset and resends
+                 everything not yet answered
+
+    client = SumClient(uart, reset=reset_fpga)
+    report = client.run(pairs)       # [(a, b), ...] or flat bytes a0 b0 a1 b1 ...
+    print(report)
+
+Runs unchanged on the host against the pty model in host/uart_sum_model.py.
+"""
+
+import time
+
+try:
+    _ticks_ms, _ticks_diff = time.ticks_ms, time.ticks_diff
+except AttributeError:  # CPython
+    def _ticks_ms():
+        return int(time.perf_counter() * 1000)
+
+    def _ticks_diff(a, b):
+        return a - b
+
+BAUD_RATE = 115200
+WINDOW = 32          # Pairs in flight; replies must fit the UART RX buffer
+DESYNC_RUN = 3       # Consecutive mismatches treated as lost operand phase
+MAX_RESYNCS = 8      # Resyncs in a row without a good reply before giving up
+SETTLE_MS = 2        # Quiet line time after a reset
+
+
+class SumReport:
+    """Counters for one SumClient.run()"""
+
+    def __init__(self, total):
+        self.total = total
+        self.ok = 0
+        self.mismatches = 0
+        self.dropped = 0
+        self.extra = 0
+        self.resyncs = 0
+        self.elapsed_ms = 0
+
+    def ops_per_s(self):
+        return 1000 * self.total / self.elapsed_ms if self.elapsed_ms else 0.0
+
+    def passed(self):
+        return self.ok == self.total and not self.extra
+
+    def add(self, other):
+        """Adds the counters of another report, e.g. the next chunk of a sweep"""
+        self.total += other.total
+        self.ok += other.ok
+        self.mismatches += other.mismatches
+        self.dropped += other.dropped
+        self.extra += other.extra
+        self.resyncs += other.resyncs
+        self.elapsed_ms += other.elapsed_ms
+        return self
+
+    def __str__(self):
+        return ("{} sums: {} ok, {} mismatches, {} dropped, {} extra, {} resyncs "
+                "in {} ms ({:.0f} ops/s)").format(
+            self.total, self.ok, self.mismatches, self.dropped, self.extra,
+            self.resyncs, self.elapsed_ms, self.ops_per_s())
+
+
+def _flatten(pairs):
+    if isinstance(pairs, (bytes, bytearray, memoryview)):
+        if len(pairs) % 2:
+            raise ValueError("operand buffer must hold whole pairs")
+        return memoryview(pairs)  # No copy: the buffer may be most of the heap
+    ops = bytearray()
+    for a, b in pairs:
+        ops.append(a)
+        ops.append(b)
+    return ops
+
+
+class SumClient:
+    """Streams operand pairs through the FPGA adder.
+
+    uart:       object with write(), readinto() and any() (machine.UART)
+    reset:      optional callable that resets the FPGA state machine back to
+                "expecting the first operand"; without it a lost operand
+                phase cannot be recovered
+    window:     operand pairs in flight
+    timeout_ms: silence after which outstanding pairs count as dropped
+    """
+
+    def __init__(self, uart, reset=None, window=WINDOW, timeout_ms=50):
+        self.uart = uart
+        self.reset = reset
+        self.window = window
+        self.timeout_ms = timeout_ms
+        self._rx = bytearray(64)
+        self._rxv = memoryview(self._rx)
+
+    def _drain(self):
+        # Wait for the line to go quiet so no reply is still on its way
+        quiet = _ticks_ms()
+        while _ticks_diff(_ticks_ms(), quiet) < SETTLE_MS:
+            if self.uart.any():
+                self.uart.readinto(self._rx)
+                quiet = _ticks_ms()
+
+    def _can_resync(self):
+        return self.reset is not None and self._stalled < MAX_RESYNCS
+
+    def _resync(self, report):
+        report.resyncs += 1
+        self._stalled += 1
+        # Operands still in the TX FIFO would land after the reset and put
+        # the FPGA out of phase again: let them finish first
+        if hasattr(self.uart, "flush"):
+            self.uart.flush()
+        self._drain()
+        self.reset()
+        self._drain()
+
+    def run(self, pairs, results=None):
+        """Sends every pair, returns a SumReport. A bytes-like pairs buffer
+        is used in place, not copied. results, when given, must be a
+        bytearray of len(pairs) and receives the reply for each pair"""
+        ops = _flatten(pairs)
+        n = len(ops) // 2
+        opv = memoryview(ops)
+        report = SumReport(n)
+        uart, window, rx, rxv = self.uart, self.window, self._rx, self._rxv
+
+        sent = done = 0      # Pairs written / pairs settled
+        bad_run = 0
+        # Everything before `good` is confirmed by a correct reply; a resync
+        # rolls back to it and resends the rest
+        good = good_mis = good_drop = 0
+        self._stalled = 0
+        start = last = _ticks_ms()
+        while done < n:
+            # Keep the window full
+            if sent < n and sent - done < window:
+                k = min(window - (sent - done), n - sent)
+                uart.write(opv[2 * sent:2 * (sent + k)])
+                if sent == done:
+                    last = _ticks_ms()   # Timeout runs from the oldest pair
+                sent += k
+
+            got = uart.readinto(rx) if uart.any() else 0
+            if not got:
+                if sent > done and _ticks_diff(_ticks_ms(), last) > self.timeout_ms:
+                    # Silence: whatever is outstanding is lost. If an operand
+                    # byte went missing the FPGA is now out of phase.
+                    if self._can_resync():
+                        self._resync(report)
+                        done = sent = good
+                        report.mismatches, report.dropped = good_mis, good_drop
+                    else:
+                        report.dropped += sent - done
+                        done = sent
+                    bad_run = 0
+                    last = _ticks_ms()
+                continue
+
+            last = _ticks_ms()
+            for byte in rxv[:got]:
+                if done == sent:
+                    report.extra += 1
+                    continue
+                if byte == (ops[2 * done] + ops[2 * done + 1]) & 0xFF:
+                    report.ok += 1
+                elif not bad_run and done + 1 < sent \
+                        and byte == (ops[2 * done + 2] + ops[2 * done + 3]) & 0xFF:
+                    # The reply for this pair was lost, this one belongs to the next
+                    report.dropped += 1
+                    report.ok += 1
+                    done += 1
+                else:
+                    report.mismatches += 1
+                    bad_run += 1
+                    if results is not None:
+                        results[done] = byte
+                    done += 1
+                    continue
+                if results is not None:
+                    results[done] = byte
+                done += 1
+                bad_run = 0
+                self._stalled = 0
+                good, good_mis, good_drop = done, report.mismatches, report.dropped
+
+            if bad_run >= DESYNC_RUN and self._can_resync():
+                self._resync(report)
+                done = sent = good
+                report.mismatches, report.dropped = good_mis, good_drop
+                bad_run = 0
+
+        report.elapsed_ms = _ticks_diff(_ticks_ms(), start)
+        return report
+
+
+if __name__ == "__main__":
+    from machine import UART, Pin
+
+    reset_pin = Pin(2, Pin.OUT, value=0)
+
+    def reset_fpga():
+        reset_pin.value(1)
+        time.sleep_ms(1)
+        reset_pin.value(0)
+
+    reset_fpga()
+    uart = UART(0, baudrate=BAUD_RATE, tx=Pin(0), rx=Pin(1), rxbuf=256)
+    client = SumClient(uart, reset=reset_fpga)
+
+    # Every operand combination, 65536 sums. One value of a (256 pairs) per
+    # run, so the sweep needs a 512-byte buffer rather than 128 KB of heap
+    chunk = bytearray(2 * 256)
+    for b in range(256):
+        chunk[2 * b + 1] = b
+    report = SumReport(0)
+    for a in range(256):
+        for b in range(256):
+            chunk[2 * b] = a
+        report.add(client.run(chunk))
+    print(report)
+    print("Line limit: {:.0f} ops/s".format(BAUD_RATE / 20))
+    print("PASS" if report.passed() else "FAIL")
@@ -0,0 +1,297 @@
+"""
+Host-side model of the uart_sum FPGA design (top.v, uart_rx.v, uart_tx.v)
+served on a pseudo-terminal, so UART clients can be tested without hardware.
+
+The model works on whole bytes but keeps the design's timing in FPGA clock
+cycles (50 MHz by default):
+
+    uart_rx  - CLK / BAUD_RATE cycles per bit; a byte is valid half way
+               through its stop bit, so back-to-back bytes are fine
+    top      - S1 takes num1, S2 takes num2, S3 latches the sum and raises
+               the start flag, S4 drops it; rst returns to S1
+    uart_tx  - a tick every CLK / (BAUD_RATE * 16) cycles, 16 ticks per bit,
+               1 start + 8 data + 1 stop bits; a start flag seen while a
+               frame is still going out is ignored, so that sum is lost
+
+Faults (dropped operand or reply bytes, spurious bytes) can be injected
+with a seeded RNG to exercise client error handling.
+
+    python uart_sum_model.py                   # prints the pty path, serves until ^C
+    python uart_sum_model.py --drop-rx 0.001 --realtime
+
+In Python:
+
+    server = PtyServer(UartSumModel()).start()
+    uart = HostUART(server.path)
+    ...
+    server.stop()
+"""
+
+import argparse
+import heapq
+import os
+import random
+import select
+import threading
+import time
+
+try:
+    import pty
+    import termios
+    import tty
+except ImportError:  # Windows
+    pty = termios = tty = None
+
+CLK = 50_000_000
+BAUD_RATE = 115200
+OVERSAMPLING = 16
+FRAME_BITS = 10       # Start + 8 data + stop
+RX_CHUNK = 32         # Bytes taken off the pty per read in realtime mode
+
+
+class UartSumModel:
+    """Byte-level model of top.v with its UART timing, in FPGA clock cycles"""
+
+    def __init__(self, clk=CLK, baud=BAUD_RATE, drop_rx=0.0, drop_tx=0.0,
+                 extra=0.0, seed=None):
+        self.clk = clk
+        self.baud = baud
+        self.rx_bit = clk // baud                                       # CLOCKS_PER_BIT
+        self.tx_bit = (clk // (baud * OVERSAMPLING)) * OVERSAMPLING    # DIV_CNT_VAL + 1 per tick
+        self.drop_rx = drop_rx
+        self.drop_tx = drop_tx
+        self.extra = extra
+        self.rng = random.Random(seed)
+        self.stats = {"rx": 0, "tx": 0, "dropped_rx": 0, "dropped_tx": 0,
+                      "busy_tx": 0, "extra": 0}
+        self.reset()
+        self.tx_free = 0
+
+    def reset(self):
+        """Pulses rst: the FSM goes back to S1 (expecting num1)"""
+        self.num1 = None
+
+    def receive(self, byte, start):
+        """One byte whose start bit begins at cycle `start`.
+
+        Returns a list of (cycle, byte) for reply bytes, with cycle the end of
+        the reply frame on the TX line.
+        """
+        self.stats["rx"] += 1
+        if self.drop_rx and self.rng.random() < self.drop_rx:
+            self.stats["dropped_rx"] += 1
+            return []
+        valid = start + self.rx_bit // 2 + 9 * self.rx_bit        # o_RX_DV
+        out = []
+        if self.num1 is None:
+            self.num1 = byte
+        else:
+            total = (self.num1 + byte) & 0xFF
+            self.num1 = None
+            # S2 -> S3 -> flag, two-flop edge detect, then wait for the next tick
+            tx_start = valid + 4 + self.tx_bit // OVERSAMPLING
+            if tx_start < self.tx_free:
+                self.stats["busy_tx"] += 1
+            elif self.drop_tx and self.rng.random() < self.drop_tx:
+                self.stats["dropped_tx"] += 1
+                self.tx_free = tx_start + FRAME_BITS * self.tx_bit
+            else:
+                self.tx_free = tx_start + FRAME_BITS * self.tx_bit
+                out.append((self.tx_free, total))
+                self.stats["tx"] += 1
+        if self.extra and self.rng.random() < self.extra:
+            self.stats["extra"] += 1
+            t = max(self.tx_free, valid) + FRAME_BITS * self.tx_bit
+            self.tx_free = t
+            out.append((t, self.rng.randrange(256)))
+        return out
+
+    def byte_cycles(self):
+        """Cycles one byte occupies on the RX line"""
+        return FRAME_BITS * self.rx_bit
+
+
+class PtyServer:
+    """Serves a model on a pty. Bytes written by the client are placed on a
+    virtual RX line back to back (or when they arrive, if the line is idle).
+    With realtime set, the line is only fed as fast as the baud rate allows
+    and replies are written back at their modelled time; otherwise both
+    happen as soon as possible."""
+
+    def __init__(self, model, realtime=False):
+        if pty is None:
+            raise RuntimeError("pty is not available on this platform")
+        self.model = model
+        self.realtime = realtime
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.slave)
+        self.path = os.ttyname(self.slave)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.received = 0          # Bytes taken off the pty
+        self._line_idle = 0.0      # perf_counter() time the RX line goes idle
+
+    def reset(self):
+        """Reset pin for clients: drops any half-received operand pair"""
+        with self._lock:
+            self.model.reset()
+
+    def wait_received(self, nbytes, timeout=10.0):
+        """Blocks until nbytes have been read and clocked in on the RX line.
+        Stands in for tcdrain(), which returns at once on a pty"""
+        deadline = time.perf_counter() + timeout
+        while self.received < nbytes and time.perf_counter() < deadline:
+            time.sleep(0.001)
+        delay = self._line_idle - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return self.received >= nbytes
+
+    def start(self):
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        os.close(self.master)
+        os.close(self.slave)
+
+    def _serve(self):
+        model = self.model
+        cycle_s = 1.0 / model.clk
+        t0 = time.perf_counter()
+        line_free = 0          # Cycle at which the RX line is idle again
+        pending = []           # Heap of (cycle, seq, byte)
+        seq = 0
+        while not self._stop.is_set():
+            now = int((time.perf_counter() - t0) / cycle_s)
+            timeout = 0.05
+            if pending:
+                due = pending[0][0] if self.realtime else now
+                timeout = max(0.0, (due - now) * cycle_s)
+            # In realtime mode the RX line only takes what it can carry, so a
+            # fast writer sees backpressure like on a real UART
+            backlog = line_free - now if self.realtime else 0
+            low_water = RX_CHUNK // 2 * model.byte_cycles()
+            if backlog > low_water:
+                timeout = min(timeout, (backlog - low_water) * cycle_s)
+                ready = False
+                time.sleep(timeout)
+            else:
+                ready, _, _ = select.select([self.master], [], [], timeout)
+            if ready:
+                try:
+                    data = os.read(self.master, RX_CHUNK if self.realtime else 4096)
+                except OSError:
+                    break
+                now = int((time.perf_counter() - t0) / cycle_s)
+                with self._lock:
+                    for byte in data:
+                        start = max(line_free, now)
+                        line_free = start + model.byte_cycles()
+                        for cycle, reply in model.receive(byte, start):
+                            heapq.heappush(pending, (cycle, seq, reply))
+                            seq += 1
+                    self._line_idle = t0 + line_free * cycle_s
+                    self.received += len(data)
+            now = int((time.perf_counter() - t0) / cycle_s)
+            out = bytearray()
+            while pending and (not self.realtime or pending[0][0] <= now):
+                out.append(heapq.heappop(pending)[2])
+            if out:
+                os.write(self.master, out)
+
+
+class HostUART:
+    """machine.UART-like wrapper (write / readinto / any) around a tty path,
+    for running the MicroPython clients on the host against PtyServer or a
+    USB-serial adapter wired to the FPGA"""
+
+    def __init__(self, path, baud=BAUD_RATE):
+        self.fd = os.open(path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        if termios is not None:
+            tty.setraw(self.fd)
+            speed = getattr(termios, "B%d" % baud, None)
+            if speed is not None:
+                attrs = termios.tcgetattr(self.fd)
+                attrs[4] = attrs[5] = speed
+                termios.tcsetattr(self.fd, termios.TCSANOW, attrs)
+        self._buf = bytearray()
+
+    def write(self, data):
+        view = memoryview(data)
+        while view:
+            try:
+                n = os.write(self.fd, view)
+            except BlockingIOError:
+                select.select([], [self.fd], [])
+                continue
+            view = view[n:]
+        return len(data)
+
+    def flush(self):
+        """Waits until everything written has left the host side"""
+        if termios is not None:
+            termios.tcdrain(self.fd)
+
+    def _fill(self):
+        try:
+            self._buf += os.read(self.fd, 4096)
+        except (BlockingIOError, OSError):
+            pass
+
+    def any(self):
+        if not self._buf:
+            self._fill()
+        return len(self._buf)
+
+    def readinto(self, buf):
+        if not self._buf:
+            self._fill()
+        n = min(len(buf), len(self._buf))
+        buf[:n] = self._buf[:n]
+        del self._buf[:n]
+        return n
+
+    def read(self, n=-1):
+        if not self._buf:
+            self._fill()
+        n = len(self._buf) if n < 0 else min(n, len(self._buf))
+        data = bytes(self._buf[:n])
+        del self._buf[:n]
+        return data
+
+    def close(self):
+        os.close(self.fd)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the uart_sum model on a pty")
+    parser.add_argument("--baud", type=int, default=BAUD_RATE)
+    parser.add_argument("--realtime", action="store_true", help="reply at modelled line timing")
+    parser.add_argument("--drop-rx", type=float, default=0.0, help="operand byte loss probability")
+    parser.add_argument("--drop-tx", type=float, default=0.0, help="reply byte loss probability")
+    parser.add_argument("--extra", type=float, default=0.0, help="spurious byte probability")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    model = UartSumModel(baud=args.baud, drop_rx=args.drop_rx, drop_tx=args.drop_tx,
+                         extra=args.extra, seed=args.seed)
+    server = PtyServer(model, realtime=args.realtime).start()
+    print(server.path, flush=True)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(model.stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,22 +2,38 @@ from machine import Pin
 import time
 import shrike
 
+try:
+    from pinbus import PinBus
+except ImportError:  # pinbus.py not on the board, drive the pins one by one
+    PinBus = None
+
 led_pins = [4, 5, 6, 7, 8, 9, 10, 
             11, 14, 15, 16, 17, 
             18, 19, 20, 21, 22, 23, 24, 25, 26, 27,28,29]
 
-# Initialize all pins as outputs
-leds = [Pin(pin, Pin.OUT) for pin in led_pins]
+if PinBus:
+    # Initialize all pins as outputs, driven together in one register write
+    leds = PinBus(led_pins)
+else:
+    # Initialize all pins as outputs
+    leds = [Pin(pin, Pin.OUT) for pin in led_pins]
+
+
+def set_all(value):
+    if PinBus:
+        leds.write(0xFFFFFF if value else 0)
+    else:
+        for led in leds:
+            led.value(value)
+
 
 shrike.reset()
 shrike.flash("blink_all.bin")
 
 while True:
     # Blink all together
-    for led in leds:
-        led.value(1)
+    set_all(1)
     time.sleep(1)
 
-    for led in leds:
-        led.value(0)
+    set_all(0)
     time.sleep(1)
@@ -1,7 +1,7 @@
 #!/bin/bash
 
 # Step 1: Display a message
-sudo pip install mpremote 
+sudo pip install mpremote pyserial
 
 #Step2 : exicute the hardware testing script 
 
@@ -11,6 +11,12 @@ FILES_RPI=(
 FILES_SHRIKE=(
   "./../bitstreams/v1_4/blink_all.bin"
   "./main.py"
+  "./../../utils/shrike-pinbus/pinbus.py"
+)
+
+REPL_SESSION="./../../utils/shrike-repl/repl_session.py"
+SCRIPTS_SHRIKE=(
+  "./main.py"
 )
 
 MOUNT_DIR="/mnt/usb"
@@ -21,22 +27,22 @@ mkdir -p "$MOUNT_DIR"
 
 log() { echo "[$(date '+%H:%M:%S')] $*"; }
 
-run_mpremote_after_copy() {
+run_scripts_after_copy() {
   local timeout_sec=60   # max time to wait for /dev/ttyACM0
-  local mpremote_timeout=8  # max time to allow mpremote to run
+  local script_timeout=8  # max time to allow each script to run
 
   log "Waiting for MicroPython serial device..."
   for ((i=0; i<timeout_sec; i++)); do
     if [[ -e /dev/ttyACM0 ]]; then
       sleep 2
       log "Found serial: /dev/ttyACM0"
-      log "Running main.py via mpremote (timeout ${mpremote_timeout}s)..."
+      log "Running ${#SCRIPTS_SHRIKE[@]} script(s) in one REPL session (timeout ${script_timeout}s each)..."
 
-      # --- Run with timeout ---
-      if timeout "$mpremote_timeout" mpremote connect /dev/ttyACM0 run main.py; then
-        log "mpremote: completed successfully"
+      # --- One raw-REPL session for all scripts ---
+      if python3 "$REPL_SESSION" --port /dev/ttyACM0 --timeout "$script_timeout" "${SCRIPTS_SHRIKE[@]}"; then
+        log "scripts: completed successfully"
       else
-        log "WARN: mpremote timed out or failed"
+        log "WARN: a script timed out or failed"
       fi
       return
     fi
@@ -50,7 +56,7 @@ copy_and_eject() {
   local device_node="$1"
   local id_str="$2"
   local -n files_arr=$3
-  local auto_run="${4:-0}"   # 1 if we should run mpremote afterward
+  local auto_run="${4:-0}"   # 1 if we should run the scripts afterward
 
   # detect or create mountpoint
   local mountpoint
@@ -89,9 +95,9 @@ copy_and_eject() {
   log "Eject/power-off $device_node"
   #sudo udisksctl power-off -b "$device_node" >/dev/null 2>&1 || log "WARN: udisksctl power-off failed"
 
-  # optional: run mpremote after eject (for Shrike only)
+  # optional: run the scripts after eject (for Shrike only)
   if [[ "$auto_run" -eq 1 ]]; then
-    run_mpremote_after_copy
+    run_scripts_after_copy
   fi
 }
 
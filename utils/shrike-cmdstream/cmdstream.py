@@ -0,0 +1,195 @@
+"""
+Bulk command streams for byte-command FPGA designs (uart_led, i2c_led, ...).
+
+Instead of one write per command with a sleep in between, commands are
+collected into batches and handed to the bus in a single call:
+
+    UARTChannel  - uart.write() of one preallocated buffer per batch
+    I2CChannel   - i2c.writevto() scatter-gather, one transaction per batch
+
+and a Scheduler plays timed sequences, sending every command due at the
+same moment as one batch:
+
+    ch = UARTChannel(UART(0, baudrate=115200, tx=Pin(0), rx=Pin(1)))
+    send(ch, [0xAB, 0xFF] * 100)                 # 200 commands, one write
+    Scheduler(ch).play(blink(on=0xAB, off=0xFF, period_ms=100, count=50))
+
+Commands are an int (one byte) or a bytes-like object. Timed commands are
+(t_us, command) with t_us measured from the start of play(); sequences may
+be lists or generators and must be in time order.
+"""
+
+import time
+
+try:
+    _ticks_us, _ticks_diff, _ticks_add = time.ticks_us, time.ticks_diff, time.ticks_add
+    _sleep_ms = time.sleep_ms
+except AttributeError:  # CPython
+    def _ticks_us():
+        return int(time.perf_counter() * 1_000_000)
+
+    def _ticks_diff(a, b):
+        return a - b
+
+    def _ticks_add(a, b):
+        return a + b
+
+    def _sleep_ms(ms):
+        time.sleep(ms / 1000)
+
+# Command bytes of the example designs
+UART_LED_ON = 0xAB
+UART_LED_OFF = 0xFF
+I2C_LED_ON = 0xAA
+I2C_LED_OFF = 0xFF
+
+BATCH = 64        # Bytes per bulk write
+SPIN_US = 2000    # Busy-wait this close to a deadline instead of sleeping
+
+
+class UARTChannel:
+    """Batches commands into one uart.write() per batch"""
+
+    def __init__(self, uart, batch=BATCH):
+        self.uart = uart
+        self._buf = bytearray(batch)
+        self._view = memoryview(self._buf)
+        self._n = 0
+        self.writes = 0
+        self.bytes = 0
+
+    def add(self, cmd):
+        """Queues one command, flushing first if it would not fit"""
+        if isinstance(cmd, int):
+            if self._n == len(self._buf):
+                self.flush()
+            self._buf[self._n] = cmd
+            self._n += 1
+            return
+        if self._n + len(cmd) > len(self._buf):
+            self.flush()
+            if len(cmd) > len(self._buf):
+                self._write(cmd)
+                return
+        self._buf[self._n:self._n + len(cmd)] = cmd
+        self._n += len(cmd)
+
+    def _write(self, data):
+        self.uart.write(data)
+        self.writes += 1
+        self.bytes += len(data)
+
+    def flush(self):
+        if self._n:
+            self._write(self._view[:self._n])
+            self._n = 0
+
+
+class I2CChannel:
+    """Batches commands into one i2c.writevto() transaction per batch; each
+    command stays its own buffer, no copying"""
+
+    def __init__(self, i2c, addr, batch=BATCH):
+        self.i2c = i2c
+        self.addr = addr
+        self.batch = batch
+        self._singles = [bytes([b]) for b in range(256)]
+        self._vec = []
+        self._n = 0
+        self.writes = 0
+        self.bytes = 0
+
+    def add(self, cmd):
+        if isinstance(cmd, int):
+            cmd = self._singles[cmd]
+        if self._vec and self._n + len(cmd) > self.batch:
+            self.flush()
+        self._vec.append(cmd)
+        self._n += len(cmd)
+
+    def flush(self):
+        if self._vec:
+            self.i2c.writevto(self.addr, self._vec)
+            self.writes += 1
+            self.bytes += self._n
+            self._vec = []
+            self._n = 0
+
+
+def send(channel, commands):
+    """Sends untimed commands as fast as the bus allows, in bulk writes"""
+    for cmd in commands:
+        channel.add(cmd)
+    channel.flush()
+
+
+class Scheduler:
+    """Plays (t_us, command) sequences, one bulk write per time slot.
+
+    After play() returns, `late_us` holds the worst lateness of a slot and
+    `slots` the number of bulk writes issued for timed slots.
+    """
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.late_us = 0
+        self.slots = 0
+
+    def _wait_until(self, deadline):
+        remaining = _ticks_diff(deadline, _ticks_us())
+        if remaining > SPIN_US:
+            _sleep_ms((remaining - SPIN_US) // 1000)
+        while _ticks_diff(deadline, _ticks_us()) > 0:
+            pass
+
+    def play(self, sequence, loop=False):
+        """Runs a timed sequence; loop=True repeats it (lists only) until
+        interrupted, each pass starting where the previous one ended"""
+        channel = self.channel
+        self.late_us = 0
+        self.slots = 0
+        start = _ticks_us()
+        while True:
+            slot_t = None
+            end = 0
+            for t, cmd in sequence:
+                if slot_t is not None and t != slot_t:
+                    self._send_slot(start, slot_t)
+                if t != slot_t:
+                    if slot_t is not None and t < slot_t:
+                        raise ValueError("sequence is not in time order")
+                    slot_t = t
+                    self._wait_until(_ticks_add(start, t))
+                channel.add(cmd)
+                end = t
+            if slot_t is not None:
+                self._send_slot(start, slot_t)
+            if not loop:
+                return
+            start = _ticks_add(start, end)
+
+    def _send_slot(self, start, t):
+        self.channel.flush()
+        self.slots += 1
+        late = _ticks_diff(_ticks_us(), _ticks_add(start, t))
+        if late > self.late_us:
+            self.late_us = late
+
+
+# --- SEQUENCE HELPERS ---
+
+def blink(on, off, period_ms, count, duty=0.5):
+    """Timed on/off commands for count periods"""
+    period = int(period_ms * 1000)
+    on_time = int(period * duty)
+    for i in range(count):
+        yield i * period, on
+        yield i * period + on_time, off
+    yield count * period, off
+
+
+def at_rate(commands, rate_hz, t0_us=0):
+    """Spreads untimed commands evenly at rate_hz"""
+    step = 1_000_000 / rate_hz
+    for i, cmd in enumerate(commands):
+        yield t0_us + int(i * step), cmd
@@ -0,0 +1,278 @@
+"""
+Incremental deploy of bitstreams and scripts to one or many Shrike boards.
+
+For every board, one raw-REPL round trip returns the board's unique ID and
+the size and SHA-256 of each target file on its filesystem. Only files whose
+hash differs from the local copy are transferred, in large base64 chunks
+sent in raw-paste mode, written to a temporary name, checked on the device
+and renamed into place. A manifest (.shrike-deploy.json) remembers what was
+deployed to each board by unique ID; with --fast the device only reports
+file sizes and the manifest hash is trusted when the size matches.
+
+    python shrike_deploy.py --port /dev/ttyACM0 blink_all.bin main.py
+    python shrike_deploy.py --all blink_all.bin main.py ../shrike-pinbus/pinbus.py
+    python shrike_deploy.py --all --fast --reset build/top.bin:bitstream.bin main.py
+
+SRC:DEST deploys SRC under another path on the board (default: its basename
+in the root directory). Needs pyserial.
+"""
+
+import argparse
+import ast
+import base64
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "shrike-repl"))
+
+from rawrepl import RawREPL, ReplError  # noqa: E402
+
+MANIFEST = ".shrike-deploy.json"
+CHUNK = 8192                 # Decoded bytes per exec; the device compiles each one
+LINE = 3072                  # Decoded bytes per a2b_base64() call
+RP2_USB_VID = 0x2E8A         # Raspberry Pi (RP2040 / RP2350 MicroPython CDC)
+
+# One round trip: unique ID plus [size, sha256] (or None) for every path
+QUERY = """
+import os, binascii, machine
+def _h(p, full):
+    try:
+        size = os.stat(p)[6]
+    except OSError:
+        return None
+    if not full:
+        return [size, None]
+    import hashlib
+    h = hashlib.sha256()
+    b = bytearray(1024)
+    mv = memoryview(b)
+    with open(p, 'rb') as f:
+        while True:
+            n = f.readinto(b)
+            if not n:
+                break
+            h.update(mv[:n])
+    return [size, binascii.hexlify(h.digest()).decode()]
+print(repr([binascii.hexlify(machine.unique_id()).decode(), [_h(p, {full}) for p in {paths!r}]]))
+del _h
+"""
+
+OPEN = """
+import os, binascii
+for _p in {dirs!r}:
+    try:
+        os.mkdir(_p)
+    except OSError:
+        pass
+_f = open({tmp!r}, 'wb')
+_w = _f.write
+_d = binascii.a2b_base64
+"""
+
+CLOSE = """
+_f.close()
+import hashlib
+_s = hashlib.sha256()
+with open({tmp!r}, 'rb') as _g:
+    while True:
+        _b = _g.read(1024)
+        if not _b:
+            break
+        _s.update(_b)
+_s = binascii.hexlify(_s.digest()).decode()
+if _s == {digest!r}:
+    try:
+        os.remove({dest!r})
+    except OSError:
+        pass
+    os.rename({tmp!r}, {dest!r})
+else:
+    os.remove({tmp!r})
+print(_s)
+del _f, _w, _d, _s, _g, _b
+"""
+
+
+def sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def parse_targets(specs):
+    """SRC[:DEST] -> list of (src, dest, data, sha256)"""
+    targets = []
+    for spec in specs:
+        src, _, dest = spec.partition(":")
+        if not os.path.isfile(src):
+            raise SystemExit(f"not a file: {src}")
+        dest = dest or os.path.basename(src)
+        if not dest.startswith("/"):
+            dest = "/" + dest
+        with open(src, "rb") as f:
+            data = f.read()
+        targets.append((src, dest, data, hashlib.sha256(data).hexdigest()))
+    return targets
+
+
+def parent_dirs(path):
+    parts = path.strip("/").split("/")[:-1]
+    return ["/" + "/".join(parts[:i + 1]) for i in range(len(parts))]
+
+
+def query(repl, paths, full=True):
+    out = repl.exec(QUERY.format(paths=paths, full=full))
+    uid, states = ast.literal_eval(out.decode().strip())
+    return uid, states
+
+
+def upload(repl, dest, data, digest, chunk=CHUNK):
+    """Writes data to dest on the device; returns True if the device-side
+    hash matched and the file was put in place"""
+    tmp = dest + ".part"
+    repl.exec(OPEN.format(dirs=parent_dirs(dest), tmp=tmp))
+    for start in range(0, len(data), chunk):
+        block = data[start:start + chunk]
+        lines = [f"_w(_d({base64.b64encode(block[i:i + LINE]).decode()!r}))"
+                 for i in range(0, len(block), LINE)]
+        repl.exec("\n".join(lines), timeout=30)
+    got = repl.exec(CLOSE.format(tmp=tmp, dest=dest, digest=digest)).decode().strip()
+    return got == digest
+
+
+class Manifest:
+    """{board unique id: {device path: sha256}} on disk, shared by threads"""
+
+    def __init__(self, path=MANIFEST):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self.boards = json.load(f)
+        except (OSError, ValueError):
+            self.boards = {}
+
+    def get(self, uid):
+        with self.lock:
+            return dict(self.boards.get(uid, {}))
+
+    def update(self, uid, files):
+        with self.lock:
+            self.boards.setdefault(uid, {}).update(files)
+
+    def save(self):
+        with self.lock:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.boards, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+
+
+def deploy_board(port, targets, manifest, fast=False, reset=False, dry_run=False,
+                 chunk=CHUNK, repl_factory=RawREPL.open):
+    """Deploys targets to one board, returns a summary dict"""
+    t0 = time.monotonic()
+    repl = None
+    summary = {"port": port, "uploaded": [], "skipped": [], "failed": [], "bytes": 0}
+    try:
+        # Opening enters the raw REPL: an unplugged or wedged board fails
+        # here and is reported like any other error, not raised to the pool
+        repl = repl_factory(port)
+        uid, states = query(repl, [t[1] for t in targets], full=not fast)
+        summary["uid"] = uid
+        known = manifest.get(uid)
+        done = {}
+        for (src, dest, data, digest), state in zip(targets, states):
+            if state is not None:
+                size, remote = state
+                if remote is None and size == len(data):
+                    remote = known.get(dest)       # --fast: trust the manifest
+                if remote == digest:
+                    summary["skipped"].append(dest)
+                    done[dest] = digest
+                    continue
+            if dry_run:
+                summary["uploaded"].append(dest)
+                continue
+            if upload(repl, dest, data, digest, chunk):
+                summary["uploaded"].append(dest)
+                summary["bytes"] += len(data)
+                done[dest] = digest
+            else:
+                summary["failed"].append(dest)
+        manifest.update(uid, done)
+        if reset and not dry_run:
+            repl.exit()
+            repl.port.write(b"\x04")   # Soft reset from the friendly REPL: runs main.py
+    except (ReplError, TimeoutError, OSError) as e:
+        summary["error"] = str(e)
+    finally:
+        try:
+            if repl is not None:
+                if not reset:
+                    repl.exit()
+                repl.port.close()
+        except OSError:
+            pass
+    summary["seconds"] = round(time.monotonic() - t0, 2)
+    return summary
+
+
+def find_boards():
+    from serial.tools import list_ports
+    return sorted(p.device for p in list_ports.comports() if p.vid == RP2_USB_VID)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental deploy to Shrike boards")
+    parser.add_argument("files", nargs="+", metavar="SRC[:DEST]")
+    parser.add_argument("--port", action="append", default=[], help="serial port (repeatable)")
+    parser.add_argument("--all", action="store_true", help="every attached RP2040/RP2350 board")
+    parser.add_argument("--fast", action="store_true",
+                        help="compare sizes on the device and hashes from the manifest")
+    parser.add_argument("--reset", action="store_true", help="soft reset boards afterwards")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would change")
+    parser.add_argument("--manifest", default=MANIFEST)
+    parser.add_argument("--chunk", type=int, default=CHUNK, help="bytes per raw-REPL exec")
+    parser.add_argument("--jobs", type=int, default=16, help="boards deployed in parallel")
+    args = parser.parse_args()
+
+    ports = list(args.port)
+    if args.all:
+        ports += [p for p in find_boards() if p not in ports]
+    if not ports:
+        raise SystemExit("no boards: use --port or --all")
+
+    targets = parse_targets(args.files)
+    manifest = Manifest(args.manifest)
+    t0 = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(
+            lambda p: deploy_board(p, targets, manifest, args.fast, args.reset,
+                                   args.dry_run, args.chunk), ports))
+    if not args.dry_run:
+        manifest.save()
+
+    failed = 0
+    for r in results:
+        if "error" in r or r["failed"]:
+            failed += 1
+        status = r.get("error") or ", ".join(
+            f"{len(r[k])} {k}" for k in ("uploaded", "skipped", "failed") if r[k])
+        print(f"{r['port']:<16} {r.get('uid', '?'):<18} {r['bytes']:>8} B "
+              f"{r['seconds']:>6.2f} s  {status}")
+        for dest in r["uploaded"]:
+            print(f"{'':<16} + {dest}")
+    print(f"{len(ports)} boards in {time.monotonic() - t0:.2f} s, {failed} failed")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Host-side collector for shrike_diag JSON lines.
+
+Reads REPL captures from log files, stdin or live serial ports, aggregates the
+records across boards and prints per-test and per-board latency histograms.
+
+    mpremote connect /dev/ttyACM0 run vector_8.py > board1.log
+    python diag_collect.py board1.log board2.log
+    python diag_collect.py --port /dev/ttyACM0 --port /dev/ttyACM1
+    python diag_collect.py board*.log --json report.json
+"""
+
+import argparse
+import json
+import sys
+
+TAG = "shrike_diag"
+
+# Histogram buckets in microseconds (upper bounds), roughly x4 per step.
+BUCKETS = (100, 250, 1_000, 2_500, 10_000, 25_000, 100_000, 250_000, 1_000_000)
+
+
+def parse_lines(lines):
+    """Yields diag records from an iterable of text lines, skipping the rest"""
+    for line in lines:
+        line = line.strip()
+        if not line.startswith("{") or TAG not in line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if record.get(TAG):
+            yield record
+
+
+def read_port(port, baudrate=115200, timeout=60):
+    """Yields lines from a serial port until the suite summary arrives"""
+    import serial  # pyserial, as used by shrike-ctl.py
+    with serial.Serial(port, baudrate, timeout=timeout) as ser:
+        while True:
+            raw = ser.readline()
+            if not raw:
+                return
+            line = raw.decode(errors="replace")
+            yield line
+            if TAG in line and '"summary"' in line:
+                return
+
+
+def bucket_label(i):
+    lo = 0 if i == 0 else BUCKETS[i - 1]
+    if i == len(BUCKETS):
+        return f">{_fmt_us(lo)}"
+    return f"{_fmt_us(lo)}-{_fmt_us(BUCKETS[i])}"
+
+
+def _fmt_us(us):
+    if us >= 1_000_000:
+        return f"{us / 1_000_000:g}s"
+    if us >= 1_000:
+        return f"{us / 1_000:g}ms"
+    return f"{us}us"
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0
+    k = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+class Stats:
+    """Latency and bus usage accumulated for one key (test or board)"""
+
+    def __init__(self):
+        self.latencies = []
+        self.failures = 0
+        self.txn = 0
+        self.bytes = 0
+        self.hist = [0] * (len(BUCKETS) + 1)
+
+    def add(self, record):
+        us = record.get("us", 0)
+        self.latencies.append(us)
+        self.failures += 0 if record.get("pass") else 1
+        self.txn += record.get("txn", 0)
+        self.bytes += record.get("bytes", 0)
+        for i, bound in enumerate(BUCKETS):
+            if us <= bound:
+                self.hist[i] += 1
+                break
+        else:
+            self.hist[-1] += 1
+
+    def to_dict(self):
+        lat = sorted(self.latencies)
+        return {
+            "count": len(lat),
+            "failures": self.failures,
+            "p50_us": percentile(lat, 50),
+            "p95_us": percentile(lat, 95),
+            "max_us": lat[-1] if lat else 0,
+            "txn": self.txn,
+            "bytes": self.bytes,
+            "histogram": {bucket_label(i): n for i, n in enumerate(self.hist) if n},
+        }
+
+
+def aggregate(records):
+    """Groups check records by (suite, test) and by board"""
+    by_test, by_board, summaries = {}, {}, []
+    for record in records:
+        if record.get("summary"):
+            summaries.append(record)
+            continue
+        key = f"{record.get('suite', '?')}/{record.get('name', '?')}"
+        by_test.setdefault(key, Stats()).add(record)
+        by_board.setdefault(record.get("board", "?"), Stats()).add(record)
+    return {
+        "tests": {k: v.to_dict() for k, v in sorted(by_test.items())},
+        "boards": {k: v.to_dict() for k, v in sorted(by_board.items())},
+        "summaries": summaries,
+    }
+
+
+def print_report(report, out=sys.stdout):
+    for title, group in (("TEST", report["tests"]), ("BOARD", report["boards"])):
+        print("=" * 96, file=out)
+        print(f"{title:40} {'N':>5} {'FAIL':>5} {'p50':>9} {'p95':>9} {'max':>9} {'txn':>7} {'bytes':>8}",
+              file=out)
+        print("=" * 96, file=out)
+        rows = sorted(group.items(), key=lambda kv: kv[1]["p95_us"], reverse=True)
+        for key, s in rows:
+            print(f"{key[:40]:40} {s['count']:5} {s['failures']:5} {_fmt_us(s['p50_us']):>9} "
+                  f"{_fmt_us(s['p95_us']):>9} {_fmt_us(s['max_us']):>9} {s['txn']:7} {s['bytes']:8}",
+                  file=out)
+            hist = "  ".join(f"{label}:{n}" for label, n in s["histogram"].items())
+            print(f"    {hist}", file=out)
+    for s in report["summaries"]:
+        print(f"{s.get('board')} {s.get('suite')}: {s.get('passed')}/{s.get('total')} passed "
+              f"in {_fmt_us(s.get('us', 0))}", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate shrike_diag results")
+    parser.add_argument("logs", nargs="*", help="REPL capture files ('-' for stdin)")
+    parser.add_argument("--port", action="append", default=[],
+                        help="read a live board until its summary line (repeatable)")
+    parser.add_argument("--json", metavar="FILE", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    records = []
+    for path in args.logs or ([] if args.port else ["-"]):
+        if path == "-":
+            records.extend(parse_lines(sys.stdin))
+        else:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                records.extend(parse_lines(f))
+    for port in args.port:
+        records.extend(parse_lines(read_port(port)))
+
+    report = aggregate(records)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Structured, timed diagnostics for Shrike example drivers (MicroPython).
+
+Each check() records name, expected and got values, wall time and the SPI
+traffic since the previous check, prints the usual PASS/FAIL line and emits
+one JSON line over the REPL for diag_collect.py to pick up on the host.
+
+    from shrike_diag import Runner
+    diag = Runner("vector-8")
+    spi, cs = diag.instrument(spi, cs)   # count transactions and bytes
+    diag.check("LDA 255", send_instr(OP_LDA, 255), 255)
+    diag.summary()
+"""
+
+import json
+import time
+
+try:
+    _ticks_us, _ticks_diff = time.ticks_us, time.ticks_diff
+except AttributeError:  # CPython, e.g. driving a FakeSPI
+    def _ticks_us():
+        return time.perf_counter_ns() // 1000
+
+    def _ticks_diff(a, b):
+        return a - b
+
+try:
+    import machine
+    import binascii
+    BOARD_ID = binascii.hexlify(machine.unique_id()).decode()
+except (ImportError, AttributeError):
+    BOARD_ID = "host"
+
+# Every JSON line carries this key so the collector can tell it apart from
+# ordinary print() output on the same REPL.
+TAG = "shrike_diag"
+
+
+class CountingSPI:
+    """Wraps a machine.SPI and counts the bytes moved through it"""
+
+    def __init__(self, spi, runner):
+        self.spi = spi
+        self._runner = runner
+
+    def write(self, buf):
+        self._runner.bytes += len(buf)
+        return self.spi.write(buf)
+
+    def read(self, nbytes, write=0x00):
+        self._runner.bytes += nbytes
+        return self.spi.read(nbytes, write)
+
+    def readinto(self, buf, write=0x00):
+        self._runner.bytes += len(buf)
+        return self.spi.readinto(buf, write)
+
+    def write_readinto(self, write_buf, read_buf):
+        self._runner.bytes += len(write_buf)
+        return self.spi.write_readinto(write_buf, read_buf)
+
+    def __getattr__(self, name):
+        return getattr(self.spi, name)
+
+
+class CountingCS:
+    """Wraps a chip-select Pin and counts falling edges as transactions"""
+
+    def __init__(self, pin, runner):
+        self.pin = pin
+        self._runner = runner
+
+    def value(self, v=None):
+        if v is None:
+            return self.pin.value()
+        if not v and self.pin.value():
+            self._runner.transactions += 1
+        self.pin.value(v)
+
+    def __call__(self, v=None):
+        return self.value(v)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def __getattr__(self, name):
+        return getattr(self.pin, name)
+
+
+class Runner:
+    """Collects one structured record per check"""
+
+    def __init__(self, suite, board=BOARD_ID, echo=True, emit=True):
+        self.suite = suite
+        self.board = board
+        self.echo = echo
+        self.emit = emit
+        self.transactions = 0
+        self.bytes = 0
+        self.passed = 0
+        self.total = 0
+        self.results = []
+        self._t_start = _ticks_us()
+        self.mark()
+
+    def instrument(self, spi, cs=None):
+        """Returns counting wrappers for an SPI handle and its CS pin"""
+        spi = CountingSPI(spi, self)
+        if cs is None:
+            return spi
+        return spi, CountingCS(cs, self)
+
+    def mark(self):
+        """Starts a new measurement window (done implicitly by every check)"""
+        self._t0 = _ticks_us()
+        self._txn0 = self.transactions
+        self._bytes0 = self.bytes
+
+    def check(self, name, got, expected, passed=None, echo=None):
+        """Records one result covering all work since the previous check.
+
+        passed defaults to got == expected. Returns 1 on PASS, 0 on FAIL.
+        """
+        us = _ticks_diff(_ticks_us(), self._t0)
+        if passed is None:
+            passed = got == expected
+        record = {
+            TAG: 1,
+            "board": self.board,
+            "suite": self.suite,
+            "name": name,
+            "expected": expected,
+            "got": got,
+            "pass": bool(passed),
+            "us": us,
+            "txn": self.transactions - self._txn0,
+            "bytes": self.bytes - self._bytes0,
+        }
+        self.results.append(record)
+        self.total += 1
+        self.passed += 1 if passed else 0
+
+        if self.echo if echo is None else echo:
+            status = "PASS" if passed else "FAIL"
+            print(f"  [{status}] {name:25} | Got: {got} | Exp: {expected} | {us} us")
+        if self.emit:
+            print(json.dumps(record))
+        self.mark()
+        return 1 if passed else 0
+
+    def summary(self):
+        """Emits the suite totals and returns (passed, total)"""
+        if self.emit:
+            print(json.dumps({
+                TAG: 1,
+                "board": self.board,
+                "suite": self.suite,
+                "summary": True,
+                "passed": self.passed,
+                "total": self.total,
+                "us": _ticks_diff(_ticks_us(), self._t_start),
+            }))
+        return self.passed, self.total
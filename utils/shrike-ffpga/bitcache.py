@@ -0,0 +1,233 @@
+"""
+Content-addressed store of prebuilt bitstreams, keyed by what the bitstream
+is built from.
+
+The design key of a project is a SHA-256 over:
+
+- the chip (part number, package);
+- the synthesis and bitstream settings of the .ffpga (not simulation, and
+  not host-only settings such as the CPU count of the build machine);
+- the I/O planner assignments (port -> IOB location);
+- the contents of the Verilog sources: the non-testbench modules the project
+  references, plus every other .v file in the same directories (projects
+  often still reference a top file that has since been renamed). Line
+  endings are normalised so a Windows checkout gives the same key.
+
+Layout changes, window positions and the projectChecksum do not affect the
+key. Bitstreams are stored once under their own hash, and index.json maps
+design keys to them:
+
+    store/index.json
+    store/objects/ab/ab12...ef.bin
+
+    python bitcache.py                          # fresh / stale / unbuilt per example
+    python bitcache.py --put led_blink          # store ffpga/build/bitstream/FPGA_bitstream_MCU.bin
+    python bitcache.py --get led_blink -o led_blink.bin
+    python bitcache.py --explain stack_processor
+    python bitcache.py --store https://lab.example/bitstreams --get Vector-8
+
+The store is a directory (SHRIKE_BITSTORE, default ~/.cache/shrike/bitstreams)
+or, read-only, an http(s) URL serving a copy of one.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import urllib.request
+
+from ffpga_index import CACHE, ROOT, Index, file_hash
+
+KEY_VERSION = 2
+# Settings that do not change the bitstream: simulation options and the
+# number of CPUs Go Configure may use on the build machine
+HOST_SETTINGS = ("simulation/", "generateBitstream/MAX_CPU")
+BUILD_OUTPUT = os.path.join("ffpga", "build", "bitstream", "FPGA_bitstream_MCU.bin")
+DEFAULT_STORE = os.environ.get("SHRIKE_BITSTORE",
+                               os.path.join(os.path.expanduser("~"), ".cache", "shrike", "bitstreams"))
+
+
+# --- DESIGN KEYS ---
+
+def design_sources(project_dir, info):
+    """Paths (relative to the project dir) of the Verilog the bitstream is built from"""
+    refs = [path for kind, names in info["modules"].items() if kind != "sim"
+            for name in names if (path := info["sources"].get(name))]
+    dirs = {os.path.dirname(p) for p in refs} or {d for d in (os.path.join("ffpga", "src"), "src")
+                                                   if os.path.isdir(os.path.join(project_dir, d))}
+    found = set(refs)
+    for d in dirs:
+        for f in os.listdir(os.path.join(project_dir, d)):
+            if f.endswith((".v", ".sv")):
+                found.add(os.path.join(d, f))
+    return sorted(found)
+
+
+def source_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read().replace(b"\r\n", b"\n")).hexdigest()
+
+
+def design_inputs(project_dir, info):
+    """{input name: value or content hash}, the things the design key covers"""
+    chip = info["chip"]
+    inputs = {"chip": f"{chip.get('partNumber')}/{chip.get('package')}"}
+    for key, value in info["settings"].items():
+        if not key.startswith(HOST_SETTINGS):
+            inputs["setting:" + key] = value
+    for p in info["ports"]:
+        inputs["pin:" + p["port"]] = p["location"]
+    for rel in design_sources(project_dir, info):
+        inputs["src:" + rel.replace(os.sep, "/")] = source_hash(os.path.join(project_dir, rel))
+    return inputs
+
+
+def design_key(inputs):
+    blob = json.dumps({"version": KEY_VERSION, "inputs": inputs}, sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def changed_inputs(old, new):
+    """Names of inputs added, removed or changed between two input sets"""
+    return sorted(k for k in set(old) | set(new) if old.get(k) != new.get(k))
+
+
+# --- STORE ---
+
+class Store:
+    """index.json plus objects/, on disk or (read-only) over http(s)"""
+
+    def __init__(self, location):
+        self.location = location.rstrip("/")
+        self.remote = self.location.startswith(("http://", "https://"))
+        try:
+            self.index = json.loads(self._read("index.json"))
+        except (OSError, ValueError):
+            self.index = {}
+        self.index.setdefault("keys", {})
+        self.index.setdefault("projects", {})
+
+    def _read(self, name):
+        if self.remote:
+            with urllib.request.urlopen(f"{self.location}/{name}", timeout=30) as r:
+                return r.read()
+        with open(os.path.join(self.location, name), "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def _object(digest):
+        return f"objects/{digest[:2]}/{digest}.bin"
+
+    def lookup(self, key):
+        return self.index["keys"].get(key)
+
+    def put(self, key, project, inputs, bitstream):
+        digest = file_hash(bitstream)
+        dest = os.path.join(self.location, *self._object(digest).split("/"))
+        if not os.path.exists(dest):
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            shutil.copyfile(bitstream, dest + ".tmp")
+            os.replace(dest + ".tmp", dest)
+        self.index["keys"][key] = {
+            "bitstream": digest, "size": os.path.getsize(bitstream), "project": project,
+            "stored": time.strftime("%Y-%m-%d %H:%M:%S"), "inputs": inputs,
+        }
+        self.index["projects"][project] = key
+        tmp = os.path.join(self.location, "index.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(tmp, os.path.join(self.location, "index.json"))
+        return digest
+
+    def get(self, key, out):
+        entry = self.lookup(key)
+        data = self._read(self._object(entry["bitstream"]))
+        if hashlib.sha256(data).hexdigest() != entry["bitstream"]:
+            raise SystemExit(f"store object {entry['bitstream']} is corrupt")
+        with open(out + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(out + ".tmp", out)
+        return entry
+
+
+# --- REPORTS ---
+
+def status(store, rel, inputs, key):
+    """("fresh" | "stale" | "unbuilt", detail)"""
+    if store.lookup(key):
+        return "fresh", store.lookup(key)["bitstream"][:12]
+    last = store.index["projects"].get(rel)
+    if last and last in store.index["keys"]:
+        changed = changed_inputs(store.index["keys"][last]["inputs"], inputs)
+        more = f" +{len(changed) - 3}" if len(changed) > 3 else ""
+        return "stale", "changed: " + ", ".join(changed[:3]) + more
+    return "unbuilt", ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bitstream store keyed by design sources and settings")
+    parser.add_argument("--root", default=ROOT, help="directory searched for .ffpga files")
+    parser.add_argument("--cache", default=CACHE, help="ffpga_index cache file")
+    parser.add_argument("--store", default=DEFAULT_STORE, help="store directory or http(s) URL")
+    parser.add_argument("--put", metavar="PROJECT", help="store the project's bitstream")
+    parser.add_argument("--bitstream", help=f"file to store with --put (default: {BUILD_OUTPUT})")
+    parser.add_argument("--force", action="store_true", help="store even if older than the sources")
+    parser.add_argument("--get", metavar="PROJECT", help="fetch the bitstream matching the sources")
+    parser.add_argument("-o", "--output", help="file written by --get (default: <project>.bin)")
+    parser.add_argument("--explain", metavar="PROJECT", help="list the inputs of the design key")
+    args = parser.parse_args()
+
+    index = Index(args.root, args.cache).update()
+    index.save()
+    store = Store(args.store)
+
+    def resolve(pattern):
+        rel, info = index.find(pattern)
+        project_dir = os.path.join(index.root, os.path.dirname(rel))
+        inputs = design_inputs(project_dir, info)
+        return rel, project_dir, inputs, design_key(inputs)
+
+    if args.put:
+        if store.remote:
+            raise SystemExit("cannot store to a remote store")
+        rel, project_dir, inputs, key = resolve(args.put)
+        bitstream = args.bitstream or os.path.join(project_dir, BUILD_OUTPUT)
+        if not os.path.exists(bitstream):
+            raise SystemExit(f"{bitstream} not found; generate the bitstream first")
+        newest = max((os.path.getmtime(os.path.join(project_dir, k[4:])) for k in inputs
+                      if k.startswith("src:")), default=0)
+        if os.path.getmtime(bitstream) < newest and not args.force:
+            raise SystemExit(f"{bitstream} is older than the sources of {rel}; rebuild or use --force")
+        digest = store.put(key, rel, inputs, bitstream)
+        print(f"{rel}: key {key[:12]} -> bitstream {digest[:12]}")
+    elif args.get:
+        rel, project_dir, inputs, key = resolve(args.get)
+        if not store.lookup(key):
+            state, detail = status(store, rel, inputs, key)
+            raise SystemExit(f"no bitstream for the current sources of {rel} ({state} {detail})")
+        out = args.output or os.path.splitext(os.path.basename(rel))[0] + ".bin"
+        entry = store.get(key, out)
+        print(f"{rel}: {out} ({entry['size']} bytes, stored {entry['stored']})")
+    elif args.explain:
+        rel, project_dir, inputs, key = resolve(args.explain)
+        print(f"{rel}: key {key}")
+        for name, value in sorted(inputs.items()):
+            print(f"  {name:<56} {value[:16] if name.startswith('src:') else value}")
+    else:
+        counts = {}
+        print(f"{'project':<58}{'key':<14}{'state':<9}detail")
+        for rel, info in sorted(index.projects.items()):
+            project_dir = os.path.join(index.root, os.path.dirname(rel))
+            inputs = design_inputs(project_dir, info)
+            key = design_key(inputs)
+            state, detail = status(store, rel, inputs, key)
+            counts[state] = counts.get(state, 0) + 1
+            print(f"{rel:<58}{key[:12]:<14}{state:<9}{detail}")
+        print(", ".join(f"{n} {state}" for state, n in sorted(counts.items())), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
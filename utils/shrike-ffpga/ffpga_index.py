@@ -0,0 +1,332 @@
+"""
+Index of the .ffpga projects in the repository: pin assignments, checksums
+and source references, cached so only changed projects are parsed again.
+
+Each .ffpga file is read with a streaming parser (ElementTree.iterparse),
+and elements are dropped as soon as they have been looked at, so memory
+stays flat whatever the size of the layout sections. Extracted per project:
+
+- chip identification, projectChecksum, the nvmData length and its CRC32;
+- the chip pin captions ("GPIO0 (PIN 13)");
+- the I/O planner records: top-level port -> IOB location -> GPIO -> pin;
+- the Verilog modules (src / lib / sim / ...), resolved next to the project;
+- the FPGA build settings (synthesis and bitstream options).
+
+The cache (~/.cache/shrike/ffpga-index.json) keeps size, mtime and SHA-256 per file:
+unchanged files are not opened, touched-but-identical files are hashed but
+not parsed.
+
+    python ffpga_index.py                                  # summary of all projects
+    python ffpga_index.py --show 14-Pin
+    python ffpga_index.py --table 14-Pin i_gpio_pins       # PIN_MAP for the driver
+    python ffpga_index.py --table 8-Pin i_gpio_pins --format bytes
+    python ffpga_index.py --table 14-Pin i_gpio_pins \\
+        --verify "../../examples/14-Pin GPIO Extender/firmware/Micropython/14-Pin_GPIO_extender.py" PIN_MAP
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+
+CACHE = os.path.join(os.path.expanduser("~"), ".cache", "shrike", "ffpga-index.json")
+CACHE_VERSION = 1
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "examples")
+
+# IOB location of the I/O planner -> FPGA GPIO. Worked out from the
+# projects whose drivers document their pin maps (14-pin and 8-pin GPIO
+# extenders) and the LED on GPIO16; the pin numbers come from each
+# project's own chip captions.
+IOB_GPIO = {
+    "0:6": "GPIO0", "0:7": "GPIO1", "0:8": "GPIO2", "0:9": "GPIO3", "0:10": "GPIO4",
+    "0:22": "GPIO5", "0:23": "GPIO6", "0:24": "GPIO7",
+    "31:27": "GPIO8", "31:26": "GPIO9", "31:25": "GPIO10", "31:24": "GPIO11",
+    "31:23": "GPIO12", "31:22": "GPIO13", "31:9": "GPIO14", "31:8": "GPIO15",
+    "31:6": "GPIO16", "31:5": "GPIO17", "31:4": "GPIO18",
+}
+
+_LOCATION = re.compile(r"^(IOB|CLK)_t\[\d+:\d+\]_(?:xy\[(\d+):(\d+)\]|(\w+?))_(in|out)(\d+)$")
+_CAPTION = re.compile(r"^(\S+) \(PIN (\d+)(?:/(\w+))?\)$")
+_BUS = re.compile(r"^(.*)\[(\d+)\]$")
+
+
+def resource(location):
+    """(resource name, role) of an I/O planner record id, e.g.
+    ("GPIO4", "in"), ("GPIO6", "oe"), ("PLL", "out"), ("CLK", "in")"""
+    m = _LOCATION.match(location)
+    if not m:
+        return location, "?"
+    kind, x, y, side, direction, n = m.groups()
+    if kind == "CLK":
+        return "CLK_" + side, direction
+    key = f"{x}:{y}"
+    if key in IOB_GPIO:
+        return IOB_GPIO[key], "oe" if direction == "out" and n == "1" else direction
+    x, y = int(x), int(y)
+    if key == "0:25":
+        name = "OSC"
+    elif (x == 0 and 11 <= y <= 21) or (x == 31 and 19 <= y <= 21):
+        name = "PLL"
+    elif y in (30, 31) or (x == 0 and y in (26, 27, 28)):
+        name = "BRAM"
+    else:
+        name = f"IOB xy[{key}]"
+    return name, direction
+
+
+# --- PARSING ---
+
+def parse(path):
+    """Streams one .ffpga file into a JSON-able dict"""
+    info = {
+        "project_checksum": None, "gpd_version": None, "last_change": None,
+        "chip": {}, "nvm_length": None, "nvm_crc32": None,
+        "chip_pins": {}, "ports": [], "modules": {}, "settings": {},
+    }
+    stack = []
+    record = None
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            stack.append(tag)
+            if tag == "GPDProject":
+                info["project_checksum"] = elem.get("projectChecksum")
+                info["gpd_version"] = elem.get("GPDVersion")
+                info["last_change"] = elem.get("lastChange")
+            elif tag == "chip":
+                info["chip"] = {k: elem.get(k) for k in ("friendlyName", "family", "type",
+                                                          "partNumber", "package")}
+            elif tag == "record":
+                record = elem.get("id")
+            continue
+
+        stack.pop()
+        parent = stack[-1] if stack else None
+        if tag == "nvmData":
+            info["nvm_length"] = int(elem.get("registerLenght") or 0)
+        elif tag == "checksum" and parent == "chip":
+            info["nvm_crc32"] = elem.get("crc32")
+        elif tag == "item" and elem.get("caption"):
+            m = _CAPTION.match(elem.get("caption"))
+            if m:
+                info["chip_pins"][m.group(1)] = int(m.group(2))
+        elif tag == "port-name" and record:
+            name, role = resource(record)
+            info["ports"].append({"port": (elem.text or "").strip(), "location": record,
+                                  "resource": name, "role": role})
+        elif tag == "record":
+            record = None
+        elif tag == "module" and "modules" in stack:
+            info["modules"].setdefault(parent, []).append(elem.get("filename"))
+        elif "settings" in stack and "fpga-data" in stack and len(elem) == 0:
+            key = "/".join(stack[stack.index("settings") + 1:] + [tag])
+            info["settings"][key] = (elem.text or "").strip()
+        if tag not in ("chip", "modules", "io-spec-tool", "settings"):
+            elem.clear()
+    for port in info["ports"]:
+        port["pin"] = info["chip_pins"].get(port["resource"])
+    return info
+
+
+def locate_sources(project_dir, modules):
+    """{filename: path relative to the project dir, or None if not found}"""
+    found = {}
+    for dirpath, dirnames, filenames in os.walk(project_dir):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".") and d != "__pycache__"]
+        for f in filenames:
+            found.setdefault(f, os.path.relpath(os.path.join(dirpath, f), project_dir))
+    return {name: found.get(name) for names in modules.values() for name in names}
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# --- INDEX ---
+
+class Index:
+    """{relative path: project info} on disk"""
+
+    def __init__(self, root=ROOT, path=CACHE):
+        self.root = os.path.abspath(root)
+        self.path = path
+        self.parsed = self.hashed = 0
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            same = data.get("version") == CACHE_VERSION and data.get("root") == self.root
+            self.projects = data["projects"] if same else {}
+        except (OSError, ValueError, KeyError):
+            self.projects = {}
+
+    def update(self):
+        """Re-reads new and changed projects, drops vanished ones"""
+        seen = set()
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for f in filenames:
+                if f.endswith(".ffpga"):
+                    full = os.path.join(dirpath, f)
+                    rel = os.path.relpath(full, self.root)
+                    seen.add(rel)
+                    self._refresh(rel, full)
+        for rel in set(self.projects) - seen:
+            del self.projects[rel]
+        return self
+
+    def _refresh(self, rel, full):
+        st = os.stat(full)
+        entry = self.projects.get(rel)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return
+        digest = file_hash(full)
+        self.hashed += 1
+        if entry is None or entry["sha256"] != digest:
+            entry = parse(full)
+            self.parsed += 1
+        entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns, sha256=digest)
+        entry["sources"] = locate_sources(os.path.dirname(full), entry["modules"])
+        self.projects[rel] = entry
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": CACHE_VERSION, "root": self.root, "projects": self.projects},
+                      f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def find(self, pattern):
+        matches = [rel for rel in sorted(self.projects) if pattern.lower() in rel.lower()]
+        if len(matches) != 1:
+            raise SystemExit(f"'{pattern}' matches {len(matches)} projects: {', '.join(matches)}")
+        return matches[0], self.projects[matches[0]]
+
+
+# --- LOOKUP TABLES ---
+
+def bus_table(info, bus):
+    """{index: (gpio number, pin)} of a port bus like i_gpio_pins[k]"""
+    table = {}
+    for p in info["ports"]:
+        m = _BUS.match(p["port"])
+        if m and m.group(1) == bus and p["resource"].startswith("GPIO"):
+            table[int(m.group(2))] = (int(p["resource"][4:]), p["pin"])
+    return dict(sorted(table.items()))
+
+
+def render_table(table, name, fmt):
+    if fmt == "dict":
+        lines = [f"{name} = {{"]
+        for i, (gpio, pin) in table.items():
+            lines.append(f"    {str(i) + ':':<4}(\"GPIO{gpio}\",{'':<{3 - len(str(gpio))}}{pin}),")
+        lines.append("}")
+        return "\n".join(lines)
+    if fmt == "bytes":            # index -> GPIO / pin as bytes: no dict on the heap
+        n = max(table) + 1 if table else 0
+        gpio = bytes(table[i][0] if i in table else 0xFF for i in range(n))
+        pins = bytes(table[i][1] if i in table and table[i][1] else 0xFF for i in range(n))
+        return f"{name}_GPIO = {gpio!r}\n{name}_PIN = {pins!r}"
+    return json.dumps({str(i): {"gpio": g, "pin": p} for i, (g, p) in table.items()})
+
+
+def driver_table(path, attr):
+    """Reads a hard-coded pin map (dict literal assigned to attr) from a
+    driver; values like ("GPIO0", 13) or "GPIO07 (FPGA Pin 20)" """
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and any(
+                isinstance(t, ast.Name) and t.id == attr for t in node.targets):
+            raw = ast.literal_eval(node.value)
+            break
+    else:
+        raise SystemExit(f"{attr} not found in {path}")
+    table = {}
+    for i, v in raw.items():
+        m = re.search(r"GPIO0*(\d+)\D+?(\d+)", " ".join(str(x) for x in v)
+                      if isinstance(v, tuple) else str(v))
+        table[int(i)] = (int(m.group(1)), int(m.group(2))) if m else None
+    return dict(sorted(table.items()))
+
+
+# --- REPORTS ---
+
+def print_summary(index, out=sys.stdout):
+    print(f"{'project':<58}{'checksum':>10}{'nvm crc32':>12}{'ports':>7}  sources", file=out)
+    for rel, info in sorted(index.projects.items()):
+        missing = [n for n, p in info["sources"].items() if p is None]
+        src = f"{len(info['sources'])}" + (f" ({', '.join(missing)} missing)" if missing else "")
+        print(f"{rel:<58}{info['project_checksum'] or '-':>10}{info['nvm_crc32'] or '-':>12}"
+              f"{len(info['ports']):>7}  {src}", file=out)
+
+
+def print_project(rel, info, out=sys.stdout):
+    chip = info["chip"]
+    print(f"{rel}", file=out)
+    print(f"  chip {chip.get('friendlyName')} part {chip.get('partNumber')} "
+          f"package {chip.get('package')}, GPD {info['gpd_version']}, "
+          f"changed {info['last_change']}", file=out)
+    print(f"  projectChecksum {info['project_checksum']}, nvmData {info['nvm_length']} bits "
+          f"crc32 {info['nvm_crc32']}", file=out)
+    for kind, names in info["modules"].items():
+        for name in names:
+            where = info["sources"].get(name) or "MISSING"
+            print(f"  {kind:<6} {name:<24} {where}", file=out)
+    print(f"  {'port':<24}{'resource':<12}{'role':<6}{'pin':>4}", file=out)
+    for p in sorted(info["ports"], key=lambda p: (p["resource"], p["role"], p["port"])):
+        print(f"  {p['port']:<24}{p['resource']:<12}{p['role']:<6}{p['pin'] or '-':>4}", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pin maps, checksums and sources of .ffpga projects")
+    parser.add_argument("--root", default=ROOT, help="directory searched for .ffpga files")
+    parser.add_argument("--cache", default=CACHE)
+    parser.add_argument("--show", metavar="PROJECT", help="details of one project (path substring)")
+    parser.add_argument("--table", nargs=2, metavar=("PROJECT", "BUS"),
+                        help="pin lookup table for a port bus, e.g. i_gpio_pins")
+    parser.add_argument("--format", choices=("dict", "bytes", "json"), default="dict")
+    parser.add_argument("--name", default="PIN_MAP", help="variable name of the table")
+    parser.add_argument("--verify", nargs=2, metavar=("FILE", "ATTR"),
+                        help="compare the table with a pin map hard-coded in a driver")
+    parser.add_argument("--json", action="store_true", help="dump the whole index")
+    args = parser.parse_args()
+
+    index = Index(args.root, args.cache).update()
+    index.save()
+    print(f"{len(index.projects)} projects, {index.parsed} parsed, "
+          f"{index.hashed - index.parsed} unchanged after hashing", file=sys.stderr)
+
+    if args.table:
+        rel, info = index.find(args.table[0])
+        table = bus_table(info, args.table[1])
+        if not table:
+            raise SystemExit(f"no GPIO-mapped ports {args.table[1]}[k] in {rel}")
+        if args.verify:
+            hard_coded = driver_table(*args.verify)
+            diffs = [(i, hard_coded.get(i), table.get(i)) for i in sorted(set(table) | set(hard_coded))
+                     if hard_coded.get(i) != table.get(i)]
+            for i, old, new in diffs:
+                print(f"{args.verify[1]}[{i}]: driver {old}, project {new}")
+            print(f"{args.verify[1]} {'matches' if not diffs else 'differs from'} {rel}")
+            sys.exit(1 if diffs else 0)
+        print(render_table(table, args.name, args.format))
+    elif args.show:
+        print_project(*index.find(args.show))
+    elif args.json:
+        json.dump(index.projects, sys.stdout, indent=1, sort_keys=True)
+        print()
+    else:
+        print_summary(index)
+
+
+if __name__ == "__main__":
+    main()
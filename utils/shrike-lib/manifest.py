@@ -0,0 +1,7 @@
+# Freezes shrike_lib into a MicroPython firmware build, e.g.
+#   make -C lib/micropython/ports/rp2 BOARD=RPI_PICO \
+#        FROZEN_MANIFEST=$(pwd)/utils/shrike-lib/manifest.py
+# Frozen modules run from flash: no compile step at import and no heap for the bytecode.
+
+include("$(PORT_DIR)/boards/manifest.py")
+package("shrike_lib")
@@ -0,0 +1,189 @@
+"""
+Build, deploy and benchmark the shrike_lib package.
+
+    python shrike_build.py                          # build/shrike_lib/*.mpy
+    python shrike_build.py --port /dev/ttyACM0      # build, then deploy to /lib/shrike_lib
+    python shrike_build.py --bench /dev/ttyACM0     # boot-to-first-command, example vs package
+
+The .mpy files are compiled with mpy-cross: --mpy-cross, mpy-cross on
+PATH, or the mpy-cross pip package. Deploying goes through
+shrike_deploy.py, so only changed files are sent.
+
+--bench puts three variants of each driver on the board: the example
+script it came from, the package as .py source (under /bench_py) and the
+package as .mpy (/lib). For every variant it soft-resets the board, so
+each run starts with an empty heap and no modules, then measures the
+import time, the time until the first SPI command has been answered
+and the heap the imported code keeps.
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+EXAMPLES = os.path.join(HERE, "..", "..", "examples")
+sys.path.insert(0, os.path.join(HERE, "..", "shrike-deploy"))
+sys.path.insert(0, os.path.join(HERE, "..", "shrike-repl"))
+
+from rawrepl import RawREPL, ReplError  # noqa: E402
+from shrike_deploy import Manifest, deploy_board, parse_targets  # noqa: E402
+
+PACKAGE = "shrike_lib"
+BUILD = os.path.join(HERE, "build")
+
+# name: (example script, example import, example first command,
+#        package import, package first command)
+BENCH = {
+    "gpio8": ("8-Pin GPIO Extender/firmware/Micropython/8-pin_extender_full_tests.py",
+              "import bench_gpio8 as m", "m.ShrikeFPGAGPIO().read_all()",
+              "from shrike_lib import ShrikeFPGAGPIO", "ShrikeFPGAGPIO().read_all()"),
+    "gpio14": ("14-Pin GPIO Extender/firmware/Micropython/14-Pin_GPIO_extender.py",
+               "import bench_gpio14 as m", "m.ShrikeFPGA14GPIO().read_all()",
+               "from shrike_lib import ShrikeFPGA14GPIO", "ShrikeFPGA14GPIO().read_all()"),
+    "vector8": ("Vector-8/firmware/Micropython/vector_8.py",
+                "import bench_vector8 as m", "m.send_instr(0, 0)",
+                "from shrike_lib import Vector8", "Vector8().send_instr(0, 0)"),
+}
+
+BENCH_CODE = """
+import gc, sys, time
+{path}
+gc.collect()
+_m = gc.mem_free()
+_t = time.ticks_us()
+{imports}
+_i = time.ticks_diff(time.ticks_us(), _t)
+{first}
+_f = time.ticks_diff(time.ticks_us(), _t)
+gc.collect()
+print('~bench', _i, _f, _m - gc.mem_free())
+"""
+
+
+def sources():
+    pkg = os.path.join(HERE, PACKAGE)
+    return sorted(f for f in os.listdir(pkg) if f.endswith(".py"))
+
+
+def mpy_cross_command(path=None):
+    if path:
+        return [path]
+    if shutil.which("mpy-cross"):
+        return ["mpy-cross"]
+    try:
+        import mpy_cross  # noqa: F401
+    except ImportError:
+        raise SystemExit("mpy-cross not found: build it from lib/micropython/mpy-cross, "
+                         "pip install mpy-cross, or pass --mpy-cross")
+    return [sys.executable, "-m", "mpy_cross"]
+
+
+def build(mpy_cross, march="armv6m", opt=0):
+    """Compiles the package into build/shrike_lib; returns the .mpy paths"""
+    out_dir = os.path.join(BUILD, PACKAGE)
+    os.makedirs(out_dir, exist_ok=True)
+    outputs = []
+    for name in sources():
+        src = os.path.join(HERE, PACKAGE, name)
+        out = os.path.join(out_dir, name[:-3] + ".mpy")
+        if not os.path.exists(out) or os.path.getmtime(out) < os.path.getmtime(src):
+            subprocess.run(mpy_cross + [f"-march={march}", f"-O{opt}", "-s", f"{PACKAGE}/{name}",
+                                        "-o", out, src], check=True)
+        outputs.append(out)
+    return outputs
+
+
+def deploy(ports, specs, manifest):
+    targets = parse_targets(specs)
+    failed = 0
+    for port in ports:
+        r = deploy_board(port, targets, manifest)
+        manifest.save()
+        status = r.get("error") or f"{len(r['uploaded'])} uploaded, {len(r['skipped'])} unchanged"
+        print(f"{port}: {status}")
+        failed += bool(r.get("error") or r["failed"])
+    return failed
+
+
+def run_bench(port, names, repeat):
+    """{(driver, variant): [(import us, first command us, heap bytes), ...]}"""
+    variants = {
+        "example .py": lambda b: ("", b[1], b[2]),
+        "package .py": lambda b: ("sys.path.insert(0, '/bench_py')", b[3], b[4]),
+        "package .mpy": lambda b: ("", b[3], b[4]),
+    }
+    results = {}
+    repl = RawREPL.open(port)
+    try:
+        for name in names:
+            for variant, make in variants.items():
+                path, imports, first = make(BENCH[name])
+                code = BENCH_CODE.format(path=path, imports=imports, first=first)
+                runs = results.setdefault((name, variant), [])
+                for _ in range(repeat):
+                    repl.enter(soft_reset=True)
+                    try:
+                        out = repl.exec(code, timeout=30).decode()
+                    except ReplError as e:
+                        print(f"{name} {variant}: {e.args[1].decode().strip()}", file=sys.stderr)
+                        break
+                    fields = out.split("~bench")[-1].split()
+                    runs.append(tuple(int(f) for f in fields[:3]))
+    finally:
+        repl.close()
+    return results
+
+
+def print_bench(results):
+    print(f"{'driver':<10}{'variant':<15}{'import ms':>10}{'first cmd ms':>14}{'heap bytes':>12}")
+    for (name, variant), runs in results.items():
+        if not runs:
+            print(f"{name:<10}{variant:<15}{'failed':>10}")
+            continue
+        imp, first, heap = (statistics.median(col) for col in zip(*runs))
+        print(f"{name:<10}{variant:<15}{imp / 1000:>10.1f}{first / 1000:>14.1f}{heap:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build, deploy and benchmark shrike_lib")
+    parser.add_argument("--mpy-cross", help="path of the mpy-cross binary")
+    parser.add_argument("--march", default="armv6m", help="mpy-cross -march (armv6m runs on RP2040 and RP2350)")
+    parser.add_argument("-O", dest="opt", type=int, default=0, help="mpy-cross optimisation level")
+    parser.add_argument("--port", action="append", default=[], help="deploy the .mpy files to a board")
+    parser.add_argument("--source", action="store_true", help="deploy the .py sources instead")
+    parser.add_argument("--bench", metavar="PORT", help="benchmark example vs package on a board")
+    parser.add_argument("--driver", action="append", choices=sorted(BENCH), help="drivers to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant (median is shown)")
+    parser.add_argument("--manifest", default=".shrike-deploy.json")
+    args = parser.parse_args()
+    if args.bench and args.source:
+        parser.error("--bench compares against the .mpy build; drop --source")
+
+    pkg = os.path.join(HERE, PACKAGE)
+    if args.source:
+        specs = [f"{os.path.join(pkg, n)}:lib/{PACKAGE}/{n}" for n in sources()]
+    else:
+        mpys = build(mpy_cross_command(args.mpy_cross), args.march, args.opt)
+        specs = [f"{p}:lib/{PACKAGE}/{os.path.basename(p)}" for p in mpys]
+        print(f"built {len(mpys)} modules in {os.path.relpath(os.path.dirname(mpys[0]), HERE)}")
+
+    manifest = Manifest(args.manifest)
+    failed = deploy(args.port, specs, manifest) if args.port else 0
+
+    if args.bench:
+        names = args.driver or sorted(BENCH)
+        specs += [f"{os.path.join(pkg, n)}:bench_py/{PACKAGE}/{n}" for n in sources()]
+        specs += [f"{os.path.join(EXAMPLES, BENCH[n][0])}:bench_{n}.py" for n in names]
+        failed += deploy([args.bench], specs, manifest)
+        results = run_bench(args.bench, names, args.repeat)
+        print_bench(results)
+        failed += sum(not runs for runs in results.values())
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
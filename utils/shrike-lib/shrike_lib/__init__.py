@@ -0,0 +1,30 @@
+"""
+Reusable Shrike drivers as one importable package.
+
+Nothing is imported until it is used: `from shrike_lib import
+ShrikeFPGAGPIO` loads only shrike_lib/gpio8, and `import shrike_lib` on
+its own costs one small module. Names resolve through the module-level
+__getattr__ and are cached in the package afterwards.
+
+    import shrike_lib
+    shrike_lib.flash("blink.bin")
+    fpga = shrike_lib.ShrikeFPGA14GPIO()
+"""
+
+# Exported name -> submodule that defines it
+_LAZY = {
+    "flash": "fpga",
+    "reset": "fpga",
+    "ShrikeFPGAGPIO": "gpio8",
+    "ShrikeFPGA14GPIO": "gpio14",
+    "Vector8": "vector8",
+}
+
+
+def __getattr__(name):
+    sub = _LAZY.get(name)
+    if sub is None:
+        raise AttributeError(name)
+    value = getattr(__import__("shrike_lib." + sub, None, None, (name,)), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,20 @@
+"""
+RP2040 side of the RP2040 <-> FPGA link on the Shrike board.
+"""
+
+from machine import Pin, SPI
+
+SCK = 2
+MOSI = 3
+MISO = 0
+CS = 1
+FPGA_EN = 13     # FPGA enable
+FPGA_PWR = 12    # FPGA power
+FPGA_RST = 14    # Reset input of the example designs
+
+
+def open_spi(baudrate, spi_id=0, cs_pin=CS):
+    """SPI0 in mode 0, MSB first, on the link pins; returns (spi, cs) with CS idle high"""
+    spi = SPI(spi_id, baudrate=baudrate, polarity=0, phase=0, bits=8,
+              firstbit=SPI.MSB, sck=Pin(SCK), mosi=Pin(MOSI), miso=Pin(MISO))
+    return spi, Pin(cs_pin, Pin.OUT, value=1)
@@ -0,0 +1,58 @@
+"""
+Loading bitstreams into the FPGA, as the firmware's shrike module does.
+
+The pins and the SPI bus are only set up on the first call, so importing
+the module does not touch the hardware.
+"""
+
+import time
+
+from machine import Pin
+
+from shrike_lib import board
+
+_pins = None
+
+
+def _setup():
+    global _pins
+    if _pins is None:
+        _pins = (Pin(board.FPGA_EN, Pin.OUT), Pin(board.FPGA_PWR, Pin.OUT))
+    return _pins
+
+
+def flash(filename, chunk=4096):
+    """Power-cycles the FPGA and sends it the bitstream in filename over SPI"""
+    en, pwr = _setup()
+    spi, ss = board.open_spi(1_600_000)
+    buf = bytearray(chunk)
+    mv = memoryview(buf)
+
+    print("[shrike_lib] Flashing:", filename)
+    ss.value(0)
+    en.value(0)
+    pwr.value(0)
+    time.sleep_ms(100)
+    en.value(1)
+    pwr.value(1)
+    time.sleep_ms(100)
+
+    ss.value(1)
+    time.sleep_ms(2)
+    ss.value(0)
+    try:
+        with open(filename, "rb") as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                spi.write(mv[:n])
+    finally:
+        ss.value(1)
+    time.sleep_ms(100)
+    print("[shrike_lib] FPGA programming done")
+
+
+def reset():
+    """Powers the FPGA down; the next flash() loads it again"""
+    _setup()[1].value(0)
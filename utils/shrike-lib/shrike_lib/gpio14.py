@@ -0,0 +1,97 @@
+"""
+14-pin GPIO extender (examples/14-Pin GPIO Extender), driver only.
+
+Two-byte commands: 0x10 / 0x11 set direction bits [7:0] / [13:8],
+0x20 / 0x21 set output bits [7:0] / [13:8]. Reading clocks out the pin
+states, high byte first. Direction: 1 = input, 0 = output.
+"""
+
+import time
+
+from shrike_lib import board
+
+
+class ShrikeFPGA14GPIO:
+    # Bit -> FPGA GPIO / package pin, from
+    # ffpga_index.py --table 14-Pin i_gpio_pins --format bytes --name BIT
+    BIT_GPIO = b"\x00\x01\x02\x07\x08\t\n\x0b\x0c\r\x0e\x0f\x11\x12"
+    BIT_PIN = b"\r\x0e\x0f\x14\x17\x18\x01\x02\x03\x04\x05\x06\x08\t"
+
+    def __init__(self, spi_id=0, baudrate=500000, cs_pin=board.CS):
+        self.spi, self.cs = board.open_spi(baudrate, spi_id, cs_pin)
+        self._cmd = bytearray(2)
+        self._rx = bytearray(1)
+        self.dir_reg = 0x3FFF  # All inputs
+        self.out_reg = 0x0000
+
+    def _send_cmd(self, cmd, data):
+        self._cmd[0] = cmd
+        self._cmd[1] = data
+        self.cs.value(0)
+        time.sleep_us(2)
+        self.spi.write(self._cmd)
+        time.sleep_us(2)
+        self.cs.value(1)
+        time.sleep_us(20)
+
+    def _read_gpio(self):
+        rx = self._rx
+        self.cs.value(0)
+        time.sleep_us(20)
+        self.spi.readinto(rx, 0x00)
+        high = rx[0]
+        time.sleep_us(20)
+        self.spi.readinto(rx, 0x00)
+        time.sleep_us(20)
+        self.cs.value(1)
+        time.sleep_us(50)
+        return rx[0] | ((high & 0x3F) << 8)
+
+    @staticmethod
+    def _check(pin):
+        if pin < 0 or pin > 13:
+            raise ValueError("Pin must be 0-13")
+
+    def pin_map(self, pin):
+        """("GPIO0", 13): FPGA GPIO name and package pin of a register bit"""
+        self._check(pin)
+        return "GPIO%d" % self.BIT_GPIO[pin], self.BIT_PIN[pin]
+
+    def set_pin_direction(self, pin, is_input):
+        self._check(pin)
+        if is_input:
+            self.dir_reg |= 1 << pin
+        else:
+            self.dir_reg &= ~(1 << pin)
+        if pin < 8:
+            self._send_cmd(0x10, self.dir_reg & 0xFF)
+        else:
+            self._send_cmd(0x11, (self.dir_reg >> 8) & 0x3F)
+
+    def set_all_directions(self, dir_14bit):
+        self.dir_reg = dir_14bit & 0x3FFF
+        self._send_cmd(0x10, self.dir_reg & 0xFF)
+        self._send_cmd(0x11, (self.dir_reg >> 8) & 0x3F)
+
+    def write_pin(self, pin, value):
+        self._check(pin)
+        if value:
+            self.out_reg |= 1 << pin
+        else:
+            self.out_reg &= ~(1 << pin)
+        if pin < 8:
+            self._send_cmd(0x20, self.out_reg & 0xFF)
+        else:
+            self._send_cmd(0x21, (self.out_reg >> 8) & 0x3F)
+
+    def write_all(self, value):
+        self.out_reg = value & 0x3FFF
+        self._send_cmd(0x20, self.out_reg & 0xFF)
+        self._send_cmd(0x21, (self.out_reg >> 8) & 0x3F)
+
+    def read_all(self):
+        return self._read_gpio()
+
+    def read_pin(self, pin):
+        self._check(pin)
+        return (self.read_all() >> pin) & 1
@@ -0,0 +1,83 @@
+"""
+8-pin GPIO extender (examples/8-Pin GPIO Extender), driver only.
+
+One byte per transaction, {addr[3:0], data[3:0]}; MISO returns the pin
+states. Direction: 0 = output, 1 = input.
+"""
+
+import time
+
+from shrike_lib import board
+
+
+class ShrikeFPGAGPIO:
+    # Bit -> FPGA GPIO / package pin, from
+    # ffpga_index.py --table 8-Pin i_gpio_pins --format bytes --name BIT
+    BIT_GPIO = b"\x07\x08\t\n\x0b\x0c\r\x0e"
+    BIT_PIN = b"\x14\x17\x18\x01\x02\x03\x04\x05"
+
+    def __init__(self, spi_id=0, baudrate=1000000, cs_pin=board.CS):
+        self.spi, self.cs = board.open_spi(baudrate, spi_id, cs_pin)
+        self._rx = bytearray(1)
+        self.dir_reg = 0xFF  # All inputs
+        self.out_reg = 0x00
+
+    def _spi_transfer(self, cmd):
+        """Sends one command byte, returns the pin states clocked back"""
+        self.cs.value(0)
+        time.sleep_us(1)
+        self.spi.readinto(self._rx, cmd)
+        time.sleep_us(1)
+        self.cs.value(1)
+        time.sleep_us(10)
+        return self._rx[0]
+
+    @staticmethod
+    def _check(pin):
+        if pin < 0 or pin > 7:
+            raise ValueError("Pin must be 0-7")
+
+    def get_pin_name(self, pin):
+        """e.g. "GPIO07 (FPGA Pin 20)" """
+        if 0 <= pin <= 7:
+            return "GPIO%02d (FPGA Pin %d)" % (self.BIT_GPIO[pin], self.BIT_PIN[pin])
+        return "Unknown"
+
+    def set_pin_direction(self, pin, is_input):
+        self._check(pin)
+        if is_input:
+            self.dir_reg |= 1 << pin
+        else:
+            self.dir_reg &= ~(1 << pin)
+        if pin < 4:
+            self._spi_transfer(0x10 | (self.dir_reg & 0x0F))
+        else:
+            self._spi_transfer(0x20 | (self.dir_reg >> 4))
+
+    def set_all_directions(self, dir_byte):
+        self.dir_reg = dir_byte & 0xFF
+        self._spi_transfer(0x10 | (self.dir_reg & 0x0F))
+        self._spi_transfer(0x20 | (self.dir_reg >> 4))
+
+    def write_pin(self, pin, value):
+        self._check(pin)
+        if value:
+            self.out_reg |= 1 << pin
+        else:
+            self.out_reg &= ~(1 << pin)
+        if pin < 4:
+            self._spi_transfer(0x30 | (self.out_reg & 0x0F))
+        else:
+            self._spi_transfer(0x40 | (self.out_reg >> 4))
+
+    def write_all(self, value):
+        self.out_reg = value & 0xFF
+        self._spi_transfer(0x30 | (self.out_reg & 0x0F))
+        self._spi_transfer(0x40 | (self.out_reg >> 4))
+
+    def read_all(self):
+        return self._spi_transfer(0x00)
+
+    def read_pin(self, pin):
+        self._check(pin)
+        return (self.read_all() >> pin) & 1
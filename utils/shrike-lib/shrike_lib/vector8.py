@@ -0,0 +1,60 @@
+"""
+Vector-8 CPU (examples/Vector-8), driver only.
+
+Each 2-byte frame {opcode[4:0], operand} is one instruction; MISO returns
+the accumulator latched at CS falling, i.e. the result of the previous
+instruction.
+"""
+
+import time
+
+from machine import Pin
+
+from shrike_lib import board
+
+OP_NOP, OP_LDA, OP_ADD, OP_SUB = 0x00, 0x01, 0x02, 0x03
+OP_AND, OP_OR, OP_XOR, OP_LSL = 0x04, 0x05, 0x06, 0x07
+OP_LSR, OP_ROL, OP_ROR, OP_INC = 0x08, 0x09, 0x0A, 0x0B
+OP_DEC, OP_JMP, OP_JZ, OP_JNZ = 0x0C, 0x0D, 0x0E, 0x0F
+
+
+class Vector8:
+    def __init__(self, baudrate=50_000, spi_id=0, cs_pin=board.CS, rst_pin=board.FPGA_RST):
+        self.spi, self.cs = board.open_spi(baudrate, spi_id, cs_pin)
+        self.rst = Pin(rst_pin, Pin.OUT, value=1)
+        self._tx = bytearray(2)
+        self._rx = bytearray(2)
+
+    def hard_reset(self):
+        self.rst.value(0)
+        time.sleep_ms(50)
+        self.rst.value(1)
+        time.sleep_ms(100)
+
+    def _xfer(self, opcode, data):
+        self._tx[0] = opcode & 0x1F
+        self._tx[1] = data & 0xFF
+        self.cs.value(0)
+        self.spi.write_readinto(self._tx, self._rx)
+        self.cs.value(1)
+        return self._rx[1]
+
+    def send_instr(self, opcode, data):
+        """Runs one instruction and returns the accumulator after it"""
+        self._xfer(opcode, data)
+        time.sleep_ms(2)
+        return self._xfer(OP_NOP, 0)
+
+    def stream_instrs(self, program, out=None):
+        """Runs packed (opcode, operand) byte pairs, one transaction each
+        plus a trailing NOP; returns the accumulator after each instruction"""
+        n = len(program) // 2
+        if out is None:
+            out = bytearray(n)
+        if n:
+            xfer = self._xfer
+            xfer(program[0], program[1])
+            for i in range(1, n):
+                out[i - 1] = xfer(program[2 * i], program[2 * i + 1])
+            out[n - 1] = xfer(OP_NOP, 0)
+        return out
@@ -0,0 +1,118 @@
+"""
+Parallel pin bus for RP2040 / RP2350 MicroPython.
+
+Maps an ordered list of GPIOs to the bits of an integer and moves the whole
+bus in one SIO register access instead of one Pin.value() call per pin, so
+all pins switch on the same clock and a 24-pin update is a single store.
+
+    from pinbus import PinBus
+    leds = PinBus([4, 5, 6, 7])        # bit 0 -> GPIO4 ... bit 3 -> GPIO7
+    leds.write(0b1010)                 # one GPIO_OUT_XOR store
+    counter = PinBus([2, 1, 3, 0], Pin.IN)
+    value = counter.read()             # one GPIO_IN load
+
+Only GPIO 0-31 are supported (the SIO low bank).
+"""
+
+from machine import Pin, mem32
+import sys
+
+SIO_BASE = 0xD0000000
+GPIO_IN  = SIO_BASE + 0x004
+GPIO_OUT = SIO_BASE + 0x010
+if "RP2350" in getattr(sys.implementation, "_machine", ""):
+    GPIO_OUT_SET = SIO_BASE + 0x018
+    GPIO_OUT_CLR = SIO_BASE + 0x020
+    GPIO_OUT_XOR = SIO_BASE + 0x028
+else:
+    GPIO_OUT_SET = SIO_BASE + 0x014
+    GPIO_OUT_CLR = SIO_BASE + 0x018
+    GPIO_OUT_XOR = SIO_BASE + 0x01C
+
+
+def _scatter_tables(pins):
+    """Per value byte: 256-entry table of the GPIO mask for that byte"""
+    tables = []
+    for lane in range(0, len(pins), 8):
+        lane_pins = pins[lane:lane + 8]
+        tables.append([sum(1 << p for i, p in enumerate(lane_pins) if (v >> i) & 1)
+                       for v in range(256)])
+    return tables
+
+
+def _gather_tables(pins):
+    """Per GPIO byte that holds bus pins: (shift, 256-entry table of value bits)"""
+    tables = []
+    for lane in range(4):
+        lo = 8 * lane
+        if not any(lo <= p < lo + 8 for p in pins):
+            continue
+        table = []
+        for v in range(256):
+            bits = 0
+            for i, p in enumerate(pins):
+                if lo <= p < lo + 8 and (v >> (p - lo)) & 1:
+                    bits |= 1 << i
+            table.append(bits)
+        tables.append((lo, table))
+    return tables
+
+
+class PinBus:
+    """An ordered group of GPIOs read and written as one integer"""
+
+    def __init__(self, pins, mode=Pin.OUT, pull=None, value=None):
+        pins = list(pins)
+        for p in pins:
+            if not 0 <= p < 32:
+                raise ValueError("PinBus supports GPIO 0-31")
+        if len(set(pins)) != len(pins):
+            raise ValueError("duplicate pin in bus")
+        self.pins = pins
+        self.width = len(pins)
+        self.mask = sum(1 << p for p in pins)
+        self._io = [Pin(p, mode, pull) for p in pins]
+
+        # Ascending consecutive pins map to a plain shift
+        base = pins[0] if pins else 0
+        self._shift = base if pins == list(range(base, base + len(pins))) else None
+        if self._shift is None:
+            self._scatter = _scatter_tables(pins)
+            self._gather = _gather_tables(pins)
+        if value is not None:
+            self.write(value)
+
+    def to_gpio(self, value):
+        """Bus value -> GPIO bit pattern"""
+        if self._shift is not None:
+            return (value << self._shift) & self.mask
+        bits = 0
+        for table in self._scatter:
+            bits |= table[value & 0xFF]
+            value >>= 8
+        return bits
+
+    def from_gpio(self, bits):
+        """GPIO bit pattern -> bus value"""
+        if self._shift is not None:
+            return (bits & self.mask) >> self._shift
+        value = 0
+        for lo, table in self._gather:
+            value |= table[(bits >> lo) & 0xFF]
+        return value
+
+    def write(self, value):
+        """Drives every bus pin at once with a single GPIO_OUT_XOR store"""
+        mem32[GPIO_OUT_XOR] = (mem32[GPIO_OUT] ^ self.to_gpio(value)) & self.mask
+
+    def set(self, value):
+        """Drives the bus pins whose bits are 1 in value high (GPIO_OUT_SET)"""
+        mem32[GPIO_OUT_SET] = self.to_gpio(value)
+
+    def clear(self, value):
+        """Drives the bus pins whose bits are 1 in value low (GPIO_OUT_CLR)"""
+        mem32[GPIO_OUT_CLR] = self.to_gpio(value)
+
+    def read(self):
+        """Samples every bus pin at once with a single GPIO_IN load"""
+        return self.from_gpio(mem32[GPIO_IN])
@@ -0,0 +1,133 @@
+"""
+Host-side report for shrike_prof dumps.
+
+Reads REPL captures from log files, stdin or a live serial port, picks out
+the "~prof" lines written by Profiler.dump() and prints one table per dump,
+slowest first:
+
+    mpremote connect /dev/ttyACM0 run profiled_test.py > run.log
+    python prof_report.py run.log
+    python prof_report.py before.log after.log --merge
+    python prof_report.py --port /dev/ttyACM0
+
+Self time is the part of a function's time not spent in other profiled
+functions. With --net the measured per-call profiler overhead (from the dump
+header) is subtracted from every mean.
+"""
+
+import argparse
+import sys
+
+TAG = "~prof"
+
+
+class Row:
+    __slots__ = ("name", "count", "total", "own", "min", "max")
+
+    def __init__(self, name, count, total, own, lo, hi):
+        self.name = name
+        self.count = count
+        self.total = total
+        self.own = own
+        self.min = lo
+        self.max = hi
+
+    def add(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.own += other.own
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+
+class ProfDump:
+    def __init__(self, name, overhead):
+        self.name = name
+        self.overhead = overhead        # us per profiled call
+        self.rows = []
+
+
+def parse_lines(lines):
+    dumps = []
+    dump = None
+    for line in lines:
+        line = line.strip()
+        if not line.startswith(TAG + " "):
+            continue
+        fields = line.split()
+        if fields[1] == "begin":
+            dump = ProfDump(fields[2], float(fields[3]))
+            dumps.append(dump)
+        elif fields[1] == "end":
+            dump = None
+        elif dump is not None and len(fields) == 7:
+            dump.rows.append(Row(fields[1], *(int(f) for f in fields[2:])))
+    return dumps
+
+
+def merge(dumps):
+    """One dump with the rows of all of them added up by name"""
+    merged = ProfDump("+".join(d.name for d in dumps), max(d.overhead for d in dumps))
+    by_name = {}
+    for d in dumps:
+        for row in d.rows:
+            if row.name in by_name:
+                by_name[row.name].add(row)
+            else:
+                by_name[row.name] = Row(row.name, row.count, row.total, row.own, row.min, row.max)
+    merged.rows = sorted(by_name.values(), key=lambda r: -r.total)
+    return merged
+
+
+def print_report(dump, net=False, out=sys.stdout):
+    rows = sorted(dump.rows, key=lambda r: -r.total)
+    own_sum = sum(r.own for r in rows) or 1
+    print(f"{dump.name}: {sum(r.count for r in rows)} profiled calls, "
+          f"overhead {dump.overhead:.1f} us/call", file=out)
+    print(f"  {'name':<28}{'calls':>8}{'total us':>11}{'self us':>10}{'self %':>8}"
+          f"{'mean':>9}{'min':>7}{'max':>8}", file=out)
+    for r in rows:
+        mean = max(0.0, r.total / r.count - (dump.overhead if net else 0))
+        print(f"  {r.name:<28}{r.count:>8}{r.total:>11}{r.own:>10}"
+              f"{r.own * 100 / own_sum:>7.1f}%{mean:>9.1f}{r.min:>7}{r.max:>8}", file=out)
+
+
+def read_port(port, baudrate=115200, timeout=60):
+    """Yields lines from a serial port until a dump has ended"""
+    import serial  # pyserial, as used by shrike-ctl.py
+    with serial.Serial(port, baudrate, timeout=timeout) as ser:
+        while True:
+            raw = ser.readline()
+            if not raw:
+                return
+            line = raw.decode(errors="replace")
+            yield line
+            if line.strip() == TAG + " end":
+                return
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report for shrike_prof dumps")
+    parser.add_argument("logs", nargs="*", help="REPL captures (default: stdin)")
+    parser.add_argument("--port", help="read one dump live from a serial port")
+    parser.add_argument("--merge", action="store_true", help="add all dumps into one table")
+    parser.add_argument("--net", action="store_true", help="subtract profiler overhead from means")
+    args = parser.parse_args()
+
+    if args.port:
+        lines = read_port(args.port)
+    elif args.logs:
+        lines = (line for path in args.logs for line in open(path, errors="replace"))
+    else:
+        lines = sys.stdin
+    dumps = parse_lines(lines)
+    if not dumps:
+        raise SystemExit("no shrike_prof dump found")
+    if args.merge:
+        dumps = [merge(dumps)]
+    for dump in dumps:
+        print_report(dump, args.net)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Hot-path profiler for MicroPython driver code.
+
+Accumulates call counts and ticks_us totals, self time, min and max per
+profiled function into arrays allocated up front:
+
+    from shrike_prof import Profiler
+    prof = Profiler()
+
+    @prof.timed(nargs=2)                # or prof.timed(f, "name", nargs=2)
+    def send_instr(opcode, data): ...
+
+    prof.wrap_methods(ShrikeFPGA14GPIO, "_send_cmd", "_read_gpio", nargs=(3, 1))
+    fpga.spi = prof.proxy(fpga.spi, "write", "read", prefix="spi.", nargs=(1, 2))
+    driver_module.time = prof.proxy(time, "sleep_us", "sleep_ms", nargs=1)   # sleep padding
+
+    with prof.section("setup"):         # sections are reusable objects
+        ...
+    prof.report()                       # table on the REPL
+    prof.dump("14-pin")                 # compact lines for prof_report.py
+
+Self time is the total minus the time spent in profiled callees, so for
+_read_gpio with spi.* and time.* proxied it is the interpreter overhead of
+the method itself. Profiler(enabled=False) makes timed / wrap_methods /
+proxy hand back the original objects: no overhead at all.
+
+nargs is the number of positional arguments of the wrapped callable (self
+included for methods), one int for all names or one per name. With 0-3
+arguments the wrapper has exactly that signature and allocates nothing per
+call; without nargs it takes *args, which costs a tuple per call. Keyword
+arguments are not passed through either way.
+"""
+
+import array
+import time
+
+try:
+    _ticks_us, _ticks_diff = time.ticks_us, time.ticks_diff
+except AttributeError:  # CPython
+    def _ticks_us():
+        return time.perf_counter_ns() // 1000
+
+    def _ticks_diff(a, b):
+        return a - b
+
+TAG = "~prof"            # Prefix of every dumped line
+MAX_DEPTH = 16
+
+
+class Section:
+    """Context manager timing a block into one slot; not re-entrant"""
+
+    def __init__(self, prof, slot):
+        self.prof = prof
+        self.slot = slot
+        self._t = 0
+        self._d = 0
+
+    def __enter__(self):
+        self._d = self.prof._enter()
+        self._t = _ticks_us()
+        return self
+
+    def __exit__(self, *exc):
+        self.prof._exit(self.slot, self._d, _ticks_diff(_ticks_us(), self._t))
+
+
+def _arity(nargs, i):
+    """nargs for the i-th name: one int for all names, or one per name"""
+    return nargs[i] if isinstance(nargs, (tuple, list)) else nargs
+
+
+class _Proxy:
+    """Stands in for an object (SPI handle, time module) with some methods timed"""
+
+    def __init__(self, obj):
+        self._obj = obj
+
+    def __getattr__(self, name):
+        return getattr(self._obj, name)
+
+
+class Profiler:
+    def __init__(self, slots=32, enabled=True):
+        self.enabled = enabled
+        self.names = []
+        self.count = array.array("I", [0] * slots)
+        self.total = array.array("I", [0] * slots)      # us, wraps after ~71 min per slot
+        self.self_us = array.array("I", [0] * slots)
+        self.min = array.array("I", [0xFFFFFFFF] * slots)
+        self.max = array.array("I", [0] * slots)
+        self._child = array.array("I", [0] * (MAX_DEPTH + 1))   # Callee time per nesting level
+        self._depth = 0
+        self._sections = {}
+
+    # --- SLOTS ---
+
+    def slot(self, name):
+        """Index of name, registered on first use (not on the hot path)"""
+        if name in self.names:
+            return self.names.index(name)
+        if len(self.names) == len(self.count):
+            raise ValueError("profiler full, raise slots")
+        self.names.append(name)
+        return len(self.names) - 1
+
+    def reset(self):
+        for i in range(len(self.count)):
+            self.count[i] = self.total[i] = self.self_us[i] = self.max[i] = 0
+            self.min[i] = 0xFFFFFFFF
+
+    # --- HOT PATH ---
+
+    def _enter(self):
+        d = self._depth
+        if d < MAX_DEPTH:
+            self._child[d + 1] = 0
+        self._depth = d + 1
+        return d
+
+    def _exit(self, slot, d, dt):
+        self._depth = d
+        if d < MAX_DEPTH:
+            self._child[d] += dt
+            own = dt - self._child[d + 1]
+        else:
+            own = dt
+        self.count[slot] += 1
+        self.total[slot] += dt
+        self.self_us[slot] += own if own > 0 else 0
+        if dt < self.min[slot]:
+            self.min[slot] = dt
+        if dt > self.max[slot]:
+            self.max[slot] = dt
+
+    # --- INSTRUMENTATION ---
+
+    def timed(self, f=None, name=None, nargs=None):
+        """Decorator / wrapper timing every call of f"""
+        if f is None or isinstance(f, str):
+            return lambda g: self.timed(g, f if name is None else name, nargs)
+        if not self.enabled:
+            return f
+        slot = self.slot(name or f.__name__)
+        enter = self._enter
+        exit_ = self._exit
+
+        # One wrapper per arity, so the common calls build no args tuple
+        if nargs == 0:
+            def wrapper():
+                d = enter()
+                t = _ticks_us()
+                try:
+                    return f()
+                finally:
+                    exit_(slot, d, _ticks_diff(_ticks_us(), t))
+        elif nargs == 1:
+            def wrapper(a):
+                d = enter()
+                t = _ticks_us()
+                try:
+                    return f(a)
+                finally:
+                    exit_(slot, d, _ticks_diff(_ticks_us(), t))
+        elif nargs == 2:
+            def wrapper(a, b):
+                d = enter()
+                t = _ticks_us()
+                try:
+                    return f(a, b)
+                finally:
+                    exit_(slot, d, _ticks_diff(_ticks_us(), t))
+        elif nargs == 3:
+            def wrapper(a, b, c):
+                d = enter()
+                t = _ticks_us()
+                try:
+                    return f(a, b, c)
+                finally:
+                    exit_(slot, d, _ticks_diff(_ticks_us(), t))
+        else:
+            def wrapper(*args):
+                d = enter()
+                t = _ticks_us()
+                try:
+                    return f(*args)
+                finally:
+                    exit_(slot, d, _ticks_diff(_ticks_us(), t))
+        return wrapper
+
+    def wrap_methods(self, cls, *names, prefix=None, nargs=None):
+        """Times the given methods of a class (or instance) in place"""
+        if not self.enabled:
+            return cls
+        if prefix is None:
+            prefix = getattr(cls, "__name__", type(cls).__name__) + "."
+        for i, name in enumerate(names):
+            setattr(cls, name, self.timed(getattr(cls, name), prefix + name, _arity(nargs, i)))
+        return cls
+
+    def proxy(self, obj, *names, prefix=None, nargs=None):
+        """Object that behaves like obj with the given methods timed; for
+        built-in objects and modules whose attributes cannot be replaced"""
+        if not self.enabled:
+            return obj
+        if prefix is None:
+            prefix = getattr(obj, "__name__", type(obj).__name__) + "."
+        p = _Proxy(obj)
+        for i, name in enumerate(names):
+            setattr(p, name, self.timed(getattr(obj, name), prefix + name, _arity(nargs, i)))
+        return p
+
+    def section(self, name):
+        """Reusable context manager for a named block"""
+        sec = self._sections.get(name)
+        if sec is None:
+            sec = self._sections[name] = Section(self, self.slot(name))
+        return sec
+
+    def calibrate(self, n=200):
+        """Cost of one timed call of an empty function, in us"""
+        def empty():
+            pass
+        timed = Profiler(1).timed(empty, nargs=0)
+        t = _ticks_us()
+        for _ in range(n):
+            timed()
+        wrapped = _ticks_diff(_ticks_us(), t)
+        t = _ticks_us()
+        for _ in range(n):
+            empty()
+        return (wrapped - _ticks_diff(_ticks_us(), t)) / n
+
+    # --- OUTPUT ---
+
+    def rows(self):
+        """(name, count, total, self, min, max) for slots that ran, by total"""
+        rows = []
+        for i, name in enumerate(self.names):
+            if self.count[i]:
+                rows.append((name, self.count[i], self.total[i], self.self_us[i],
+                             self.min[i], self.max[i]))
+        rows.sort(key=lambda r: -r[2])
+        return rows
+
+    def report(self):
+        print("%-24s %8s %10s %10s %8s %8s %8s" % (
+            "name", "calls", "total us", "self us", "mean", "min", "max"))
+        for name, n, total, own, lo, hi in self.rows():
+            print("%-24s %8d %10d %10d %8.1f %8d %8d" % (name, n, total, own, total / n, lo, hi))
+
+    def dump(self, name="prof", out=print):
+        """Compact lines for prof_report.py; includes the per-call overhead"""
+        out("%s begin %s %.2f" % (TAG, name, self.calibrate()))
+        for row in self.rows():
+            out("%s %s %d %d %d %d %d" % ((TAG,) + row))
+        out("%s end" % TAG)
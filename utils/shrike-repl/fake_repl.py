@@ -0,0 +1,452 @@
+"""
+Stand-in MicroPython board on a pty, for running the REPL tools in CI.
+
+Speaks the parts of the MicroPython REPL the host tools use:
+- the friendly REPL, with Ctrl-A / Ctrl-B / Ctrl-C / Ctrl-D
+- the raw REPL, including raw-paste mode with flow control
+- soft reset, through Ctrl-D at an empty raw prompt, sys.exit() or machine.soft_reset()
+- Ctrl-C while code runs
+The code itself runs on CPython, with small `machine` (unique_id,
+soft_reset, reset) and `micropython` (kbd_intr) modules. Use --root to give the board a directory as its
+filesystem, which lets shrike_deploy.py run against it as well.
+
+    python fake_repl.py                     # prints the pty path, serves until Ctrl-C
+    python fake_repl.py --check             # exercises repl_session.Session against it
+
+PtyPort is the pyserial-like port used to talk to it without pyserial.
+"""
+
+import argparse
+import fcntl
+import os
+import pty
+import struct
+import subprocess
+import sys
+import termios
+import threading
+import time
+import traceback
+import tty
+import types
+
+RAW_BANNER = b"raw REPL; CTRL-B to exit\r\n>"
+FRIENDLY_BANNER = b"\r\nMicroPython (fake) on Shrike; fake_repl.py\r\n>>> "
+SOFT_REBOOT = b"MPY: soft reboot\r\n"
+PASTE_WINDOW = 128
+UNIQUE_ID = bytes.fromhex("e6614104031f2a2b")
+
+
+class _SoftReset(BaseException):
+    pass
+
+
+class _Stdin:
+    """sys.stdin for code running on the board: bytes come off the pty"""
+
+    def __init__(self, board):
+        self.board = board
+        self.buffer = self
+
+    def read(self, n=1):
+        return self.board.take(n, interruptible=True)
+
+    def readinto(self, buf):
+        data = self.board.take(len(buf), interruptible=True)
+        buf[:len(data)] = data
+        return len(data)
+
+    def readline(self):
+        line = bytearray()
+        while not line.endswith(b"\n"):
+            line += self.board.take(1, interruptible=True)
+        return line.decode()
+
+
+class _Stdout:
+    """sys.stdout for code running on the board: text is cooked (\\n -> \\r\\n),
+    .buffer writes raw bytes, as on the rp2 port"""
+
+    def __init__(self, board):
+        self.board = board
+        self.buffer = types.SimpleNamespace(write=board.write, flush=lambda: None)
+
+    def write(self, text):
+        self.board.write(text.replace("\n", "\r\n").encode())
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class FakeBoard:
+    def __init__(self, root=None, latency=0.0):
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.slave)
+        self.path = os.ttyname(self.slave)
+        self.latency = latency
+        self.root = root
+        self._rx = bytearray()
+        self._rx_ready = threading.Condition()
+        self._interrupt = threading.Event()
+        self.intr_char = 0x03
+        self._running = False
+        self.resets = 0
+        self._modules = None
+        self.namespace = None
+
+    # --- PTY ---
+
+    def _reader(self):
+        while True:
+            try:
+                data = os.read(self.master, 4096)
+            except OSError:
+                return
+            if self.latency:
+                time.sleep(self.latency)
+            if self._running and 0 <= self.intr_char < 256 and self.intr_char in data:
+                self._interrupt.set()
+                data = data.replace(bytes([self.intr_char]), b"")
+            with self._rx_ready:
+                self._rx += data
+                self._rx_ready.notify()
+
+    def write(self, data):
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.master, view):]
+        return len(data)
+
+    def take(self, n, interruptible=False):
+        """Blocks until n bytes have arrived from the host and returns them"""
+        with self._rx_ready:
+            while len(self._rx) < n:
+                if interruptible and self._interrupt.is_set():
+                    self._interrupt.clear()
+                    raise KeyboardInterrupt
+                self._rx_ready.wait(0.05)
+            data = bytes(self._rx[:n])
+            del self._rx[:n]
+        return data
+
+    def next_byte(self):
+        return self.take(1)[0]
+
+    # --- MICROPYTHON ---
+
+    def _machine(self):
+        def soft_reset():
+            raise _SoftReset
+
+        mod = types.ModuleType("machine")
+        mod.unique_id = lambda: UNIQUE_ID
+        mod.soft_reset = soft_reset
+        mod.reset = soft_reset
+        return mod
+
+    def _micropython(self):
+        def kbd_intr(c):
+            self.intr_char = c
+
+        mod = types.ModuleType("micropython")
+        mod.kbd_intr = kbd_intr
+        return mod
+
+    def soft_reset(self):
+        """Fresh globals and modules, as after MPY: soft reboot"""
+        if self._modules is None:
+            self._modules = dict(sys.modules)
+        else:
+            self.resets += 1
+            for name in list(sys.modules):
+                if name not in self._modules:
+                    del sys.modules[name]
+        sys.modules["machine"] = self._machine()
+        sys.modules["micropython"] = self._micropython()
+        self.intr_char = 0x03
+        self.namespace = {"__name__": "__main__"}
+
+    def _trace(self, frame, event, arg):
+        if self._interrupt.is_set():
+            self._interrupt.clear()
+            raise KeyboardInterrupt
+        return self._trace
+
+    def execute(self, code):
+        """Runs code, returns (stderr text, soft reset requested)"""
+        self._running = True
+        sys.settrace(self._trace)
+        try:
+            exec(compile(code, "<stdin>", "exec"), self.namespace)
+            return "", False
+        except (SystemExit, _SoftReset):
+            return "", True
+        except BaseException as e:
+            return "".join(traceback.format_exception(type(e), e, e.__traceback__)), False
+        finally:
+            sys.settrace(None)
+            self._running = False
+            self._interrupt.clear()
+
+    def _run_raw(self, code):
+        err, reset = self.execute(code)
+        self.write(b"\x04" + err.replace("\n", "\r\n").encode() + b"\x04")
+        if reset:
+            self.write(SOFT_REBOOT)
+            self.soft_reset()
+            self.write(RAW_BANNER)
+        else:
+            self.write(b">")
+
+    def _raw_paste(self):
+        if self.next_byte() != ord("A") or self.next_byte() != 0x01:
+            return
+        self.write(b"R\x01" + struct.pack("<H", PASTE_WINDOW))
+        code = bytearray()
+        taken = 0
+        while True:
+            b = self.next_byte()
+            if b == 0x04:
+                break
+            code.append(b)
+            taken += 1
+            if taken == PASTE_WINDOW:
+                taken = 0
+                self.write(b"\x01")
+        self.write(b"\x04")
+        self._run_raw(bytes(code))
+
+    def _raw_repl(self):
+        """Returns when the host leaves the raw REPL with Ctrl-B"""
+        self.write(RAW_BANNER)
+        line = bytearray()
+        while True:
+            b = self.next_byte()
+            if b == 0x01:
+                line.clear()
+                self.write(RAW_BANNER)
+            elif b == 0x02:
+                self.write(FRIENDLY_BANNER)
+                return
+            elif b == 0x03:
+                line.clear()
+            elif b == 0x05 and not line:
+                self._raw_paste()
+            elif b == 0x04:
+                if not line:
+                    self.write(b"OK\r\n" + SOFT_REBOOT)
+                    self.soft_reset()
+                    self.write(RAW_BANNER)
+                    continue
+                self.write(b"OK")
+                self._run_raw(bytes(line))
+                line.clear()
+            else:
+                line.append(b)
+
+    def _friendly_line(self, line):
+        try:
+            value = eval(line, self.namespace)
+            if value is not None:
+                print(repr(value))
+        except SyntaxError:
+            err, reset = self.execute(line)
+            if err:
+                self.write(err.replace("\n", "\r\n").encode())
+        except Exception as e:
+            self.write("".join(traceback.format_exception_only(type(e), e))
+                       .replace("\n", "\r\n").encode())
+
+    def _mount_root(self):
+        """Absolute paths used by code on the board resolve under root"""
+        import builtins
+        root = os.path.abspath(self.root)
+        os.chdir(root)
+        sys.path.insert(0, root)
+
+        def rooted(fn, nargs=1):
+            def wrapper(*args, **kwargs):
+                args = [os.path.join(root, a.lstrip("/")) if i < nargs and isinstance(a, str)
+                        and a.startswith("/") else a for i, a in enumerate(args)]
+                return fn(*args, **kwargs)
+            return wrapper
+
+        builtins.open = rooted(builtins.open)
+        for name in ("stat", "mkdir", "remove", "rmdir", "listdir", "chdir"):
+            setattr(os, name, rooted(getattr(os, name)))
+        os.rename = rooted(os.rename, 2)
+
+    def serve(self):
+        if self.root:
+            self._mount_root()
+        self.soft_reset()
+        sys.stdin = _Stdin(self)
+        sys.stdout = _Stdout(self)
+        threading.Thread(target=self._reader, daemon=True).start()
+        line = bytearray()
+        while True:
+            b = self.next_byte()
+            if b == 0x01:
+                self.write(b"\r\n")
+                self._raw_repl()
+                line.clear()
+            elif b == 0x03:
+                line.clear()
+                self.write(b"\r\nKeyboardInterrupt\r\n>>> ")
+            elif b == 0x04:
+                self.write(b"\r\n" + SOFT_REBOOT)
+                self.soft_reset()
+                self.write(FRIENDLY_BANNER)
+            elif b == 0x0D:
+                self.write(b"\r\n")
+                if line.strip():
+                    self._friendly_line(line.decode())
+                line.clear()
+                self.write(b">>> ")
+            elif b != 0x0A:
+                line.append(b)
+                self.write(bytes([b]))
+
+
+class PtyPort:
+    """The parts of serial.Serial the REPL tools use, on a raw tty"""
+
+    def __init__(self, path, timeout=0.05):
+        self.fd = os.open(path, os.O_RDWR | os.O_NOCTTY)
+        tty.setraw(self.fd)
+        self.timeout = timeout
+
+    @property
+    def in_waiting(self):
+        buf = fcntl.ioctl(self.fd, termios.FIONREAD, b"\0\0\0\0")
+        return struct.unpack("I", buf)[0]
+
+    def read(self, n=1):
+        import select
+        data = bytearray()
+        deadline = time.monotonic() + (self.timeout or 0)
+        while len(data) < n:
+            wait = deadline - time.monotonic()
+            if not select.select([self.fd], [], [], max(wait, 0))[0]:
+                break
+            data += os.read(self.fd, n - len(data))
+        return bytes(data)
+
+    def write(self, data):
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view):]
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        os.close(self.fd)
+
+
+def spawn(root=None, latency=0.0):
+    """Starts a FakeBoard in a child process; returns (process, pty path)"""
+    cmd = [sys.executable, os.path.abspath(__file__), "--latency", str(latency * 1000)]
+    if root:
+        cmd += ["--root", root]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    path = proc.stdout.readline().decode().strip()
+    return proc, path
+
+
+def check(latency):
+    """Session against a fake board: results, pipelining, errors, resets and timeouts"""
+    from rawrepl import RawREPL
+    from repl_session import RemoteError, Session, SessionReset
+
+    proc, path = spawn(latency=latency)
+    failures = []
+
+    def expect(name, cond, detail=""):
+        print(f"{'ok  ' if cond else 'FAIL'} {name} {detail}")
+        if not cond:
+            failures.append(name)
+
+    try:
+        t0 = time.perf_counter()
+        for i in range(20):
+            port = PtyPort(path)
+            repl = RawREPL(port)
+            repl.enter()
+            repl.exec(f"import math\nprint(pow(2, {i}))")
+            repl.exit()
+            port.close()
+        fresh = 20 / (time.perf_counter() - t0)
+        expect("reconnect per call (mpremote style)", True, f"{fresh:.0f} calls/s")
+
+        session = Session(PtyPort(path), setup=["import math\nboard_tag = 42"], timeout=2.0)
+        expect("eval", session.eval("math.sqrt(16)") == 4.0)
+        expect("output", session.exec("for i in range(3):\n    print('line', i)")
+               == "line 0\nline 1\nline 2")
+        expect("call", session.call("divmod", 17, 5) == (3, 2))
+        try:
+            session.eval("1 / 0")
+            expect("remote error", False)
+        except RemoteError as e:
+            expect("remote error", "ZeroDivisionError" in e.args[0])
+
+        n = 2000
+        t0 = time.perf_counter()
+        results = session.map("pow", [(2, i % 64) for i in range(n)])
+        piped = n / (time.perf_counter() - t0)
+        expect("pipelined map", results == [2 ** (i % 64) for i in range(n)],
+               f"{piped:.0f} calls/s")
+
+        t0 = time.perf_counter()
+        for i in range(200):
+            session.call("pow", 2, i)
+        serial = 200 / (time.perf_counter() - t0)
+        expect("one call at a time", True, f"{serial:.0f} calls/s")
+
+
+        running = session.submit("import machine\nmachine.soft_reset()")
+        after = [session.submit(f"board_tag + {i}", "e") for i in range(3)]
+        running.wait()
+        expect("soft reset fails the running request", isinstance(running.error, SessionReset))
+        expect("requests after the reset re-sent, setup re-run",
+               [r.result() for r in after] == [42, 43, 44], f"resets={session.resets}")
+
+        try:
+            session.exec("while True:\n    pass", timeout=0.5)
+            expect("timeout", False)
+        except TimeoutError:
+            expect("timeout interrupts the request", True)
+        expect("session usable after timeout", session.eval("board_tag") == 42)
+
+        streamed = []
+        session.exec("import time\nfor i in range(3):\n    print(i)\n    time.sleep(0.05)",
+                     on_output=lambda req, line: streamed.append((line, time.monotonic())))
+        expect("output streamed while running",
+               len(streamed) == 3 and streamed[-1][1] - streamed[0][1] > 0.05)
+        session.close()
+    finally:
+        proc.terminate()
+    return not failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake MicroPython REPL on a pty")
+    parser.add_argument("--root", help="directory used as the board filesystem")
+    parser.add_argument("--latency", type=float, default=0.0, help="ms added per USB transfer")
+    parser.add_argument("--check", action="store_true", help="run the session checks and exit")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(0 if check(args.latency / 1000) else 1)
+    board = FakeBoard(args.root, args.latency / 1000)
+    print(board.path, flush=True)
+    try:
+        board.serve()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Minimal MicroPython raw-REPL client for host tools.
+
+    repl = RawREPL.open("/dev/ttyACM0")
+    out = repl.exec("import machine; print(machine.unique_id())")
+    repl.close()
+
+Code is sent in raw-paste mode (flow controlled by the device, no per-chunk
+sleeps) when the firmware supports it, and in classic raw mode otherwise.
+Needs pyserial for open(); any object with read(n), write(data) and a
+`timeout` attribute can be passed to RawREPL directly.
+"""
+
+import time
+
+RAW_PROMPT = b"raw REPL; CTRL-B to exit\r\n>"
+SOFT_REBOOT = b"soft reboot\r\n"
+
+
+class ReplError(Exception):
+    """Device raised an exception; args are (stdout, stderr)"""
+
+
+class RawREPL:
+    def __init__(self, port):
+        self.port = port
+        self.use_raw_paste = True
+
+    @classmethod
+    def open(cls, device, baudrate=115200, timeout=1.0):
+        import serial
+        repl = cls(serial.Serial(device, baudrate, timeout=timeout))
+        repl.enter()
+        return repl
+
+    def close(self):
+        try:
+            self.exit()
+        finally:
+            self.port.close()
+
+    # --- LOW LEVEL ---
+
+    def read_until(self, ending, timeout=10.0):
+        """Reads until data ends with ending; raises TimeoutError"""
+        data = bytearray()
+        deadline = time.monotonic() + timeout
+        while not data.endswith(ending):
+            chunk = self.port.read(1)
+            if chunk:
+                data += chunk
+                deadline = time.monotonic() + timeout
+            elif time.monotonic() > deadline:
+                raise TimeoutError(f"waiting for {ending!r}, got {bytes(data[-80:])!r}")
+        return bytes(data)
+
+    def _drain(self):
+        old, self.port.timeout = self.port.timeout, 0.05
+        try:
+            while self.port.read(256):
+                pass
+        finally:
+            self.port.timeout = old
+
+    def enter(self, soft_reset=False):
+        """Interrupts whatever runs and enters the raw REPL"""
+        self.port.write(b"\r\x03\x03")
+        self._drain()
+        self.port.write(b"\r\x01")
+        self.read_until(RAW_PROMPT)
+        if soft_reset:
+            self.port.write(b"\x04")
+            self.read_until(SOFT_REBOOT)
+            self.read_until(RAW_PROMPT)
+
+    def exit(self):
+        self.port.write(b"\r\x02")
+
+    # --- EXECUTION ---
+
+    def _send_raw_paste(self, code):
+        self.port.write(b"\x05A\x01")
+        reply = self.port.read(2)
+        if reply != b"R\x01":
+            if reply != b"R\x00":      # Older firmware: prints the raw prompt again
+                self.read_until(RAW_PROMPT[-20:])
+            self.use_raw_paste = False
+            return False
+        header = self.port.read(2)
+        window = header[0] | header[1] << 8
+        remaining = window
+        i = 0
+        while i < len(code):
+            while remaining == 0 or self.port.in_waiting:
+                flag = self.port.read(1)
+                if flag == b"\x01":
+                    remaining += window
+                elif flag == b"\x04":  # Device aborted
+                    self.port.write(b"\x04")
+                    raise ReplError(b"", b"raw-paste aborted by device")
+            n = min(remaining, len(code) - i)
+            self.port.write(code[i:i + n])
+            remaining -= n
+            i += n
+        self.port.write(b"\x04")
+        self.read_until(b"\x04")
+        return True
+
+    def _send_raw(self, code):
+        for i in range(0, len(code), 256):
+            self.port.write(code[i:i + 256])
+            time.sleep(0.01)
+        self.port.write(b"\x04")
+        ok = self.port.read(2)
+        if ok != b"OK":
+            raise ReplError(b"", b"could not exec command, got " + ok)
+
+    def exec_start(self, code):
+        """Sends code and returns once the device has started running it;
+        its output is left on the port for the caller"""
+        if isinstance(code, str):
+            code = code.encode()
+        if not (self.use_raw_paste and self._send_raw_paste(code)):
+            self._send_raw(code)
+
+    def exec_raw(self, code, timeout=10.0):
+        """Runs code, returns (stdout, stderr) as bytes"""
+        self.exec_start(code)
+        out = self.read_until(b"\x04", timeout)[:-1]
+        err = self.read_until(b"\x04", timeout)[:-1]
+        self.read_until(b">", timeout)
+        return out, err
+
+    def exec(self, code, timeout=10.0):
+        """Runs code, returns stdout; raises ReplError on a device exception"""
+        out, err = self.exec_raw(code, timeout)
+        if err:
+            raise ReplError(out, err)
+        return out
@@ -0,0 +1,421 @@
+"""
+Persistent raw-REPL sessions for host-side test beds.
+
+`mpremote connect ... run script.py` reconnects, re-enters the raw REPL and
+re-imports everything for every script. A Session enters the raw REPL once,
+runs the setup code once (imports, bitstream load) and then starts a small
+agent loop on the board that reads requests from stdin:
+
+    host -> board   <id> <kind> <nbytes>\\n<code>
+    board -> host   \\x1e<id> <ok|err> <nbytes>\\n<repr(result) or traceback>
+
+Requests carry IDs and the host keeps up to `window` of them in flight, so
+many snippets and calls share one USB round trip. Anything the code prints
+arrives as plain lines in between, streamed to the request that is running.
+
+    with Session.open("/dev/ttyACM0", setup=["import shrike, pinbus"]) as s:
+        s.exec("shrike.flash('blink_all.bin')")
+        s.call("pinbus.PinBus([4, 5, 6]).read")
+        results = s.map("pow", [(2, i) for i in range(100)])   # pipelined
+
+If the board soft-resets (sys.exit(), machine.soft_reset(), Ctrl-D), the
+session notices the reboot banner, re-enters the raw REPL, re-runs the setup
+code and re-sends the requests that had not started. The request that was
+running fails with SessionReset. A request that runs past its timeout is
+interrupted with Ctrl-C and fails with TimeoutError in the same way.
+
+Needs pyserial for open(). fake_repl.py serves a stand-in board on a pty
+for running all of this without hardware.
+
+    python repl_session.py --port /dev/ttyACM0 --setup "import shrike" t1.py t2.py
+"""
+
+import argparse
+import ast
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+from rawrepl import RawREPL, ReplError
+
+MARK = 0x1E                 # Starts every reply frame
+CONTROL = bytes(range(1, 6)) + b"\x1e"   # Bytes the raw REPL or the framing would act on
+WINDOW = 16
+
+AGENT = r"""
+import sys
+try:
+    from sys import print_exception as _pe
+except ImportError:                     # CPython stand-in board (fake_repl.py)
+    from traceback import print_exception as _tpe
+    def _pe(e, f):
+        _tpe(type(e), e, e.__traceback__, file=f)
+def _shrike_serve(g=globals()):
+    import io
+    rd = sys.stdin.readline
+    rdn = sys.stdin.buffer.read
+    wr = sys.stdout.buffer.write
+    def reply(rid, status, text):
+        b = text.encode()
+        wr(('\x1e%s %s %d\n' % (rid, status, len(b))).encode())
+        wr(b)
+    wr(b'\x1eready\n')
+    while True:
+        rid, kind, n = rd().split()
+        if kind == 'q':
+            break
+        src = rdn(int(n))
+        try:
+            if kind == 'e':
+                r = repr(eval(src, g))
+            else:
+                exec(src, g)
+                r = 'None'
+            reply(rid, 'ok', r)
+        except Exception as e:
+            f = io.StringIO()
+            _pe(e, f)
+            reply(rid, 'err', f.getvalue())
+"""
+
+
+class RemoteError(Exception):
+    """The code raised on the board; args[0] is the device traceback"""
+
+
+class SessionReset(Exception):
+    """The board reset or the agent stopped while the request was running"""
+
+
+class Request:
+    """One snippet in flight. result() blocks (pumping the session) until
+    the board has answered"""
+
+    def __init__(self, session, rid, kind, code, on_output=None):
+        self.session = session
+        self.id = rid
+        self.kind = kind
+        self.code = code
+        self.on_output = on_output
+        self.output = []
+        self.done = False
+        self.ok = False
+        self.value = None
+        self.error = None
+        self.sent = 0.0
+        self.seconds = None
+
+    def _finish(self, ok, value=None, error=None):
+        self.done = True
+        self.ok = ok
+        self.value = value
+        self.error = error
+        self.seconds = time.monotonic() - self.sent
+
+    def wait(self, timeout=None):
+        while not self.done:
+            self.session._pump(timeout)
+        return self
+
+    def result(self, timeout=None):
+        self.wait(timeout)
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def _literal(text):
+    """Device repr() -> Python value where it is a literal, else the repr string"""
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+class Session:
+    def __init__(self, port, setup=(), window=WINDOW, timeout=10.0):
+        self.repl = RawREPL(port)
+        self.port = port
+        self.setup = list(setup)
+        self.window = window
+        self.timeout = timeout
+        self.resets = 0
+        self.restarts = 0
+        self._next = 0
+        self._pending = deque()      # Requests written, in the order the board runs them
+        self._buf = bytearray()
+        self._frame = None           # (rid, status, nbytes) of a reply being received
+        self._start(install=True, enter=True)
+
+    @classmethod
+    def open(cls, device, baudrate=115200, **kwargs):
+        import serial
+        return cls(serial.Serial(device, baudrate, timeout=0.05), **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        try:
+            self._drain_pending()
+            self._write_request("0", "q", b"")
+            self.repl.read_until(b"\x04>", self.timeout)
+            self.repl.exit()
+        except (TimeoutError, OSError):
+            pass
+        finally:
+            self.port.close()
+
+    # --- AGENT ---
+
+    def _start(self, install, enter=False):
+        if enter:
+            self.repl.enter()
+        if install:
+            self.repl.exec(AGENT)
+            for code in self.setup:
+                self.repl.exec(code, self.timeout)
+        self._buf.clear()
+        self._frame = None
+        self.repl.exec_start("_shrike_serve()")
+        self.repl.read_until(b"\x1eready\n", self.timeout)
+
+    def _restart(self, reason):
+        """The agent loop ended: fail the running request, bring the agent
+        back (re-running setup after a reset) and re-send the rest"""
+        out = bytes(self._buf)
+        self._buf.clear()
+        try:
+            out += self.repl.read_until(b"\x04", self.timeout)    # stderr of the raw REPL exec
+            out += self.repl.read_until(b">", self.timeout)
+            if b"soft reboot" in out and not out.endswith(b"raw REPL; CTRL-B to exit\r\n>"):
+                out += self.repl.read_until(b"raw REPL; CTRL-B to exit\r\n>", self.timeout)
+            enter = False
+        except TimeoutError:
+            enter = True            # Out of step: interrupt and re-enter from scratch
+        reset = b"soft reboot" in out
+        if reset:
+            self.resets += 1
+        self.restarts += 1
+
+        requests = list(self._pending)
+        self._pending.clear()
+        if not enter:
+            self.port.write(b"\x03")     # Clears request bytes the raw REPL took as code
+        if requests:
+            err = reason or SessionReset(
+                "board reset" if reset else "agent stopped: " + out.decode(errors="replace").strip())
+            requests[0]._finish(False, error=err)
+        self._start(install=reset or enter, enter=enter)
+        for req in requests[1:]:
+            self._send(req)
+
+    # --- WIRE ---
+
+    def _write_request(self, rid, kind, code):
+        self.port.write(b"%s %s %d\n" % (rid.encode(), kind.encode(), len(code)) + code)
+
+    def _send(self, req):
+        req.sent = time.monotonic()
+        self._pending.append(req)
+        self._write_request(req.id, req.kind, req.code)
+
+    def _deliver_output(self, line):
+        text = line.decode(errors="replace").rstrip("\r\n")
+        req = self._pending[0] if self._pending else None
+        if req is None:
+            return
+        req.output.append(text)
+        if req.on_output:
+            req.on_output(req, text)
+
+    def _parse(self):
+        buf = self._buf
+        while buf:
+            if self._frame:
+                rid, status, n = self._frame
+                if len(buf) < n:
+                    return
+                text = buf[:n].decode(errors="replace")
+                del buf[:n]
+                self._frame = None
+                if not self._pending or self._pending[0].id != rid:
+                    continue        # Stale reply from before a restart
+                req = self._pending.popleft()
+                if status == "ok":
+                    req._finish(True, _literal(text))
+                else:
+                    req._finish(False, error=RemoteError(text))
+                continue
+            if buf[0] == MARK:
+                end = buf.find(b"\n")
+                if end < 0:
+                    return
+                rid, status, n = buf[1:end].decode().split()
+                del buf[:end + 1]
+                self._frame = (rid, status, int(n))
+                continue
+            if buf[0] == 0x04:
+                del buf[:1]
+                self._restart(None)
+                continue
+            ends = [i for i in (buf.find(b"\n"), buf.find(MARK), buf.find(b"\x04")) if i >= 0]
+            if not ends:
+                return
+            end = min(ends)
+            end += buf[end] == 0x0A
+            self._deliver_output(buf[:end])
+            del buf[:end]
+
+    def _pump(self, timeout=None):
+        """Reads whatever the board sent and processes it. Interrupts the
+        running request if the board stays silent for timeout seconds"""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            data = self.port.read(max(1, self.port.in_waiting))
+            if data:
+                self._buf += data
+                self._parse()
+                return
+            if not self._pending:
+                return
+            if time.monotonic() > deadline:
+                break
+        req = self._pending[0]
+        self.port.write(b"\x03")               # KeyboardInterrupt ends the agent loop
+        try:
+            self.repl.read_until(b"\x04", 1.0)
+            self._buf.clear()
+            self._restart(TimeoutError(f"request {req.id} timed out after {timeout} s"))
+        except TimeoutError:
+            self._buf.clear()
+            self._restart(TimeoutError(f"request {req.id} timed out; board unresponsive"))
+
+    def _drain_pending(self):
+        while self._pending:
+            self._pump()
+
+    # --- REQUESTS ---
+
+    def submit(self, code, kind="x", on_output=None):
+        """Queues a snippet ("x": exec, "e": eval) without waiting for it"""
+        if isinstance(code, str):
+            code = code.encode()
+        if any(c in CONTROL for c in code):
+            raise ValueError("control characters 0x01-0x05 / 0x1E are not allowed in code")
+        while len(self._pending) >= self.window:
+            self._pump()
+        self._next += 1
+        req = Request(self, str(self._next), kind, code, on_output)
+        self._send(req)
+        self._parse_available()
+        return req
+
+    def _parse_available(self):
+        if self.port.in_waiting:
+            self._buf += self.port.read(self.port.in_waiting)
+            self._parse()
+
+    def exec(self, code, timeout=None, on_output=None):
+        """Runs statements, returns what they printed"""
+        req = self.submit(code, "x", on_output)
+        req.result(timeout)
+        return "\n".join(req.output)
+
+    def eval(self, expr, timeout=None):
+        """Evaluates an expression, returns its value (or repr string)"""
+        return self.submit(expr, "e").result(timeout)
+
+    def call(self, func, *args, **kwargs):
+        """Calls a function by name on the board with literal arguments"""
+        return self.submit(call_expr(func, args, kwargs), "e").result()
+
+    def stream(self, codes, kind="x", on_output=None):
+        """Pipelines snippets, yields each Request as it completes (in order)"""
+        queue = deque()
+        for code in codes:
+            queue.append(self.submit(code, kind, on_output))
+            while queue and queue[0].done:
+                yield queue.popleft()
+        while queue:
+            yield queue.popleft().wait()
+
+    def map(self, func, arglist):
+        """[func(*args) for args in arglist] evaluated on the board, pipelined"""
+        return [req.result() for req in self.stream(
+            (call_expr(func, args if isinstance(args, tuple) else (args,), {})
+             for args in arglist), "e")]
+
+    def run_file(self, path, timeout=None, on_output=None):
+        with open(path, "rb") as f:
+            return self.exec(f.read(), timeout, on_output)
+
+
+def call_expr(func, args, kwargs):
+    params = [repr(a) for a in args] + [f"{k}={v!r}" for k, v in kwargs.items()]
+    return f"{func}({', '.join(params)})"
+
+
+def run_board(device, scripts, setup, timeout, lock, prefix=""):
+    """Runs scripts one after another in one session; returns failures"""
+    failed = 0
+
+    def show(req, line):
+        with lock:
+            print(prefix + line, flush=True)
+
+    t0 = time.monotonic()
+    try:
+        session = Session.open(device, setup=setup, timeout=timeout)
+    except (TimeoutError, OSError, ReplError) as e:
+        with lock:
+            print(f"{device}: could not start session: {e}")
+        return len(scripts)
+    setup_s = time.monotonic() - t0
+    with session:
+        for name, code in scripts:
+            req = session.submit(code, "x", show).wait()
+            status = "ok" if req.ok else f"FAILED\n{req.error}"
+            if not req.ok:
+                failed += 1
+            with lock:
+                print(f"{device}: {name}: {req.seconds:.3f} s {status}")
+    with lock:
+        print(f"{device}: {len(scripts)} scripts, {failed} failed, setup {setup_s:.2f} s, "
+              f"total {time.monotonic() - t0:.2f} s, {session.resets} resets")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run scripts over one raw-REPL session per board")
+    parser.add_argument("scripts", nargs="*", help="scripts to run in order")
+    parser.add_argument("--port", action="append", required=True, help="serial port (repeatable)")
+    parser.add_argument("--setup", action="append", default=[],
+                        help="code run once per session, and again after a reset")
+    parser.add_argument("-c", "--code", action="append", default=[], help="snippet to run")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds per script")
+    args = parser.parse_args()
+
+    scripts = [(os.path.basename(p), open(p, "rb").read()) for p in args.scripts]
+    scripts += [(f"-c {i + 1}", c.encode()) for i, c in enumerate(args.code)]
+    lock = threading.Lock()
+    multi = len(args.port) > 1
+    failures = []
+    threads = [threading.Thread(target=lambda d=d: failures.append(
+        run_board(d, scripts, args.setup, args.timeout, lock, f"{d}: " if multi else "")))
+        for d in args.port]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    sys.exit(1 if any(failures) else 0)
+
+
+if __name__ == "__main__":
+    main()
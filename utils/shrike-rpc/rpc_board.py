@@ -0,0 +1,236 @@
+"""
+RPC dispatcher: runs FPGA driver methods for a host program over USB CDC.
+
+Started from the raw REPL by rpc_host.py with the objects to expose:
+
+    from fpga_gpio_14bit import ShrikeFPGA14GPIO
+    import rpc_board
+    rpc_board.serve({"gpio": ShrikeFPGA14GPIO()})
+
+Every public method of each object (or function of a module) gets a number
+("gpio.write_all" -> 7, ...). The host sends batches of calls as one binary
+frame and gets all results back in one reply frame:
+
+    request  kind:u8 count:u16 length:u16  (method:u8 nargs:u8 arg*)*
+    reply    0xFF    count:u16 length:u16  (status:u8 value)*     0xFE: more replies follow
+
+Values are tagged: None, int32, bytes, str, True, False, list, float32. A
+call that raises gives status 1 and the message, as does a result that has
+no tag ("unsupported result type"); the rest of the batch still runs.
+Ctrl-C is disabled while serving so binary frames pass through stdin
+untouched; a REQ_QUIT frame returns to the REPL.
+"""
+
+import sys
+import struct
+
+try:
+    from micropython import kbd_intr
+except ImportError:  # CPython
+    def kbd_intr(c):
+        pass
+
+REQ_CALLS = 0xA5
+REQ_TABLE = 0xA6
+REQ_QUIT = 0xA7
+REPLY = 0xFF           # Never appears in UTF-8 text the methods might print
+REPLY_MORE = 0xFE
+READY = b"\xffRPC1\n"
+
+MAX_FRAME = 4096
+HEADER = 5             # kind, count, length
+
+T_NONE, T_INT, T_BYTES, T_STR, T_TRUE, T_FALSE, T_LIST, T_FLOAT = range(8)
+
+
+def encode(buf, pos, value):
+    """Packs value into buf at pos, returns the new position. Raises
+    IndexError when it does not fit, TypeError when value has no tag"""
+    if value is None or value is True or value is False:
+        if pos >= len(buf):
+            raise IndexError
+        buf[pos] = T_NONE if value is None else T_TRUE if value else T_FALSE
+        return pos + 1
+    if isinstance(value, int):
+        if not -0x80000000 <= value <= 0x7FFFFFFF:
+            raise TypeError("cannot encode int beyond int32")
+        if pos + 5 > len(buf):
+            raise IndexError
+        buf[pos] = T_INT
+        struct.pack_into("<i", buf, pos + 1, value)
+        return pos + 5
+    if isinstance(value, float):
+        if pos + 5 > len(buf):
+            raise IndexError
+        buf[pos] = T_FLOAT
+        struct.pack_into("<f", buf, pos + 1, value)
+        return pos + 5
+    if isinstance(value, (list, tuple)):
+        if pos + 3 > len(buf):
+            raise IndexError
+        buf[pos] = T_LIST
+        struct.pack_into("<H", buf, pos + 1, len(value))
+        pos += 3
+        for item in value:
+            pos = encode(buf, pos, item)
+        return pos
+    if isinstance(value, str):
+        tag, value = T_STR, value.encode()
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        tag = T_BYTES
+    else:
+        raise TypeError("cannot encode " + type(value).__name__)
+    n = len(value)
+    end = pos + 3 + n
+    if end > len(buf):
+        raise IndexError
+    buf[pos] = tag
+    struct.pack_into("<H", buf, pos + 1, n)
+    buf[pos + 3:end] = value
+    return end
+
+
+def decode(mv, pos):
+    """Returns (value, new position)"""
+    tag = mv[pos]
+    if tag == T_INT:
+        return struct.unpack_from("<i", mv, pos + 1)[0], pos + 5
+    if tag == T_NONE:
+        return None, pos + 1
+    if tag == T_TRUE:
+        return True, pos + 1
+    if tag == T_FALSE:
+        return False, pos + 1
+    if tag == T_FLOAT:
+        return struct.unpack_from("<f", mv, pos + 1)[0], pos + 5
+    n = mv[pos + 1] | mv[pos + 2] << 8
+    pos += 3
+    if tag == T_LIST:
+        items = []
+        for _ in range(n):
+            item, pos = decode(mv, pos)
+            items.append(item)
+        return items, pos
+    data = bytes(mv[pos:pos + n])
+    return (data.decode() if tag == T_STR else data), pos + n
+
+
+def method_table(objects):
+    """(names, functions) of every public callable, in a stable order"""
+    names = []
+    funcs = []
+    for name in sorted(objects):
+        obj = objects[name]
+        for attr in sorted(dir(obj)):
+            if attr[0] == "_":
+                continue
+            f = getattr(obj, attr)
+            if callable(f) and not isinstance(f, type):
+                names.append(name + "." + attr)
+                funcs.append(f)
+    if len(funcs) > 256:
+        raise ValueError("more than 256 methods")
+    return names, funcs
+
+
+class Dispatcher:
+    def __init__(self, objects, stdin=None, stdout=None):
+        self.names, self.funcs = method_table(objects)
+        self._in = bytearray(MAX_FRAME)
+        self._out = bytearray(MAX_FRAME)
+        self._mv = memoryview(self._in)
+        self._outv = memoryview(self._out)
+        self._args = [[None] * n for n in range(16)]  # Reused argument lists per arity
+        self.rd = (stdin or sys.stdin.buffer).readinto
+        self.wr = (stdout or sys.stdout.buffer).write
+        self.calls = 0
+
+    def _read(self, n):
+        view = self._mv[:n]
+        got = 0
+        while got < n:
+            got += self.rd(view[got:]) or 0
+        return view
+
+    def _reply(self, kind, count, pos):
+        struct.pack_into("<BHH", self._out, 0, kind, count, pos - HEADER)
+        self.wr(self._outv[:pos])
+
+    def _put(self, pos, status, value):
+        if pos >= MAX_FRAME:
+            raise IndexError
+        self._out[pos] = status
+        try:
+            return encode(self._out, pos + 1, value)
+        except TypeError as e:
+            self._out[pos] = 1
+            return encode(self._out, pos + 1, "unsupported result type (%s)" % e)
+
+    def _run(self, count, mv):
+        funcs = self.funcs
+        pos = HEADER
+        done = 0
+        i = 0
+        for _ in range(count):
+            mid = mv[i]
+            f = funcs[mid] if mid < len(funcs) else None
+            nargs = mv[i + 1]
+            i += 2
+            args = self._args[nargs] if nargs < len(self._args) else [None] * nargs
+            for k in range(nargs):
+                args[k], i = decode(mv, i)
+            try:
+                if f is None:
+                    raise ValueError("unknown method id %d" % mid)
+                value = f(*args)
+                status = 0
+            except Exception as e:
+                value = "%s: %s" % (type(e).__name__, e)
+                status = 1
+            try:
+                pos = self._put(pos, status, value)
+            except IndexError:
+                self._reply(REPLY_MORE, done, pos)     # Send what fits, go on in a new frame
+                done = 0
+                try:
+                    pos = self._put(HEADER, status, value)
+                except IndexError:
+                    pos = self._put(HEADER, 1, "result too large")
+            done += 1
+        self.calls += count
+        self._reply(REPLY, done, pos)
+
+    def _table(self):
+        pos = HEADER
+        done = 0
+        for name in self.names:
+            try:
+                pos = encode(self._out, pos, name)
+            except IndexError:
+                self._reply(REPLY_MORE, done, pos)
+                pos = encode(self._out, HEADER, name)
+                done = 0
+            done += 1
+        self._reply(REPLY, done, pos)
+
+    def serve(self):
+        self.wr(READY)
+        while True:
+            kind, count, length = struct.unpack("<BHH", self._read(HEADER))
+            if kind == REQ_QUIT:
+                self._reply(REPLY, 0, HEADER)
+                return
+            payload = self._read(length)
+            if kind == REQ_TABLE:
+                self._table()
+            elif kind == REQ_CALLS:
+                self._run(count, payload)
+
+
+def serve(objects):
+    """Serves objects ({name: object or module}) until the host sends REQ_QUIT"""
+    kbd_intr(-1)
+    try:
+        Dispatcher(objects).serve()
+    finally:
+        kbd_intr(3)
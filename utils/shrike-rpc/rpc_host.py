@@ -0,0 +1,368 @@
+"""
+Host side of the RPC bridge: calls FPGA driver methods on a Shrike board,
+many per USB round trip.
+
+    rpc = RPCClient.open("/dev/ttyACM0", **TARGETS["gpio14"])
+    rpc.gpio.set_all_directions(0x0000)         # one call, one round trip
+    with rpc.batch() as b:                      # one frame for the whole block
+        for v in range(1000):
+            b.gpio.write_all(v)
+        state = b.gpio.read_all()
+    print(state.get())
+    rpc.close()
+
+The client enters the raw REPL, runs the target's setup code and starts
+rpc_board.serve() on the board, which must have rpc_board.py (and the
+driver) on its filesystem. Method names are fetched once and sent as one
+byte each. Batches are cut into frames of at most rpc_board.MAX_FRAME bytes,
+and up to `window` frames are in flight at once, so the board runs one frame
+while the next is on the wire.
+
+    python rpc_host.py --port /dev/ttyACM0 --target gpio14
+    python rpc_host.py --fake                    # against fake_repl.py, no board
+"""
+
+import argparse
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "shrike-repl"))
+
+import rpc_board as wire  # noqa: E402  Same encoding on both ends
+from rawrepl import RawREPL  # noqa: E402
+
+# Setup code and exposed objects for the example drivers
+TARGETS = {
+    "gpio14": {      # examples/14-Pin GPIO Extender, copied to the board as fpga_gpio_14bit.py
+        "setup": "from fpga_gpio_14bit import ShrikeFPGA14GPIO\ngpio = ShrikeFPGA14GPIO()",
+        "objects": "{'gpio': gpio}",
+    },
+    "vector8": {     # examples/Vector-8, vector_8.py on the board
+        "setup": "import vector_8\nvector_8.hard_reset()",
+        "objects": "{'cpu': vector_8}",
+    },
+    "model": {       # Register-level stand-in for the 14-pin extender: outputs read back
+        "setup": (
+            "class GPIO14Model:\n"
+            "    dir_reg = 0x3FFF\n"
+            "    out_reg = 0\n"
+            "    def set_all_directions(self, v):\n"
+            "        self.dir_reg = v & 0x3FFF\n"
+            "    def write_all(self, v):\n"
+            "        self.out_reg = v & 0x3FFF\n"
+            "    def read_all(self):\n"
+            "        return self.out_reg & ~self.dir_reg & 0x3FFF\n"
+            "gpio = GPIO14Model()"),
+        "objects": "{'gpio': gpio}",
+    },
+}
+
+
+class RPCError(Exception):
+    """A method raised on the board; args[0] is "Type: message" """
+
+
+class Result:
+    """Filled in when the reply for its frame arrives"""
+
+    __slots__ = ("done", "ok", "value")
+
+    def __init__(self):
+        self.done = False
+        self.ok = False
+        self.value = None
+
+    def get(self):
+        if not self.done:
+            raise RuntimeError("batch not sent yet")
+        if not self.ok:
+            raise RPCError(self.value)
+        return self.value
+
+
+class _Method:
+    def __init__(self, target, name):
+        self.target = target
+        self.name = name
+
+    def __call__(self, *args):
+        return self.target._call(self.name, args)
+
+
+class _Object:
+    def __init__(self, target, name):
+        self._target = target
+        self._name = name
+
+    def __getattr__(self, attr):
+        return _Method(self._target, self._name + "." + attr)
+
+
+class Batch:
+    """Collects calls into frames; returns a Result per call"""
+
+    def __init__(self, client):
+        self.client = client
+        self.results = []
+        self._frame = bytearray(wire.MAX_FRAME)
+        self._pos = wire.HEADER
+        self._pending = []
+
+    def __getattr__(self, name):
+        if name in self.client.objects:
+            return _Object(self, name)
+        raise AttributeError(name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.send()
+
+    def _call(self, name, args):
+        mid = self.client.ids.get(name)
+        if mid is None:
+            raise AttributeError(f"no method {name} on the board")
+        for attempt in range(2):
+            try:
+                pos = self._pos
+                if pos + 2 > wire.MAX_FRAME:
+                    raise IndexError
+                self._frame[pos] = mid
+                self._frame[pos + 1] = len(args)
+                pos += 2
+                for a in args:
+                    pos = wire.encode(self._frame, pos, a)
+                break
+            except IndexError:
+                if attempt or not self._pending:
+                    raise ValueError(f"arguments of {name} do not fit in a frame")
+                self.flush()
+        self._pos = pos
+        result = Result()
+        self._pending.append(result)
+        self.results.append(result)
+        return result
+
+    def flush(self):
+        """Hands the calls collected so far to the client"""
+        if self._pending:
+            struct.pack_into("<BHH", self._frame, 0, wire.REQ_CALLS, len(self._pending),
+                             self._pos - wire.HEADER)
+            self.client._submit(bytes(self._frame[:self._pos]), self._pending)
+            self._pending = []
+            self._pos = wire.HEADER
+
+    def send(self):
+        """Sends everything and waits; returns the Result of every call"""
+        self.flush()
+        self.client._drain()
+        return self.results
+
+
+class RPCClient:
+    def __init__(self, port, setup="", objects="{}", window=2, timeout=5.0):
+        self.port = port
+        self.window = window
+        self.timeout = timeout
+        self.console = []               # Text the methods printed
+        self.frames = 0
+        self._inflight = deque()        # Result lists, one per frame on the wire
+        self.repl = RawREPL(port)
+        self.repl.enter()
+        self.repl.exec("import rpc_board\n" + setup, timeout)
+        self.repl.exec_start(f"rpc_board.serve({objects})")
+        self.repl.read_until(wire.READY, timeout)
+        self.port.write(struct.pack("<BHH", wire.REQ_TABLE, 0, 0))
+        self.names = [name for _, name in self._read_replies(table=True)]
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.objects = {name.split(".")[0] for name in self.names}
+
+    @classmethod
+    def open(cls, device, baudrate=115200, **kwargs):
+        import serial
+        return cls(serial.Serial(device, baudrate, timeout=0.5), **kwargs)
+
+    def __getattr__(self, name):
+        if name in self.__dict__.get("objects", ()):
+            return _Object(self, name)
+        raise AttributeError(name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        try:
+            self._drain()
+            self.port.write(struct.pack("<BHH", wire.REQ_QUIT, 0, 0))
+            self._read_replies()
+            self.repl.read_until(b"\x04\x04>", self.timeout)
+            self.repl.exit()
+        finally:
+            self.port.close()
+
+    def batch(self):
+        return Batch(self)
+
+    def _call(self, name, args):
+        """Immediate call: a batch of one"""
+        batch = Batch(self)
+        result = batch._call(name, args)
+        batch.send()
+        return result.get()
+
+    def call_many(self, calls):
+        """[(name, args), ...] -> list of values; raises on the first error"""
+        batch = Batch(self)
+        for name, args in calls:
+            batch._call(name, args)
+        return [r.get() for r in batch.send()]
+
+    # --- WIRE ---
+
+    def _read_exact(self, n):
+        data = bytearray()
+        deadline = time.monotonic() + self.timeout
+        while len(data) < n:
+            chunk = self.port.read(n - len(data))
+            if chunk:
+                data += chunk
+            elif time.monotonic() > deadline:
+                raise TimeoutError(f"RPC reply: got {len(data)} of {n} bytes")
+        return data
+
+    def _read_replies(self, table=False):
+        """Reads reply frames up to the final one; returns [(status, value)]
+        (status is None for the name table)"""
+        items = []
+        while True:
+            text = bytearray()
+            while True:
+                kind = self._read_exact(1)[0]
+                if kind in (wire.REPLY, wire.REPLY_MORE):
+                    break
+                text.append(kind)
+            if text:
+                self.console.append(text.decode(errors="replace"))
+            count, length = struct.unpack("<HH", self._read_exact(4))
+            payload = memoryview(self._read_exact(length))
+            pos = 0
+            for _ in range(count):
+                if table:
+                    status = None
+                else:
+                    status = payload[pos]
+                    pos += 1
+                value, pos = wire.decode(payload, pos)
+                items.append((status, value))
+            if kind == wire.REPLY:
+                return items
+
+    def _submit(self, frame, results):
+        self.port.write(frame)
+        self._inflight.append(results)
+        self.frames += 1
+        while len(self._inflight) > self.window:
+            self._collect()
+
+    def _collect(self):
+        results = self._inflight.popleft()
+        for r, (status, value) in zip(results, self._read_replies()):
+            r.done = True
+            r.ok = status == 0
+            r.value = value
+
+    def _drain(self):
+        while self._inflight:
+            self._collect()
+
+
+def bench(rpc, target, count, check):
+    """write_all / read_all pairs: one call per round trip, then batched"""
+    obj = "cpu" if target == "vector8" else "gpio"
+    if obj == "gpio":
+        rpc.gpio.set_all_directions(0x0000)
+        write, read = "gpio.write_all", "gpio.read_all"
+        calls = [(write, (v & 0x3FFF,)) for v in range(count)]
+    else:
+        write, read = "cpu.send_instr", None
+        calls = [(write, (0x01, v & 0xFF)) for v in range(count)]    # LDA v returns v
+
+    rows = []
+    n = min(count, 200)
+    t0 = time.perf_counter()
+    for name, args in calls[:n]:
+        rpc.call_many([(name, args)])
+    rows.append(("one call per round trip", n / (time.perf_counter() - t0)))
+
+    batch = rpc.batch()
+    reads = []
+    frames = rpc.frames
+    t0 = time.perf_counter()
+    for name, args in calls:
+        batch._call(name, args)
+        if read:
+            reads.append(batch._call(read, ()))
+    batch.send()
+    ops = len(batch.results)
+    rows.append((f"batched, {rpc.frames - frames} frames", ops / (time.perf_counter() - t0)))
+
+    errors = 0
+    if check:
+        got = [r.get() for r in (reads or batch.results)]
+        want = [args[-1] for _, args in calls]
+        errors = sum(g != w for g, w in zip(got, want))
+    return rows, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RPC bridge benchmark for FPGA driver calls")
+    parser.add_argument("--port", help="serial port of the board")
+    parser.add_argument("--fake", action="store_true", help="use a fake board (fake_repl.py)")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="gpio14")
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--window", type=int, default=2, help="frames in flight")
+    parser.add_argument("--no-check", action="store_true",
+                        help="do not compare read-backs (no loopback on the board)")
+    args = parser.parse_args()
+
+    proc = root = None
+    if args.fake:
+        from fake_repl import PtyPort, spawn
+        root = tempfile.mkdtemp()
+        shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), "rpc_board.py"), root)
+        proc, path = spawn(root=root)
+        target = "model"
+        rpc = RPCClient(PtyPort(path), window=args.window, **TARGETS[target])
+    elif args.port:
+        target = args.target
+        rpc = RPCClient.open(args.port, window=args.window, **TARGETS[target])
+    else:
+        raise SystemExit("use --port or --fake")
+
+    try:
+        rows, errors = bench(rpc, target, args.count, not args.no_check)
+        print(f"{len(rpc.names)} methods: {', '.join(rpc.names)}")
+        for label, rate in rows:
+            print(f"{label:<32} {rate:>10.0f} ops/s")
+        if not args.no_check:
+            print(f"read-back errors: {errors}")
+        rpc.close()
+    finally:
+        if proc:
+            proc.terminate()
+            shutil.rmtree(root, ignore_errors=True)
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Runs the .vt testbenches of the examples with Icarus Verilog, in parallel,
+and caches the results by content hash.
+
+Every .vt file under the search roots is a bench. It is compiled together
+with the design sources of its project (the .v / .sv files in ffpga/src,
+ffpga/lib and src of the nearest directory holding a .ffpga), with the
+bench's own module as the root, then run with vvp in a scratch directory.
+Waveform dumps are switched off unless --waves is given.
+
+A bench passes when vvp exits cleanly and no output line reports a
+failure (FAIL, ERROR, "... failed", "Error ..."). Benches without
+self-checks, which only dump waves, are reported as "done".
+
+The cache (.shrike-sim-cache.json) keys each bench by a SHA-256 of the
+bench, its sources, the simulator version and the flags; unchanged benches
+are not run again. Timeouts are not cached. Without iverilog on PATH every
+bench is skipped and the exit status is 0.
+
+Benches listed in SLOW run far longer than any sensible default timeout;
+they are skipped unless --slow is given.
+
+    python vt_run.py                      # every bench under examples/
+    python vt_run.py i2c_led -v           # benches whose path contains i2c_led, with their output
+    python vt_run.py --waves waves/       # keep .fst dumps
+    python vt_run.py --force --jobs 2 --timeout 600
+    python vt_run.py --slow pwm_4 --timeout 3600
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "examples")
+CACHE = ".shrike-sim-cache.json"
+SOURCE_DIRS = (os.path.join("ffpga", "src"), os.path.join("ffpga", "lib"), "src")
+
+FAIL = re.compile(r"\bFAIL(ED)?\b|\bERROR\b|\bError\b|\bfailed\b|\bmismatch\b", re.I)
+PASS = re.compile(r"\bPASS(ED)?\b|\bsuccessful\b", re.I)
+ZERO = re.compile(r"\b0 \w*\s*(errors?|failures?|failed)\b|\berrors?\s*[:=]\s*0\b", re.I)
+NOISE = re.compile(r"^(VCD|FST|LXT2?) (info|warning):")
+MODULE = re.compile(r"^\s*module\s+(\w+)", re.M)
+
+# Benches that need much more than the default timeout: {path under examples/: reason}
+SLOW = {
+    "pwm_4/ffpga/sim/fourchannel_tb.vt": "simulates 2 s at a 2 ns clock",
+}
+
+
+# --- DISCOVERY ---
+
+def find_benches(root, patterns=()):
+    benches = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for f in sorted(filenames):
+            path = os.path.join(dirpath, f)
+            rel = os.path.relpath(path, root)
+            if f.endswith(".vt") and (not patterns or any(p in rel for p in patterns)):
+                benches.append(rel)
+    return benches
+
+
+def project_dir(bench):
+    """Nearest directory above the bench that holds a .ffpga project"""
+    d = os.path.dirname(os.path.abspath(bench))
+    while True:
+        if any(f.endswith(".ffpga") for f in os.listdir(d)):
+            return d
+        parent = os.path.dirname(d)
+        if parent == d:
+            return os.path.dirname(os.path.abspath(bench))
+        d = parent
+
+
+def design_sources(bench):
+    base = project_dir(bench)
+    found = []
+    for sub in SOURCE_DIRS:
+        d = os.path.join(base, sub)
+        if os.path.isdir(d):
+            found += [os.path.join(d, f) for f in sorted(os.listdir(d)) if f.endswith((".v", ".sv"))]
+    return found
+
+
+def top_module(bench):
+    with open(bench, errors="replace") as f:
+        m = MODULE.search(f.read())
+    return m.group(1) if m else None
+
+
+# --- SIMULATION ---
+
+def simulator_version():
+    """First line of iverilog -V, or None when it is not installed"""
+    if not (shutil.which("iverilog") and shutil.which("vvp")):
+        return None
+    out = subprocess.run(["iverilog", "-V"], capture_output=True, text=True).stdout
+    return out.splitlines()[0].strip() if out else "iverilog"
+
+
+def bench_key(bench, sources, version, flags):
+    h = hashlib.sha256(f"{version}\n{flags}\n".encode())
+    for path in [bench] + sources:
+        with open(path, "rb") as f:
+            h.update(os.path.basename(path).encode() + b"\0")
+            h.update(f.read().replace(b"\r\n", b"\n"))
+    return h.hexdigest()
+
+
+def verdict(returncode, log):
+    """("pass" | "fail" | "done", summary line)"""
+    lines = [line.strip() for line in log.splitlines() if line.strip() and not NOISE.match(line)]
+    failures = [line for line in lines if FAIL.search(line) and not ZERO.search(line)]
+    passes = [line for line in lines if PASS.search(line)]
+    if returncode != 0:
+        return "fail", failures[0] if failures else f"vvp exited with {returncode}"
+    if failures:
+        return "fail", f"{failures[0]} ({len(failures)} failing lines)"
+    if passes:
+        return "pass", f"{len(passes)} passing lines"
+    return "done", lines[-1] if lines else "no output"
+
+
+def run_bench(bench, sources, timeout, waves=None, generation="2012"):
+    """Compiles and runs one bench; returns a result dict"""
+    top = top_module(bench)
+    t0 = time.monotonic()
+    with tempfile.TemporaryDirectory(prefix="vt_run_") as work:
+        image = os.path.join(work, "sim.vvp")
+        cmd = ["iverilog", f"-g{generation}", "-o", image]
+        if top:
+            cmd += ["-s", top]
+        for d in sorted({os.path.dirname(p) for p in sources + [bench]}):
+            cmd += ["-I", d]
+        compiled = subprocess.run(cmd + sources + [bench], capture_output=True, text=True)
+        if compiled.returncode != 0:
+            log = compiled.stdout + compiled.stderr
+            first = next((line for line in log.splitlines() if line.strip()), "iverilog failed")
+            return {"status": "error", "summary": first.strip(), "log": log,
+                    "seconds": round(time.monotonic() - t0, 2)}
+        try:
+            ran = subprocess.run(["vvp", "-n", image, "-fst" if waves else "-none"], cwd=work,
+                                 capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired as e:
+            log = e.stdout.decode(errors="replace") if isinstance(e.stdout, bytes) else (e.stdout or "")
+            return {"status": "timeout", "summary": f"still running after {timeout} s", "log": log,
+                    "seconds": round(time.monotonic() - t0, 2)}
+        if waves:
+            os.makedirs(waves, exist_ok=True)
+            for f in os.listdir(work):
+                if f != "sim.vvp":
+                    shutil.copyfile(os.path.join(work, f), os.path.join(waves, f))
+    log = ran.stdout + ran.stderr
+    status, summary = verdict(ran.returncode, log)
+    return {"status": status, "summary": summary, "log": log,
+            "seconds": round(time.monotonic() - t0, 2)}
+
+
+# --- CACHE ---
+
+class Cache:
+    """{bench: result with its key} on disk"""
+
+    def __init__(self, path=CACHE):
+        self.path = path
+        try:
+            with open(path) as f:
+                self.results = json.load(f)
+        except (OSError, ValueError):
+            self.results = {}
+
+    def get(self, bench, key):
+        r = self.results.get(bench)
+        return r if r and r.get("key") == key else None
+
+    def put(self, bench, key, result):
+        if result["status"] != "timeout":
+            self.results[bench] = dict(result, key=key)
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.results, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the .vt testbenches with Icarus Verilog")
+    parser.add_argument("patterns", nargs="*", help="only benches whose path contains one of these")
+    parser.add_argument("--root", default=ROOT, help="directory searched for .vt files")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--timeout", type=float, default=120, help="seconds per bench")
+    parser.add_argument("--force", action="store_true", help="ignore cached results")
+    parser.add_argument("--slow", action="store_true", help="also run the benches listed in SLOW")
+    parser.add_argument("--waves", metavar="DIR", help="write .fst dumps to DIR (not cached)")
+    parser.add_argument("-g", dest="generation", default="2012", help="iverilog -g language generation")
+    parser.add_argument("--cache", default=CACHE)
+    parser.add_argument("-v", "--verbose", action="store_true", help="print the simulator output")
+    args = parser.parse_args()
+
+    benches = find_benches(args.root, args.patterns)
+    if not benches:
+        raise SystemExit("no .vt benches found")
+    version = simulator_version()
+    if version is None:
+        for rel in benches:
+            print(f"{'skipped':<9}{rel}  (iverilog/vvp not on PATH)")
+        return
+
+    cache = Cache(args.cache)
+    flags = f"-g{args.generation}"
+    jobs = {}
+    results = {}
+    for rel in benches:
+        slow = SLOW.get(rel.replace(os.sep, "/"))
+        if slow and not args.slow:
+            results[rel] = {"status": "skipped", "summary": f"{slow}; run with --slow", "seconds": 0}
+            continue
+        bench = os.path.join(args.root, rel)
+        sources = design_sources(bench)
+        key = bench_key(bench, sources, version, flags)
+        hit = None if args.force or args.waves else cache.get(rel, key)
+        if hit:
+            results[rel] = dict(hit, cached=True)
+        else:
+            jobs[rel] = (bench, sources, key)
+
+    t0 = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = {rel: pool.submit(run_bench, bench, sources, args.timeout, args.waves,
+                                    args.generation)
+                   for rel, (bench, sources, key) in jobs.items()}
+        for rel, future in futures.items():
+            results[rel] = future.result()
+            cache.put(rel, jobs[rel][2], results[rel])
+    cache.save()
+
+    counts = {}
+    for rel in benches:
+        r = results[rel]
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+        when = "cached" if r.get("cached") else "" if r["status"] == "skipped" else f"{r['seconds']:.1f} s"
+        print(f"{r['status']:<9}{rel:<48}{when:>9}  {r['summary']}")
+        if args.verbose and r.get("log"):
+            for line in r["log"].rstrip().splitlines():
+                print(f"    {line}")
+    cached = sum(1 for r in results.values() if r.get("cached"))
+    print(f"{len(benches)} benches ({len(jobs)} run, {cached} cached) in "
+          f"{time.monotonic() - t0:.1f} s: " + ", ".join(f"{n} {s}" for s, n in sorted(counts.items())))
+    sys.exit(1 if any(r["status"] in ("fail", "error", "timeout") for r in results.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,718 @@
+"""
+Cycle-level model of spi_target.v and the designs built around it, for
+finding how tight host SPI timing can actually be.
+
+spi_target.v (identical in Vector-4, the 14-pin extender, spi_loopback_led
+and stack_processor) samples SS and SCK through 3-flop synchronizers on the
+50 MHz fabric clock. The model steps those registers, and the logic of each
+top.v, one clock at a time while a host waveform (SPI mode 0, MSB first)
+is replayed against it. MISO is sampled by the host on SCK rising edges.
+
+For every design a reference run with generous timing gives the expected
+outcome (MISO bytes of every transaction and the final register state).
+Each timing parameter is then shrunk on its own down to the smallest value
+that still reproduces the reference at every tested clock phase. The SPI
+clock limit is found first; in mode 0 the first SCK edge comes half a
+period after the transfer starts, so the other limits are searched at a
+given SPI clock (--baud, by default the fastest working one):
+
+    sck      SCK half period (reported as the fastest SPI clock)
+    setup    CS falling edge to the first data bit
+    gap      end of one byte to the start of the next, CS held low
+    hold     end of the last byte to CS rising edge
+    cs_high  CS rising edge to the next falling edge
+
+    python spi_model.py                                  # all designs
+    python spi_model.py --design gpio14 --phases 16
+    python spi_model.py --design gpio14 --replay run.log --baud 500000
+
+--replay takes spi_trace dumps (utils/shrike-spitrace), replays the traced
+transactions at the given SPI clock and compares the gaps the host really
+produced with the limits, i.e. how much sleep padding could go.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "shrike-spitrace"))
+
+CLK_NS = 20          # 50 MHz internal oscillator
+SETTLE = 16          # Clocks with unchanged inputs after which every design is idle
+SS, SCK, MOSI = 0, 1, 2
+GENEROUS_NS = 2000
+PARAMS = ("setup", "gap", "hold", "cs_high", "sck")
+
+
+class SpiTarget:
+    """spi_target.v with CPOL=0, CPHA=0, WIDTH=8, LSB=0 and i_enable=1"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.ss = 0b111          # r_ss_n_sync, bit 2 oldest
+        self.sck = 0b000         # r_sck_sync
+        self.count = 0
+        self.rx_data = 0
+        self.rx_valid = 0
+        self.miso_data = 0
+
+    @property
+    def miso(self):
+        return self.miso_data >> 7
+
+    def step(self, ss_n, sck, mosi, tx_data):
+        """One posedge of i_clk; all right-hand sides use the old values"""
+        ss = self.ss
+        s = self.sck & 0b110
+        r_edge = s == 0b010
+        f_edge = s == 0b100
+        count = self.count
+        if ss & 0b010 or (count == 0 and r_edge):
+            self.rx_valid = 0
+        elif r_edge and count == 7:
+            self.rx_valid = 1
+        if r_edge:
+            self.rx_data = ((self.rx_data << 1) | mosi) & 0xFF
+        if (ss & 0b110) == 0b100 or (count == 0 and f_edge):     # o_tx_data_hold
+            self.miso_data = tx_data
+        elif f_edge:
+            self.miso_data = (self.miso_data << 1) & 0xFF
+        if ss & 0b010:
+            self.count = 0
+        elif r_edge:
+            self.count = (count + 1) & 7
+        self.ss = ((ss << 1) | ss_n) & 0b111
+        self.sck = ((self.sck << 1) | sck) & 0b111
+
+
+# --- DESIGNS ---
+
+class Design:
+    """top.v around an SpiTarget. step() sees the target outputs from
+    before the clock edge, tx_data() is read before the edge as well"""
+
+    name = ""
+    source = ""
+    baud = 1_000_000         # SPI clock of the example firmware
+
+    def __init__(self):
+        self.spi = SpiTarget()
+        self.reset()
+
+    def reset(self):
+        self.spi.reset()
+
+    def tx_data(self):
+        return 0
+
+    def step(self, ss_n, rx_data, rx_valid):
+        pass
+
+    def state(self):
+        return ()
+
+    def workload(self):
+        """Transactions (lists of MOSI bytes) in the style of the firmware"""
+        return []
+
+
+class LoopbackLED(Design):
+    name = "loopback"
+    source = "examples/spi_loopback_led/ffpga/src/top.v"
+
+    def reset(self):
+        super().reset()
+        self.tx = 0
+        self.led = 0
+
+    def tx_data(self):
+        return self.tx
+
+    def step(self, ss_n, rx_data, rx_valid):
+        if rx_valid:
+            self.tx = rx_data
+            if rx_data == 0xAB:
+                self.led = 1
+            elif rx_data == 0xFF:
+                self.led = 0
+
+    def state(self):
+        return (self.led, self.tx)
+
+    def workload(self):
+        return [[0xAB], [0x12, 0x34, 0x56], [0x78], [0xFF, 0x5A, 0xA5], [0xAB]]
+
+
+class GPIO14(Design):
+    name = "gpio14"
+    source = "examples/14-Pin GPIO Extender/src/top.v"
+    baud = 500_000
+    EXT = 0x1B3C             # Levels driven onto the pins configured as inputs
+
+    def reset(self):
+        super().reset()
+        self.dir_reg = 0x3FFF
+        self.out_reg = 0
+        self.byte_select = 0
+        self.cmd_byte = 0
+        self.state_bit = 0
+        self.valid_d = 0
+        self.ss_sync = 0b11
+
+    def pins(self):
+        return (self.out_reg & ~self.dir_reg | self.EXT & self.dir_reg) & 0x3FFF
+
+    def tx_data(self):
+        p = self.pins()
+        return p & 0xFF if self.byte_select else p >> 8
+
+    def step(self, ss_n, rx_data, rx_valid):
+        if self.ss_sync == 0b10:                          # ss_falling
+            self.byte_select = 0
+            self.state_bit = 0
+        elif rx_valid and not self.valid_d:
+            self.byte_select ^= 1
+            if self.state_bit == 0:
+                self.cmd_byte = rx_data
+                self.state_bit = 1
+            else:
+                cmd = self.cmd_byte
+                if cmd == 0x10:
+                    self.dir_reg = self.dir_reg & 0x3F00 | rx_data
+                elif cmd == 0x11:
+                    self.dir_reg = self.dir_reg & 0xFF | (rx_data & 0x3F) << 8
+                elif cmd == 0x20:
+                    self.out_reg = self.out_reg & 0x3F00 | rx_data
+                elif cmd == 0x21:
+                    self.out_reg = self.out_reg & 0xFF | (rx_data & 0x3F) << 8
+                self.state_bit = 0
+        if ss_n:                                          # Raw, unsynchronized input
+            self.state_bit = 0
+        self.valid_d = rx_valid
+        self.ss_sync = ((self.ss_sync << 1) | ss_n) & 0b11
+
+    def state(self):
+        return (self.dir_reg, self.out_reg)
+
+    def workload(self):
+        # _send_cmd() writes, _read_gpio() two-byte reads, as in ShrikeFPGA14GPIO.
+        # The lone byte is an aborted command: only CS going high resyncs
+        return [[0x10, 0x00], [0x11, 0x3F], [0x20, 0xA5], [0x21, 0x15], [0x00, 0x00],
+                [0x10, 0xF0], [0x00, 0x00], [0x21], [0x20, 0x5A], [0x00, 0x00]]
+
+
+class CPU4:
+    """cpu_core.v of Vector-4"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.pc = 0
+        self.regval = 0
+        self.prog = [0] * 16
+        self.data = [0] * 16
+
+    def step(self, instruction, data_in, bit3):
+        pc, reg = self.pc, self.regval
+        npc = (pc + 1) & 0xF
+        if instruction == 0:                      # LOADPROG
+            self.prog[pc] = data_in
+            self.pc = npc
+        elif instruction == 1:                    # LOADDATA
+            self.data[pc] = data_in
+            self.pc = npc
+        elif instruction == 2:                    # SETRUNPT
+            self.pc = data_in
+        else:                                     # RUNPROG
+            op, d = self.prog[pc], self.data[pc]
+            self.pc = npc
+            if op == 0:
+                reg = d
+            elif op == 1:
+                self.data[d] = reg
+            elif op == 2:
+                reg = reg + d
+            elif op == 3:
+                reg = reg * d
+            elif op == 4:
+                reg = reg - d
+            elif op == 5:
+                reg = reg << (d if d < 4 else 3)
+            elif op == 6:
+                reg = reg >> (d if d < 4 else 3)
+            elif op == 7:
+                self.pc = d if bit3 else npc
+            elif op == 8:
+                reg = int(bool(reg) and bool(d))
+            elif op == 9:
+                reg = int(bool(reg) or bool(d))
+            elif op == 10:
+                reg = int(reg == d)
+            elif op == 11:
+                reg = int(reg != d)
+            elif op == 12:
+                reg = reg & d
+            elif op == 13:
+                reg = reg | d
+            elif op == 14:
+                reg = int(not reg)
+            else:
+                reg = ~reg
+            self.regval = reg & 0xF
+
+
+class Vector4(Design):
+    name = "vector4"
+    source = "examples/Vector-4/src/top.v"
+    baud = 50_000
+
+    def reset(self):
+        super().reset()
+        self.cpu = CPU4()
+        self.valid_d = 0
+        self.cpu_reset = 0
+        self.step_cmd = 0
+        self.instr = 0
+        self.data = 0
+        self.bit3 = 0
+
+    def tx_data(self):
+        return (self.cpu.regval << 4) | self.cpu.pc
+
+    def step(self, ss_n, rx_data, rx_valid):
+        if self.step_cmd and not self.cpu_reset:
+            self.cpu.step(self.instr, self.data, self.bit3)
+        self.step_cmd = 0
+        if rx_valid and not self.valid_d:
+            self.data = rx_data >> 4
+            self.instr = (rx_data >> 2) & 3
+            self.cpu_reset = (rx_data >> 1) & 1
+            self.step_cmd = rx_data & 1
+            self.bit3 = rx_data >> 7
+        self.valid_d = rx_valid
+        if self.cpu_reset:                    # Asynchronous reset of the core
+            self.cpu.reset()
+
+    def state(self):
+        c = self.cpu
+        return (c.pc, c.regval, tuple(c.prog), tuple(c.data))
+
+    def workload(self):
+        def packet(data, instr, reset=0, step=1):
+            return (data & 0xF) << 4 | instr << 2 | reset << 1 | step
+
+        txns = [[packet(0, 0, 1, 0)], [packet(0, 0, 0, 0)]]
+        for addr, val in ((0, 3), (1, 2)):                    # write_data()
+            txns += [[packet(addr, 2)], [packet(val, 1)]]
+        for addr, op in ((0, 0), (1, 2)):                     # write_prog(): LOAD, ADD
+            txns += [[packet(addr, 2)], [packet(op, 0)]]
+        txns += [[packet(0, 2)], [packet(0, 3)], [packet(0, 0, 0, 0)],
+                 [packet(0, 3), packet(0, 0, 0, 0)]]          # run, read_state()
+        return txns
+
+
+class StackProcessor(Design):
+    name = "stack"
+    source = "examples/stack_processor/ffpga/src/top.v"
+    DEPTH = 256
+
+    def reset(self):
+        super().reset()
+        self.valid_d = 0
+        self.we = self.re = 0
+        self.din = 0
+        self.tx = 0
+        self.cnt = 0
+        self.a = self.b = self.c = 0
+        # lifo_bram.v and the BRAM primitive
+        self.sp = 0
+        self.empty = 1
+        self.full = 0
+        self.dout = 0
+        self.bram_din = 0
+        self.bram_waddr = 0
+        self.bram_wen = 1        # Active low
+        self.bram_raddr = 0
+        self.bram_ren = 1        # Active low
+        self.bram_dout = 0
+        self.mem = [0] * 512
+
+    def tx_data(self):
+        return self.tx
+
+    def step(self, ss_n, rx_data, rx_valid):
+        # BRAM primitive: registered write and read
+        bram_dout = self.bram_dout
+        if not self.bram_wen:
+            self.mem[self.bram_waddr] = self.bram_din & 0xF
+        if not self.bram_ren:
+            self.bram_dout = self.mem[self.bram_raddr & 0x1FF]
+
+        # lifo_bram.v
+        we, re, sp = self.we, self.re, self.sp
+        self.bram_din = self.din
+        self.bram_waddr = sp
+        self.bram_wen = 0 if we and not self.full else 1
+        self.bram_raddr = (sp - 1) & 0x1FF
+        self.dout = bram_dout
+        self.bram_ren = 0 if re and not self.empty else 1
+        if we and not self.full:
+            self.sp = sp + 1
+        elif re and not self.empty:
+            self.sp = sp - 1
+        self.empty = int(sp == 0)
+        self.full = int(sp == self.DEPTH)
+
+        # Processor logic of top.v
+        pulse = rx_valid and not self.valid_d
+        self.valid_d = rx_valid
+        cnt = self.cnt
+        self.we = self.re = 0
+        if pulse:
+            op = rx_data
+            if op >> 4 == 0x1:
+                self.din = op & 0xF
+                self.we = 1
+            elif op in (0x20, 0x33, 0x34, 0x35):
+                self.cnt = 1
+                self.re = 1
+            elif 0x30 <= op <= 0x32:
+                self.din = (self.a, self.b, self.c)[op - 0x30] & 0xF
+                self.we = 1
+            elif 0xC0 <= op <= 0xC6:
+                a, b = self.a, self.b
+                if op == 0xC0:
+                    c = a + b
+                elif op == 0xC1:
+                    c = a - b
+                elif op == 0xC2:
+                    c = a * b
+                elif op == 0xC3:
+                    c = a // b if b else 0xFF
+                elif op == 0xC4:
+                    c = a << b
+                elif op == 0xC5:
+                    c = a >> b
+                else:
+                    c = (a & 0x80) | (a >> 1)
+                self.c = c & 0xFF
+        if cnt:
+            self.cnt = cnt + 1
+            if cnt == 4:
+                value = self.dout
+                if rx_data == 0x33:
+                    self.a = value
+                elif rx_data == 0x34:
+                    self.b = value
+                elif rx_data == 0x35:
+                    self.c = value
+                else:
+                    self.tx = self.empty << 7 | self.full << 6 | value
+                self.cnt = 0
+
+    def state(self):
+        return (self.a, self.b, self.c, self.sp, tuple(self.mem[:self.sp]))
+
+    def workload(self):
+        # 2 * 5 + 3 as in multiplication.py, then a POP in its own transaction
+        return [[0x12, 0x15, 0x33, 0x34, 0xC2, 0x32, 0x13, 0x20, 0x33, 0xC0, 0x32, 0x20, 0x00],
+                [0x17], [0x20], [0x00]]
+
+
+DESIGNS = {d.name: d for d in (Vector4, GPIO14, LoopbackLED, StackProcessor)}
+
+
+# --- SIMULATION ---
+
+class Timing:
+    """Host bus timing in ns"""
+
+    __slots__ = ("setup", "gap", "hold", "cs_high", "half")
+
+    def __init__(self, setup=GENEROUS_NS, gap=GENEROUS_NS, hold=GENEROUS_NS,
+                 cs_high=GENEROUS_NS, half=500):
+        self.setup = setup
+        self.gap = gap
+        self.hold = hold
+        self.cs_high = cs_high
+        self.half = half
+
+    def copy(self, **changes):
+        t = Timing(self.setup, self.gap, self.hold, self.cs_high, self.half)
+        for k, v in changes.items():
+            setattr(t, k, v)
+        return t
+
+
+def byte_events(events, t, byte, half):
+    """Appends the MOSI / SCK edges of one byte starting at t; returns its end"""
+    for bit in range(7, -1, -1):
+        events.append((t, MOSI, (byte >> bit) & 1))
+        events.append((t + half, SCK, 1))
+        t += 2 * half
+        events.append((t, SCK, 0))
+    return t
+
+
+def waveform(transactions, timing):
+    """Host edges (t_ns, signal, value) for a list of transactions"""
+    events = []
+    t = timing.cs_high
+    for txn in transactions:
+        events.append((t, SS, 0))
+        t += timing.setup
+        for i, byte in enumerate(txn):
+            if i:
+                t += timing.gap
+            t = byte_events(events, t, byte, timing.half)
+        t += timing.hold
+        events.append((t, SS, 1))
+        t += timing.cs_high
+    return events
+
+
+def simulate(design, events, phase=0.0):
+    """Runs the design against host edges; returns (MISO bytes of every
+    transaction, final state)"""
+    design.reset()
+    spi = design.spi
+    step, tx_data = design.step, design.tx_data
+    ss_n, sck, mosi = 1, 0, 0
+    received = []
+    current = None
+    bits = nbits = 0
+    i, n = 0, len(events)
+    t = phase
+    stable = 0
+    while i < n or stable < SETTLE:
+        while i < n and events[i][0] < t:
+            _, sig, value = events[i]
+            i += 1
+            stable = 0
+            if sig == MOSI:
+                mosi = value
+            elif sig == SCK:
+                if value and not sck and current is not None:
+                    bits = (bits << 1) | spi.miso
+                    nbits += 1
+                    if nbits == 8:
+                        current.append(bits)
+                        bits = nbits = 0
+                sck = value
+            else:
+                ss_n = value
+                if not value:
+                    current = bytearray()
+                    received.append(current)
+                    bits = nbits = 0
+        tx = tx_data()
+        step(ss_n, spi.rx_data, spi.rx_valid)
+        spi.step(ss_n, sck, mosi, tx)
+        stable += 1
+        t += CLK_NS
+        if stable >= SETTLE and i < n:            # Inputs steady, state at a fixed point
+            skip = int((events[i][0] - t) // CLK_NS)
+            if skip > 0:
+                t += skip * CLK_NS
+    return [bytes(b) for b in received], design.state()
+
+
+def phases(count):
+    return [CLK_NS * k / count for k in range(count)]
+
+
+def passes(design, transactions, timing, reference, phase_list):
+    events = waveform(transactions, timing)
+    return all(simulate(design, events, p) == reference for p in phase_list)
+
+
+def search(design, transactions, param, reference, phase_list, base, hi=GENEROUS_NS):
+    """Smallest value (ns) of one parameter that reproduces the reference,
+    the others as in base, or None when even hi fails. Assumes longer is
+    never worse"""
+    field = "half" if param == "sck" else param
+    lo = 1 if param == "sck" else 0
+
+    def ok(value):
+        return passes(design, transactions, base.copy(**{field: value}), reference, phase_list)
+
+    if not ok(hi):
+        return None
+    if ok(lo):
+        return lo
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if ok(mid):
+            hi = mid
+        else:
+            lo = mid
+    return hi
+
+
+def limits(design, n_phases=8, baud=None, transactions=None):
+    """{param: minimum ns} plus the SCK half period the gaps were searched
+    at. In mode 0 the first rising SCK edge comes half a period after the
+    transfer starts, so the gaps depend on the SPI clock: they are measured
+    at baud, or at the fastest working clock plus one FPGA clock of margin.
+    gap is None for workloads without multi-byte transactions"""
+    transactions = transactions or design.workload()
+    phase_list = phases(n_phases)
+    reference = simulate(design, waveform(transactions, Timing()))
+    result = {"sck": search(design, transactions, "sck", reference, phase_list, Timing())}
+    if baud:
+        half = 1e9 / baud / 2
+    else:
+        half = (result["sck"] or GENEROUS_NS) + CLK_NS
+    result["half"] = half
+    base = Timing(half=half)
+    for param in PARAMS[:-1]:
+        if param == "gap" and all(len(t) < 2 for t in transactions):
+            result[param] = None
+            continue
+        result[param] = search(design, transactions, param, reference, phase_list, base)
+    tight = base.copy(**{k: (result[k] or 0) + CLK_NS for k in PARAMS[:-1]})
+    result["combined_ok"] = passes(design, transactions, tight, reference, phase_list)
+    return result
+
+
+def fmt_ns(ns):
+    if ns is None:
+        return "-"
+    return f"{ns} ns ({(ns + CLK_NS - 1) // CLK_NS} clk)"
+
+
+def print_limits(design, result, out=sys.stdout):
+    print(f"{design.name} ({design.source})", file=out)
+    half = result["sck"]
+    if half is None:
+        print("  sck      fails even at the slowest clock tried", file=out)
+    else:
+        print(f"  sck      <= {1e3 / (2 * half):.2f} MHz (half period {half} ns)", file=out)
+    print(f"  at {1e3 / (2 * result['half']):.2f} MHz SCK:", file=out)
+    for param in PARAMS[:-1]:
+        print(f"  {param:<8} >= {fmt_ns(result[param])}", file=out)
+    combined = "ok" if result["combined_ok"] else "FAILS"
+    print(f"  all limits + 1 clk at once: {combined}", file=out)
+
+
+# --- TRACE REPLAY ---
+
+def trace_waveform(events, baud, pad=0x00):
+    """Host edges for the events of an spi_trace dump; every transfer starts
+    at its recorded start time and runs at baud. Returns (edges, transactions,
+    number of transfers that do not fit in their recorded window)"""
+    from spi_trace_tool import CS_FALL, CS_RISE, XFER
+    half = 1e9 / baud / 2
+    base = events[0].t0 if events else 0
+    edges = []
+    transactions = []
+    current = None
+    overruns = 0
+    for e in events:
+        t = (e.t0 - base) * 1000
+        if e.kind == CS_FALL:
+            edges.append((t, SS, 0))
+            current = []
+            transactions.append(current)
+        elif e.kind == CS_RISE:
+            edges.append((t, SS, 1))
+            current = None
+        elif e.kind == XFER:
+            data = bytes(e.tx) + bytes([pad]) * (e.length - len(e.tx))
+            end = t
+            for byte in data:
+                end = byte_events(edges, end, byte, half)
+            if end > (e.t1 - base) * 1000 + half:
+                overruns += 1
+            if current is not None:
+                current.extend(data)
+    edges.sort(key=lambda ev: ev[0])
+    return edges, transactions, overruns
+
+
+def observed_gaps(dump):
+    """Smallest setup / gap / hold / cs_high (ns) the host produced"""
+    from spi_trace_tool import transactions
+    txns = [t for t in transactions(dump.events) if t.cs and t.xfers]
+    seen = {"setup": [], "gap": [], "hold": [], "cs_high": []}
+    for t in txns:
+        seen["setup"].append(t.setup * 1000)
+        seen["hold"].append(t.hold * 1000)
+        for a, b in zip(t.xfers, t.xfers[1:]):
+            seen["gap"].append((b.t0 - a.t1) * 1000)
+    for a, b in zip(txns, txns[1:]):
+        seen["cs_high"].append((b.start - a.end) * 1000)
+    return {k: min(v) if v else None for k, v in seen.items()}
+
+
+def replay(design, dump, baud, n_phases, result, out=sys.stdout):
+    edges, txns, overruns = trace_waveform(dump.events, baud)
+    reference = simulate(design, waveform(txns, Timing()))
+    bad = [p for p in phases(n_phases) if simulate(design, edges, p) != reference]
+    print(f"{dump.name}: {len(txns)} transactions replayed on {design.name} at {baud} Hz", file=out)
+    if overruns:
+        print(f"  {overruns} transfers do not fit their traced window at this SPI clock", file=out)
+    truncated = sum(1 for e in dump.events if len(e.tx) < e.length)
+    if truncated:
+        print(f"  {truncated} transfers were truncated in the trace, padded with 0x00", file=out)
+    print(f"  decoded {'as with generous timing' if not bad else 'DIFFERENTLY'}"
+          f" at {n_phases - len(bad)}/{n_phases} clock phases", file=out)
+    print(f"  {'':<8}{'traced min':>14}{'needed':>12}{'headroom':>12}", file=out)
+    for param, seen in observed_gaps(dump).items():
+        need = result.get(param)
+        if seen is None:
+            continue
+        room = f"{seen - need:.0f} ns" if need is not None else "-"
+        print(f"  {param:<8}{seen:>11.0f} ns{fmt_ns(need).split(' (')[0]:>12}{room:>12}",
+              file=out)
+    return not bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cycle-level SPI timing limits of the Shrike designs")
+    parser.add_argument("--design", action="append", choices=sorted(DESIGNS),
+                        help="design(s) to analyse (default: all)")
+    parser.add_argument("--phases", type=int, default=8,
+                        help="FPGA clock phases tried against the host edges")
+    parser.add_argument("--replay", nargs="+", metavar="LOG",
+                        help="spi_trace captures to replay (one design)")
+    parser.add_argument("--baud", type=int,
+                        help="SPI clock for the gap limits and the replay "
+                             "(default: fastest working clock; replay: the firmware's)")
+    parser.add_argument("--json", help="write the limits as JSON")
+    args = parser.parse_args()
+
+    names = args.design or sorted(DESIGNS)
+    if args.replay and len(names) != 1:
+        raise SystemExit("--replay needs exactly one --design")
+    report = {}
+    for name in names:
+        design = DESIGNS[name]()
+        baud = args.baud or (design.baud if args.replay else None)
+        result = limits(design, args.phases, baud)
+        report[name] = result
+        print_limits(design, result)
+
+    ok = all(r["combined_ok"] for r in report.values())
+    if args.replay:
+        from spi_trace_tool import parse_lines
+        design = DESIGNS[names[0]]()
+        lines = (line for path in args.replay for line in open(path, errors="replace"))
+        dumps = parse_lines(lines)
+        if not dumps:
+            raise SystemExit("no spi_trace dump found")
+        for dump in dumps:
+            print()
+            ok &= replay(design, dump, args.baud or design.baud, args.phases, report[names[0]])
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
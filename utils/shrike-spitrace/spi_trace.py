@@ -0,0 +1,189 @@
+"""
+Opt-in SPI transaction tracer for Shrike drivers (MicroPython).
+
+Wraps an SPI handle and its chip-select pin and records every CS edge and
+every transfer (start / end ticks_us, tx and rx bytes) into a fixed-size
+ring buffer allocated once up front, so tracing does not allocate:
+
+    from spi_trace import Trace, instrument
+    trace = Trace(512)
+    spi, cs = instrument(spi, cs, trace)     # or fpga.spi, fpga.cs = ...
+    ...driver code...
+    trace.dump()                             # text lines for spi_trace_tool.py
+
+instrument() returns the handles untouched when trace is None, which leaves
+no overhead at all in builds that do not trace; trace.enabled switches a
+live trace on and off at the cost of one attribute check per call. When the
+buffer is full the oldest events are overwritten (see `lost`). Only the
+first `max_bytes` bytes of long transfers are kept, along with the length.
+Write-only transfers have no rx bytes (rx length 0), so the dump and the
+exports show their MISO as empty rather than as zeros.
+"""
+
+import array
+import binascii
+import time
+
+try:
+    _ticks_us = time.ticks_us
+except AttributeError:  # CPython, e.g. driving a FakeSPI
+    def _ticks_us():
+        return (time.perf_counter_ns() // 1000) & (TICKS_PERIOD - 1)
+
+TICKS_PERIOD = 1 << 30   # ticks_us() wraps here on the rp2 port
+
+# Event kinds
+CS_FALL = 1
+CS_RISE = 2
+XFER = 3
+
+TAG = "~spi"             # Prefix of every dumped line
+
+
+class Trace:
+    def __init__(self, size=512, max_bytes=8):
+        self.size = size
+        self.max_bytes = max_bytes
+        self.t0 = array.array("I", [0] * size)     # Start ticks
+        self.t1 = array.array("I", [0] * size)     # End ticks (transfers)
+        self.kind = bytearray(size)
+        self.length = array.array("H", [0] * size)
+        self.rx_length = array.array("H", [0] * size)   # 0 for write-only transfers
+        self.tx = bytearray(size * max_bytes)
+        self.rx = bytearray(size * max_bytes)
+        self.enabled = True
+        self.clear()
+
+    def clear(self):
+        self.count = 0           # Events recorded since clear(), including overwritten ones
+
+    @property
+    def lost(self):
+        return max(0, self.count - self.size)
+
+    def edge(self, rising):
+        i = self.count % self.size
+        self.t0[i] = self.t1[i] = _ticks_us()
+        self.kind[i] = CS_RISE if rising else CS_FALL
+        self.length[i] = self.rx_length[i] = 0
+        self.count += 1
+
+    def xfer(self, t_start, tx, rx, n, fill=0):
+        """Records a transfer of n bytes; tx None means `fill` was sent,
+        rx None that nothing was read"""
+        t_end = _ticks_us()
+        i = self.count % self.size
+        self.t0[i] = t_start
+        self.t1[i] = t_end
+        self.kind[i] = XFER
+        self.length[i] = n
+        self.rx_length[i] = 0 if rx is None else n
+        o = i * self.max_bytes
+        m = min(n, self.max_bytes)
+        for k in range(m):
+            self.tx[o + k] = fill if tx is None else tx[k]
+        if rx is not None:
+            for k in range(m):
+                self.rx[o + k] = rx[k]
+        self.count += 1
+
+    def events(self):
+        """Yields (kind, t_start, t_end, length, tx bytes, rx bytes), oldest first"""
+        first = self.count - min(self.count, self.size)
+        for j in range(first, self.count):
+            i = j % self.size
+            o = i * self.max_bytes
+            m = min(self.length[i], self.max_bytes)
+            r = min(self.rx_length[i], self.max_bytes)
+            yield (self.kind[i], self.t0[i], self.t1[i], self.length[i],
+                   bytes(self.tx[o:o + m]), bytes(self.rx[o:o + r]))
+
+    def dump(self, name="spi", out=print):
+        """Prints the trace as text lines for spi_trace_tool.py"""
+        out("%s begin %s %d %d %d" % (TAG, name, self.count, self.lost, TICKS_PERIOD))
+        for kind, t0, t1, n, tx, rx in self.events():
+            out("%s %d %d %d %d %s %s" % (TAG, kind, t0, t1, n,
+                                         binascii.hexlify(tx).decode() or "-",
+                                         binascii.hexlify(rx).decode() or "-"))
+        out("%s end" % TAG)
+
+
+class TracingSPI:
+    """Wraps a machine.SPI; every transfer becomes one XFER event"""
+
+    def __init__(self, spi, trace):
+        self.spi = spi
+        self.trace = trace
+
+    def write(self, buf):
+        if not self.trace.enabled:
+            return self.spi.write(buf)
+        t = _ticks_us()
+        r = self.spi.write(buf)
+        self.trace.xfer(t, buf, None, len(buf))
+        return r
+
+    def read(self, nbytes, write=0x00):
+        if not self.trace.enabled:
+            return self.spi.read(nbytes, write)
+        t = _ticks_us()
+        r = self.spi.read(nbytes, write)
+        self.trace.xfer(t, None, r, nbytes, write)
+        return r
+
+    def readinto(self, buf, write=0x00):
+        if not self.trace.enabled:
+            return self.spi.readinto(buf, write)
+        t = _ticks_us()
+        r = self.spi.readinto(buf, write)
+        self.trace.xfer(t, None, buf, len(buf), write)
+        return r
+
+    def write_readinto(self, write_buf, read_buf):
+        if not self.trace.enabled:
+            return self.spi.write_readinto(write_buf, read_buf)
+        t = _ticks_us()
+        r = self.spi.write_readinto(write_buf, read_buf)
+        self.trace.xfer(t, write_buf, read_buf, len(write_buf))
+        return r
+
+    def __getattr__(self, name):
+        return getattr(self.spi, name)
+
+
+class TracingCS:
+    """Wraps the chip-select Pin; records falling and rising edges"""
+
+    def __init__(self, pin, trace):
+        self.pin = pin
+        self.trace = trace
+
+    def value(self, v=None):
+        if v is None:
+            return self.pin.value()
+        if self.trace.enabled and bool(v) != bool(self.pin.value()):
+            self.trace.edge(bool(v))
+        self.pin.value(v)
+
+    def __call__(self, v=None):
+        return self.value(v)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def __getattr__(self, name):
+        return getattr(self.pin, name)
+
+
+def instrument(spi, cs=None, trace=None):
+    """Tracing wrappers for an SPI handle and its CS pin; the handles
+    themselves when trace is None"""
+    if trace is None:
+        return spi if cs is None else (spi, cs)
+    spi = TracingSPI(spi, trace)
+    if cs is None:
+        return spi
+    return spi, TracingCS(cs, trace)
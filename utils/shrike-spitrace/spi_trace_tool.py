@@ -0,0 +1,287 @@
+"""
+Host-side tool for spi_trace dumps: per-transaction statistics and export to
+VCD (for GTKWave / PulseView) or CSV.
+
+Reads REPL captures from log files, stdin or a live serial port, picks out
+the "~spi" lines written by Trace.dump() and ignores everything else.
+
+    mpremote connect /dev/ttyACM0 run traced_test.py > run.log
+    python spi_trace_tool.py run.log
+    python spi_trace_tool.py run.log --vcd run.vcd --csv run.csv
+    python spi_trace_tool.py --port /dev/ttyACM0
+
+A transaction runs from a CS falling edge to the next rising edge. For each
+one the report splits the time into CS setup (fall to first transfer),
+transfer, padding between transfers and CS hold (last transfer to rise),
+then adds the gap to the next transaction. Bus utilization is the share of
+the traced time during which bytes were actually moving.
+
+Write-only transfers carry no rx bytes ("-" in the dump): their rx column
+is empty in the CSV and MISO is x in the VCD.
+"""
+
+import argparse
+import csv
+import sys
+
+TAG = "~spi"
+CS_FALL, CS_RISE, XFER = 1, 2, 3
+KIND_NAMES = {CS_FALL: "cs_fall", CS_RISE: "cs_rise", XFER: "xfer"}
+
+
+class Event:
+    __slots__ = ("kind", "t0", "t1", "length", "tx", "rx")
+
+    def __init__(self, kind, t0, t1, length, tx, rx):
+        self.kind = kind
+        self.t0 = t0
+        self.t1 = t1
+        self.length = length
+        self.tx = tx
+        self.rx = rx
+
+
+class TraceDump:
+    def __init__(self, name, count, lost, period):
+        self.name = name
+        self.count = count
+        self.lost = lost
+        self.period = period
+        self.events = []
+
+
+def parse_lines(lines):
+    """Returns the TraceDumps found in an iterable of text lines, with tick
+    counter wrap-around undone so times only grow"""
+    dumps = []
+    dump = None
+    offset = last = 0
+    for line in lines:
+        line = line.strip()
+        if not line.startswith(TAG + " "):
+            continue
+        fields = line.split()
+        if fields[1] == "begin":
+            dump = TraceDump(fields[2], int(fields[3]), int(fields[4]), int(fields[5]))
+            dumps.append(dump)
+            offset = last = 0
+        elif fields[1] == "end":
+            dump = None
+        elif dump is not None and len(fields) == 7:
+            kind, t0, t1, n = (int(f) for f in fields[1:5])
+            if t0 + offset < last - dump.period // 2:
+                offset += dump.period
+            t0 += offset
+            t1 += offset
+            if t1 < t0:
+                t1 += dump.period
+            last = t0
+            tx = b"" if fields[5] == "-" else bytes.fromhex(fields[5])
+            rx = b"" if fields[6] == "-" else bytes.fromhex(fields[6])
+            dump.events.append(Event(kind, t0, t1, n, tx, rx))
+    return dumps
+
+
+def read_port(port, baudrate=115200, timeout=60):
+    """Yields lines from a serial port until a dump has ended"""
+    import serial  # pyserial, as used by shrike-ctl.py
+    with serial.Serial(port, baudrate, timeout=timeout) as ser:
+        while True:
+            raw = ser.readline()
+            if not raw:
+                return
+            line = raw.decode(errors="replace")
+            yield line
+            if line.strip() == TAG + " end":
+                return
+
+
+# --- TRANSACTIONS ---
+
+class Transaction:
+    def __init__(self, start, cs):
+        self.start = start
+        self.end = start
+        self.cs = cs              # False for transfers made with CS high / untraced
+        self.xfers = []
+
+    @property
+    def nbytes(self):
+        return sum(x.length for x in self.xfers)
+
+    @property
+    def busy(self):
+        return sum(x.t1 - x.t0 for x in self.xfers)
+
+    @property
+    def setup(self):
+        return self.xfers[0].t0 - self.start if self.cs and self.xfers else None
+
+    @property
+    def hold(self):
+        return self.end - self.xfers[-1].t1 if self.cs and self.xfers else None
+
+
+def transactions(events):
+    """Groups events into transactions (CS low windows)"""
+    out = []
+    current = None
+    for e in events:
+        if e.kind == CS_FALL:
+            current = Transaction(e.t0, True)
+            out.append(current)
+        elif e.kind == CS_RISE:
+            if current is not None:
+                current.end = e.t0
+            current = None
+        elif e.kind == XFER:
+            if current is None:                   # Trace started mid-transaction, or no CS
+                txn = Transaction(e.t0, False)
+                txn.xfers.append(e)
+                txn.end = e.t1
+                out.append(txn)
+            else:
+                current.xfers.append(e)
+                current.end = max(current.end, e.t1)
+    return out
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0
+    k = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def summarize(values):
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    return {"n": len(values), "min": values[0], "p50": percentile(values, 50),
+            "p90": percentile(values, 90), "max": values[-1]}
+
+
+def stats(dump):
+    txns = transactions(dump.events)
+    if not txns:
+        return {"transactions": 0}
+    span = max(t.end for t in txns) - txns[0].start
+    busy = sum(t.busy for t in txns)
+    cs_low = sum(t.end - t.start for t in txns if t.cs)
+    nbytes = sum(t.nbytes for t in txns)
+    gaps = [b.start - a.end for a, b in zip(txns, txns[1:])]
+    return {
+        "transactions": len(txns),
+        "bytes": nbytes,
+        "span_us": span,
+        "latency_us": summarize(t.end - t.start for t in txns),
+        "transfer_us": summarize(t.busy for t in txns),
+        "cs_setup_us": summarize(t.setup for t in txns),
+        "cs_hold_us": summarize(t.hold for t in txns),
+        "gap_us": summarize(gaps),
+        "utilization": busy / span if span else 0.0,
+        "cs_low_share": cs_low / span if span else 0.0,
+        "bytes_per_s": nbytes * 1e6 / span if span else 0.0,
+    }
+
+
+def print_report(dump, s, out=sys.stdout):
+    lost = f", {dump.lost} oldest lost" if dump.lost else ""
+    print(f"{dump.name}: {len(dump.events)} events{lost}", file=out)
+    if not s["transactions"]:
+        print("  no transactions", file=out)
+        return
+    print(f"  {s['transactions']} transactions, {s['bytes']} bytes in {s['span_us']} us "
+          f"({s['bytes_per_s']:.0f} B/s)", file=out)
+    print(f"  bus utilization {s['utilization'] * 100:.1f} %, "
+          f"CS low {s['cs_low_share'] * 100:.1f} %", file=out)
+    print(f"  {'us':<14}{'min':>8}{'p50':>8}{'p90':>8}{'max':>8}", file=out)
+    for key, label in (("latency_us", "transaction"), ("transfer_us", "transfer"),
+                       ("cs_setup_us", "CS setup"), ("cs_hold_us", "CS hold"),
+                       ("gap_us", "gap")):
+        row = s[key]
+        if row:
+            print(f"  {label:<14}{row['min']:>8}{row['p50']:>8}{row['p90']:>8}{row['max']:>8}",
+                  file=out)
+
+
+# --- EXPORT ---
+
+def export_csv(dump, path):
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["index", "t_us", "event", "duration_us", "length", "tx", "rx"])
+        base = dump.events[0].t0 if dump.events else 0
+        for i, e in enumerate(dump.events):
+            w.writerow([i, e.t0 - base, KIND_NAMES.get(e.kind, e.kind), e.t1 - e.t0,
+                        e.length, e.tx.hex(), e.rx.hex()])
+
+
+def export_vcd(dump, path):
+    """cs, busy and the MOSI / MISO byte values. Bytes are spread evenly
+    over the duration of their transfer (timescale 1 ns); MISO is x
+    during write-only transfers"""
+    changes = []          # (t_ns, order, id, value)
+    for e in dump.events:
+        t = e.t0 * 1000
+        if e.kind in (CS_FALL, CS_RISE):
+            changes.append((t, 0, "c", "1" if e.kind == CS_RISE else "0"))
+            continue
+        changes.append((t, 1, "b", "1"))
+        if not e.rx:
+            changes.append((t, 2, "s", "bxxxxxxxx "))
+        n = max(len(e.tx), len(e.rx), 1)
+        step = (e.t1 - e.t0) * 1000 // n
+        for k in range(n):
+            if k < len(e.tx):
+                changes.append((t + k * step, 2, "m", f"b{e.tx[k]:08b} "))
+            if k < len(e.rx):
+                changes.append((t + k * step, 2, "s", f"b{e.rx[k]:08b} "))
+        changes.append((e.t1 * 1000, 1, "b", "0"))
+    changes.sort(key=lambda c: (c[0], c[1]))
+    base = changes[0][0] if changes else 0
+
+    with open(path, "w") as f:
+        f.write("$timescale 1ns $end\n")
+        f.write(f"$scope module {dump.name} $end\n")
+        f.write("$var wire 1 c cs_n $end\n")
+        f.write("$var wire 1 b busy $end\n")
+        f.write("$var wire 8 m mosi $end\n")
+        f.write("$var wire 8 s miso $end\n")
+        f.write("$upscope $end\n$enddefinitions $end\n")
+        f.write("$dumpvars\n1c\n0b\nbxxxxxxxx m\nbxxxxxxxx s\n$end\n")
+        now = None
+        for t, _, ident, value in changes:
+            if t != now:
+                f.write(f"#{t - base}\n")
+                now = t
+            f.write(f"{value}{ident}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistics and VCD/CSV export for SPI traces")
+    parser.add_argument("logs", nargs="*", help="REPL captures (default: stdin)")
+    parser.add_argument("--port", help="read one dump live from a serial port")
+    parser.add_argument("--vcd", help="write the (last) trace as VCD")
+    parser.add_argument("--csv", help="write the (last) trace as CSV")
+    args = parser.parse_args()
+
+    if args.port:
+        lines = read_port(args.port)
+    elif args.logs:
+        lines = (line for path in args.logs for line in open(path, errors="replace"))
+    else:
+        lines = sys.stdin
+    dumps = parse_lines(lines)
+    if not dumps:
+        raise SystemExit("no spi_trace dump found")
+    for dump in dumps:
+        print_report(dump, stats(dump))
+    if args.vcd:
+        export_vcd(dumps[-1], args.vcd)
+    if args.csv:
+        export_csv(dumps[-1], args.csv)
+
+
+if __name__ == "__main__":
+    main()
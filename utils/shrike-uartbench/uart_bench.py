@@ -0,0 +1,311 @@
+"""
+Latency and throughput benchmark for UART-attached FPGA designs.
+
+Drives a design with a stream of requests, keeping up to `window` requests
+in flight, matches replies in FIFO order and reports per-request round-trip
+latency percentiles and sustained operations per second for every
+combination of payload pattern, window size and baud rate.
+
+Protocols:
+    sum   2-byte request (a, b) -> 1-byte reply (a + b) & 0xFF   (uart_sum)
+    echo  --size byte request   -> the same bytes back           (loopback wire)
+    led   1-byte request, no reply; throughput only              (uart_led)
+
+Targets:
+    --port /dev/ttyUSB0   a USB-serial adapter wired to the FPGA UART pins
+    (default)             a line-timed model of the design on a pty, so CI
+                          can run the benchmark and track regressions
+
+    python uart_bench.py --protocol sum --window 1 4 16 64
+    python uart_bench.py --protocol echo --size 8 --baud 115200 460800 --json echo.json
+    python uart_bench.py --protocol sum --port /dev/ttyUSB0 --count 5000
+    python uart_bench.py --json new.json --baseline old.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import select
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..",
+                                "examples", "uart_sum", "host"))
+
+from uart_sum_model import (CLK, FRAME_BITS, HostUART, PtyServer,  # noqa: E402
+                            UartSumModel)
+
+PATTERNS = ("random", "zeros", "ones", "ramp", "alt")
+
+
+def payload(pattern, nbytes, seed=0):
+    """Request bytes for a payload pattern"""
+    if pattern == "random":
+        rng = random.Random(seed)
+        return bytes(rng.randrange(256) for _ in range(nbytes))
+    if pattern == "zeros":
+        return bytes(nbytes)
+    if pattern == "ones":
+        return b"\xff" * nbytes
+    if pattern == "ramp":
+        return bytes(i & 0xFF for i in range(nbytes))
+    if pattern == "alt":
+        return bytes(0x55 if i & 1 else 0xAA for i in range(nbytes))
+    raise ValueError(f"unknown pattern '{pattern}'")
+
+
+# --- PROTOCOLS ---
+
+class SumProtocol:
+    name = "sum"
+    request_len = 2
+    reply_len = 1
+
+    def reply(self, request):
+        return bytes([(request[0] + request[1]) & 0xFF])
+
+
+class EchoProtocol:
+    name = "echo"
+
+    def __init__(self, size):
+        self.request_len = self.reply_len = size
+
+    def reply(self, request):
+        return bytes(request)
+
+
+class LedProtocol:
+    name = "led"
+    request_len = 1
+    reply_len = 0
+
+    def reply(self, request):
+        return b""
+
+
+# --- PTY STAND-INS ---
+
+class EchoModel:
+    """A wire looping TX back to RX, with line timing"""
+
+    def __init__(self, clk=CLK, baud=115200):
+        self.clk = clk
+        self.bit = clk // baud
+        self.stats = {"rx": 0, "tx": 0}
+
+    def reset(self):
+        pass
+
+    def byte_cycles(self):
+        return FRAME_BITS * self.bit
+
+    def receive(self, byte, start):
+        self.stats["rx"] += 1
+        self.stats["tx"] += 1
+        return [(start + FRAME_BITS * self.bit, byte)]
+
+
+class LedModel(EchoModel):
+    """uart_led: consumes bytes, never replies"""
+
+    def receive(self, byte, start):
+        self.stats["rx"] += 1
+        return []
+
+
+def stand_in(protocol, baud):
+    if protocol.name == "sum":
+        return UartSumModel(baud=baud)
+    if protocol.name == "echo":
+        return EchoModel(baud=baud)
+    return LedModel(baud=baud)
+
+
+# --- BENCHMARK ---
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def bench(uart, protocol, data, window, timeout_s=1.0, drain=None):
+    """Streams data (whole requests) through uart, returns a result dict.
+
+    For protocols without replies the run ends once everything has left
+    the host: drain() when given, else uart.flush()."""
+    rlen, plen = protocol.request_len, protocol.reply_len
+    n = len(data) // rlen
+    view = memoryview(data)
+    expected = b"".join(protocol.reply(view[i * rlen:(i + 1) * rlen]) for i in range(n))
+    sent_at = [0.0] * n
+    latency = []
+    rx = bytearray()
+    mismatches = timeouts = 0
+    clock = time.perf_counter
+    fd = getattr(uart, "fd", None)
+
+    sent = done = 0
+    t0 = last = clock()
+    while done < n:
+        if sent < n and sent - done < window:
+            k = min(window - (sent - done), n - sent)
+            now = clock()
+            uart.write(view[sent * rlen:(sent + k) * rlen])
+            for i in range(sent, sent + k):
+                sent_at[i] = now
+            sent += k
+            if not plen:
+                done = sent
+                continue
+
+        if fd is not None:
+            select.select([fd], [], [], 0.001)
+        if uart.any():
+            rx += uart.read()
+            last = clock()
+        while len(rx) >= plen and done < sent:
+            now = clock()
+            if rx[:plen] != expected[done * plen:(done + 1) * plen]:
+                mismatches += 1
+            latency.append(now - sent_at[done])
+            del rx[:plen]
+            done += 1
+        if done < sent and clock() - last > timeout_s:
+            timeouts += sent - done
+            done = sent
+            rx.clear()
+            last = clock()
+
+    if not plen:
+        if drain is not None:
+            drain()
+        elif hasattr(uart, "flush"):
+            uart.flush()
+    elapsed = clock() - t0
+    latency.sort()
+    us = [round(v * 1e6, 1) for v in latency]
+    return {
+        "requests": n,
+        "elapsed_s": round(elapsed, 4),
+        "ops_per_s": round(n / elapsed, 1) if elapsed else 0.0,
+        "latency_us": {
+            "p50": percentile(us, 0.50),
+            "p90": percentile(us, 0.90),
+            "p99": percentile(us, 0.99),
+            "max": us[-1] if us else None,
+            "mean": round(sum(us) / len(us), 1) if us else None,
+        },
+        "mismatches": mismatches,
+        "timeouts": timeouts,
+    }
+
+
+def line_limit(protocol, baud):
+    """Requests per second the slower line direction allows"""
+    bytes_per_op = max(protocol.request_len, protocol.reply_len or 0)
+    return baud / FRAME_BITS / bytes_per_op
+
+
+def run_one(args, protocol, pattern, baud, window):
+    data = payload(pattern, args.count * protocol.request_len, args.seed)
+    server = drain = None
+    if args.port:
+        uart = HostUART(args.port, baud)
+    else:
+        server = PtyServer(stand_in(protocol, baud), realtime=True).start()
+        uart = HostUART(server.path)
+        drain = lambda: server.wait_received(len(data))  # noqa: E731
+    try:
+        result = bench(uart, protocol, data, window, args.timeout, drain)
+    finally:
+        uart.close()
+        if server is not None:
+            server.stop()
+    limit = line_limit(protocol, baud)
+    result.update({
+        "protocol": protocol.name,
+        "pattern": pattern,
+        "request_bytes": protocol.request_len,
+        "baud": baud,
+        "window": window,
+        "line_limit_ops_per_s": round(limit, 1),
+        "efficiency": round(result["ops_per_s"] / limit, 3),
+    })
+    return result
+
+
+def run_key(r):
+    return (r["protocol"], r["pattern"], r["request_bytes"], r["baud"], r["window"])
+
+
+def regressions(results, baseline, tolerance):
+    """Runs that got slower than the baseline by more than tolerance"""
+    old = {run_key(r): r for r in baseline.get("results", [])}
+    found = []
+    for r in results:
+        b = old.get(run_key(r))
+        if b is None:
+            continue
+        if r["ops_per_s"] < b["ops_per_s"] * (1 - tolerance):
+            found.append(f"{run_key(r)}: {b['ops_per_s']} -> {r['ops_per_s']} ops/s")
+        p99, bp99 = r["latency_us"]["p99"], b["latency_us"]["p99"]
+        if p99 is not None and bp99 is not None and p99 > bp99 * (1 + tolerance):
+            found.append(f"{run_key(r)}: p99 {bp99} -> {p99} us")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UART latency/throughput benchmark")
+    parser.add_argument("--protocol", choices=("sum", "echo", "led"), default="sum")
+    parser.add_argument("--size", type=int, default=4, help="echo request size in bytes")
+    parser.add_argument("--pattern", nargs="+", choices=PATTERNS, default=["random"])
+    parser.add_argument("--window", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--baud", type=int, nargs="+", default=[115200])
+    parser.add_argument("--count", type=int, default=2000, help="requests per run")
+    parser.add_argument("--port", help="serial device (default: pty stand-in)")
+    parser.add_argument("--timeout", type=float, default=1.0, help="reply timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="fail on regressions against this JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    protocol = {"sum": SumProtocol(), "echo": EchoProtocol(args.size),
+                "led": LedProtocol()}[args.protocol]
+    results = [run_one(args, protocol, pattern, baud, window)
+               for pattern in args.pattern for baud in args.baud for window in args.window]
+
+    target = args.port or "pty model"
+    print(f"{protocol.name} x {args.count} requests on {target}")
+    print(f"{'pattern':>8} {'baud':>8} {'window':>6} {'ops/s':>9} {'eff':>5} "
+          f"{'p50 us':>9} {'p99 us':>9} {'max us':>9}  errors")
+    for r in results:
+        lat = r["latency_us"]
+        cols = [f"{v:>9.0f}" if v is not None else f"{'-':>9}"
+                for v in (lat["p50"], lat["p99"], lat["max"])]
+        errors = r["mismatches"] + r["timeouts"]
+        print(f"{r['pattern']:>8} {r['baud']:>8} {r['window']:>6} {r['ops_per_s']:>9.0f} "
+              f"{r['efficiency']:>5.2f} {' '.join(cols)}  {errors or ''}")
+
+    report = {"target": target, "host": platform.node(), "python": platform.python_version(),
+              "results": results}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failed = any(r["mismatches"] or r["timeouts"] for r in results)
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for line in found:
+            print("REGRESSION", line)
+        failed = failed or bool(found)
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()